@@ -0,0 +1,55 @@
+# Measures bone rename latency as the number of unrelated targeted bones in the
+# file grows (one cone per bone on another rig). The renamed bone drives a few
+# cached cones, whose expressions embed the bone's name and must be retargeted.
+# The message bus defers notifications to the event loop, which does not run in
+# background mode, so the renamed armature is checked directly as the callback
+# and depsgraph handler would.
+
+import os
+import sys
+import time
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from common import addon_enable, results_write, rig_create, scene_reset
+
+SIZES = (100, 1000, 5000)
+CONES = 5
+RENAMES = 50
+
+
+def main() -> None:
+    results = {"cones": CONES}
+    for size in SIZES:
+        scene_reset()
+        addon_enable()
+
+        from cone_based_shape_key_driver.api.index import bones_renamed, index_rebuild
+
+        # A small rig whose bone is renamed, plus an unrelated rig with size targeted bones
+        rigs, objects = rig_create(CONES)
+        rig_create(size, bones=size)
+        index_rebuild()
+
+        key = objects[0].data.shape_keys
+        for manager in key.cone_based_drivers:
+            manager.driver_type = 'CACHED'
+
+        bone = rigs[0].data.bones[0]
+
+        start = time.perf_counter()
+        for index in range(RENAMES):
+            bone.name = f'Renamed.{index:04d}'
+            bones_renamed(rigs)
+        elapsed = time.perf_counter() - start
+
+        for manager in key.cone_based_drivers:
+            assert manager.bone_target == bone.name
+            assert repr(bone.name) in key.animation_data.drivers.find(manager.data_path).driver.expression
+
+        results[f'rename_{size}'] = {"total": elapsed, "count": RENAMES, "mean": elapsed / RENAMES}
+
+    results_write(results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+# Shared helpers for the benchmark scripts. Run benchmarks under Blender, e.g.
+#
+#   blender --background --factory-startup --python benchmarks/expression.py -- results.json
+#
+# Each script prints its results as JSON and writes them to the path given after "--".
+
+import json
+import os
+import sys
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Tuple
+
+import bpy
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def addon_enable():
+    if ROOT not in sys.path:
+        sys.path.insert(0, ROOT)
+    import cone_based_shape_key_driver as addon
+    try:
+        addon.register()
+    except ValueError:
+        pass # Already registered
+    return addon
+
+
+def scene_reset() -> None:
+    bpy.ops.wm.read_factory_settings(use_empty=True)
+    bpy.context.preferences.filepaths.use_scripts_auto_execute = True
+    bpy.context.scene.render.engine = 'BLENDER_WORKBENCH'
+
+
+def armature_create(name: str="Armature", bones: int=1) -> 'bpy.types.Object':
+    scene = bpy.context.scene
+    data = bpy.data.armatures.new(name)
+    object = bpy.data.objects.new(name, data)
+    scene.collection.objects.link(object)
+    bpy.context.view_layer.objects.active = object
+    bpy.ops.object.mode_set(mode='EDIT')
+    for index in range(bones):
+        bone = data.edit_bones.new(f'Bone.{index:03d}')
+        bone.head = (float(index), 0.0, 0.0)
+        bone.tail = (float(index), 1.0, 0.0)
+    bpy.ops.object.mode_set(mode='OBJECT')
+    return object
+
+
+def armature_animate(object: 'bpy.types.Object', frames: int) -> None:
+    for index, pose_bone in enumerate(object.pose.bones):
+        pose_bone.rotation_mode = 'QUATERNION'
+        for frame in range(1, frames + 1, max(1, frames // 4)):
+            angle = 0.1 * frame + index
+            pose_bone.rotation_quaternion = (1.0, 0.3 * angle % 1.0, 0.0, 0.2)
+            pose_bone.rotation_quaternion.normalize()
+            pose_bone.keyframe_insert("rotation_quaternion", frame=frame)
+
+
+def mesh_create(name: str, shapes: int) -> 'bpy.types.Object':
+    scene = bpy.context.scene
+    data = bpy.data.meshes.new(name)
+    data.from_pydata([(0.0, 0.0, 0.0), (1.0, 0.0, 0.0), (0.0, 1.0, 0.0)], [], [(0, 1, 2)])
+    object = bpy.data.objects.new(name, data)
+    scene.collection.objects.link(object)
+    object.shape_key_add(name="Basis")
+    for index in range(shapes):
+        object.shape_key_add(name=f'Shape.{index:04d}', from_mix=False)
+    return object
+
+
+def cones_create(mesh: 'bpy.types.Object', armature: 'bpy.types.Object') -> None:
+    key = mesh.data.shape_keys
+    bones = armature.data.bones
+    for index, shape in enumerate(key.key_blocks[1:]):
+        manager = key.cone_based_drivers.add()
+        manager.__init__(shape)
+        manager.object = armature
+        manager.bone_target = bones[index % len(bones)].name
+
+
+def rig_create(cones: int, meshes: int=1, armatures: int=1, bones: int=1) -> Tuple[List['bpy.types.Object'], List['bpy.types.Object']]:
+    rigs = [armature_create(f'Armature.{index:03d}', bones) for index in range(armatures)]
+    objects = []
+    for index in range(meshes):
+        object = mesh_create(f'Mesh.{index:03d}', cones)
+        cones_create(object, rigs[index % len(rigs)])
+        objects.append(object)
+    return rigs, objects
+
+
+@contextmanager
+def timer(results: Dict[str, Any], name: str, count: int=1) -> Iterator[None]:
+    start = time.perf_counter()
+    yield
+    elapsed = time.perf_counter() - start
+    results[name] = {"total": elapsed, "count": count, "mean": elapsed / max(count, 1)}
+
+
+def playback(frames: int) -> None:
+    scene = bpy.context.scene
+    for frame in range(1, frames + 1):
+        scene.frame_set(frame)
+
+
+def results_write(results: Dict[str, Any]) -> None:
+    text = json.dumps(results, indent=2, sort_keys=True)
+    print(text)
+    argv = sys.argv[sys.argv.index("--") + 1:] if "--" in sys.argv else []
+    if argv:
+        with open(argv[0], "w") as file:
+            file.write(text)
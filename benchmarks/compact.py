@@ -0,0 +1,119 @@
+# Measures the file size and undo step memory of a file with many cones with
+# activation curves stored as curve-mapping property groups against compact
+# (packed) storage, and that unpacking restores the same curves.
+#
+# Undo step memory is measured directly as the growth of the process's resident
+# memory over a number of undo pushes (Linux only, from /proc/self/statm). Blender
+# doesn't create an undo stack in background mode, so run this script with the UI:
+#
+#   blender --factory-startup --python benchmarks/compact.py -- results.json
+
+import os
+import sys
+import tempfile
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import bpy
+from common import addon_enable, results_write, rig_create, scene_reset, timer
+
+CONES = 1000
+UNDO_STEPS = 20
+
+
+def managers():
+    return [m for k in bpy.data.shape_keys for m in k.cone_based_drivers]
+
+
+def curves():
+    """Returns the curve points of every activation as RNA reads them"""
+    from cone_based_shape_key_driver.api.compact import point_fields, points_rna
+    plain = lambda value: value if isinstance(value, (bool, int, float, str)) else tuple(value)
+    result = []
+    for manager in managers():
+        activation = manager.activation
+        fields = point_fields(points_rna(activation)[1])
+        result.append([[plain(getattr(point, name)) for name in fields] for point in activation.points])
+    return result
+
+
+def resident_memory() -> int:
+    with open("/proc/self/statm") as file:
+        return int(file.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+
+
+def undo_memory(results, name: str) -> None:
+    scene = bpy.context.scene
+    bpy.ops.ed.undo_push(message="Start")
+    before = resident_memory()
+    for step in range(UNDO_STEPS):
+        scene.frame_current = step + 1
+        bpy.ops.ed.undo_push(message=f'Step {step}')
+    growth = resident_memory() - before
+    results[f'{name}/undo_step_memory'] = growth / UNDO_STEPS
+
+
+def file_size(results, name: str, filepath: str) -> None:
+    bpy.ops.wm.save_as_mainfile(filepath=filepath, compress=False, copy=True)
+    results[f'{name}/size'] = os.path.getsize(filepath)
+
+
+def run(results):
+    from cone_based_shape_key_driver.api.compact import activation_pack, activation_unpack
+
+    scene_reset()
+    addon_enable()
+    rig_create(CONES)
+    results["cones"] = CONES
+    results["undo_steps"] = UNDO_STEPS
+    original = curves()
+    yield
+
+    with tempfile.TemporaryDirectory() as directory:
+        filepath = os.path.join(directory, "compact.blend")
+        file_size(results, "default", filepath)
+        undo_memory(results, "default")
+        yield
+
+        with timer(results, "pack"):
+            packed = sum(activation_pack(manager.activation) for manager in managers())
+        results["packed"] = packed
+        file_size(results, "compact", filepath)
+        undo_memory(results, "compact")
+        yield
+
+    with timer(results, "unpack"):
+        for manager in managers():
+            activation_unpack(manager.activation)
+
+    results["lossless"] = curves() == original
+    results["size_reduction"] = 1.0 - results["compact/size"] / results["default/size"]
+    results["undo_reduction"] = 1.0 - (results["compact/undo_step_memory"] /
+                                       max(results["default/undo_step_memory"], 1.0))
+    results_write(results)
+    assert results["lossless"], "Unpacked curves differ from the original curves"
+
+
+def main() -> None:
+    if bpy.app.background:
+        sys.exit("compact.py needs the undo stack, which doesn't exist in background mode, "
+                 "run it without --background")
+
+    steps = run({})
+
+    def step():
+        try:
+            next(steps)
+        except StopIteration:
+            bpy.ops.wm.quit_blender()
+            return None
+        except Exception:
+            import traceback
+            traceback.print_exc()
+            os._exit(1)
+        return 0.0
+
+    bpy.app.timers.register(step, first_interval=0.1, persistent=True)
+
+
+if __name__ == "__main__":
+    main()
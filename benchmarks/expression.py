@@ -0,0 +1,47 @@
+# Compares the per-frame cost of cone drivers evaluated by Blender's simple
+# expression evaluator against the same drivers forced through Python.
+
+import os
+import sys
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from common import (addon_enable, armature_animate, playback, results_write,
+                    rig_create, scene_reset, timer)
+
+CONES = 500
+FRAMES = 100
+
+
+def main() -> None:
+    scene_reset()
+    addon_enable()
+
+    rigs, objects = rig_create(CONES)
+    armature_animate(rigs[0], FRAMES)
+    key = objects[0].data.shape_keys
+
+    drivers = [fc.driver for fc in key.animation_data.drivers]
+    results = {
+        "cones": CONES,
+        "frames": FRAMES,
+        "simple_expressions": sum(driver.is_simple_expression for driver in drivers),
+        }
+
+    playback(2) # Warm up
+    with timer(results, "frame_simple", FRAMES):
+        playback(FRAMES)
+
+    # float() is not part of the simple expression subset and forces Python evaluation
+    for driver in drivers:
+        driver.expression = f'float({driver.expression})'
+
+    playback(2)
+    with timer(results, "frame_python", FRAMES):
+        playback(FRAMES)
+
+    results["speedup"] = results["frame_python"]["mean"] / results["frame_simple"]["mean"]
+    results_write(results)
+
+
+if __name__ == "__main__":
+    main()
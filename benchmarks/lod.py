@@ -0,0 +1,135 @@
+# Measures playback frame rate on a 50 character scene with viewport LOD disabled
+# and enabled. Characters are spread away from the camera and some are hidden.
+#
+# The animation is played with the screen's playback operator, so the add-on's
+# playback and frame change handlers run as they would for a user. Playback needs
+# the UI, so run this script without --background:
+#
+#   blender --factory-startup --python benchmarks/lod.py -- results.json
+#
+# Playback is started from a timer, frames are timed from a frame change handler,
+# and every frame is played (no frame dropping) at an uncapped frame rate.
+
+import os
+import sys
+import time
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import bpy
+from common import (addon_enable, armature_animate, results_write, rig_create,
+                    scene_reset)
+
+CHARACTERS = 50
+CONES = 40
+BONES = 4
+FRAMES = 60
+WARMUP = 5
+SPACING = 2.0
+HIDDEN = 10
+
+
+def screen_override():
+    window = bpy.context.window_manager.windows[0]
+    return bpy.context.temp_override(window=window, screen=window.screen)
+
+
+def drivers_muted() -> int:
+    count = 0
+    for key in bpy.data.shape_keys:
+        drivers = key.animation_data.drivers if key.animation_data else None
+        for manager in key.cone_based_drivers:
+            fcurve = drivers.find(manager.data_path) if drivers else None
+            count += fcurve is not None and fcurve.mute
+    return count
+
+
+def play(results, name: str):
+    """Plays the animation until FRAMES frames have been timed after the warm up"""
+    times = []
+
+    def frame_change(*_):
+        times.append(time.perf_counter())
+
+    bpy.app.handlers.frame_change_post.append(frame_change)
+    with screen_override():
+        bpy.ops.screen.animation_play()
+    while len(times) < WARMUP + FRAMES + 1:
+        yield
+
+    # Read while still playing, as drivers are resumed when playback stops
+    results[f'{name}/suspended'] = drivers_muted()
+    with screen_override():
+        bpy.ops.screen.animation_cancel(restore_frame=True)
+    bpy.app.handlers.frame_change_post.remove(frame_change)
+
+    timed = times[WARMUP:]
+    elapsed = timed[-1] - timed[0]
+    results[name] = {"total": elapsed, "count": FRAMES, "mean": elapsed / FRAMES}
+    results[f'{name}/fps'] = FRAMES / elapsed
+
+
+def run(results):
+    scene_reset()
+    addon_enable()
+
+    scene = bpy.context.scene
+    rigs, objects = rig_create(CONES, meshes=CHARACTERS, armatures=CHARACTERS, bones=BONES)
+    for rig in rigs:
+        armature_animate(rig, FRAMES)
+
+    for index, (rig, object) in enumerate(zip(rigs, objects)):
+        rig.location.y = object.location.y = SPACING * (index + 1)
+        if index % (CHARACTERS // HIDDEN) == 0:
+            object.hide_set(True)
+
+    camera = bpy.data.objects.new("Camera", bpy.data.cameras.new("Camera"))
+    scene.collection.objects.link(camera)
+    camera.rotation_euler = (1.5708, 0.0, 0.0) # Looking down +Y
+    scene.camera = camera
+
+    scene.frame_start = 1
+    scene.frame_end = FRAMES
+    scene.render.fps = 1000
+    scene.sync_mode = 'NONE'
+
+    settings = scene.cone_based_lod
+    settings.distance = SPACING * CHARACTERS / 4.0
+    results.update({"characters": CHARACTERS, "cones": CONES * CHARACTERS, "frames": FRAMES})
+    yield
+
+    for name, enabled in (("disabled", False), ("enabled", True)):
+        settings.enabled = enabled
+        settings.use_distance = enabled
+        yield from play(results, name)
+        yield
+
+    results["resumed"] = drivers_muted() == 0
+    results["speedup"] = results["enabled/fps"] / results["disabled/fps"]
+    results_write(results)
+    assert results["resumed"], "Drivers are still muted after playback stopped"
+
+
+def main() -> None:
+    if bpy.app.background:
+        sys.exit("lod.py needs animation playback, which doesn't run in background mode, "
+                 "run it without --background")
+
+    steps = run({})
+
+    def step():
+        try:
+            next(steps)
+        except StopIteration:
+            bpy.ops.wm.quit_blender()
+            return None
+        except Exception:
+            import traceback
+            traceback.print_exc()
+            os._exit(1)
+        return 0.0
+
+    bpy.app.timers.register(step, first_interval=0.1, persistent=True)
+
+
+if __name__ == "__main__":
+    main()
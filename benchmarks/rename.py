@@ -0,0 +1,106 @@
+# Measures shape key rename latency as the number of unrelated cone-driven shape
+# keys in the file grows, and fails if the time per rename grows with it.
+#
+# Shape keys are renamed through RNA and the add-on's message bus subscription
+# updates their managers. The message bus dispatches notifications from the event
+# loop, which does not run in background mode, so run this script with the UI:
+#
+#   blender --factory-startup --python benchmarks/rename.py -- results.json
+#
+# Renames are driven by a timer so that each notification is dispatched before the
+# next rename. The subscribed callback is wrapped to time it.
+
+import os
+import statistics
+import sys
+import time
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import bpy
+from common import addon_enable, results_write, rig_create, scene_reset
+
+SIZES = (10, 100, 1000)
+RENAMES = 200
+
+# Allowed ratio of the median rename time for the largest to the smallest size
+GROWTH = 4.0
+
+
+def callback_timed(timings):
+    from cone_based_shape_key_driver.api import index
+    callback = index.shape_key_name_callback
+
+    def timed(identifier: str) -> None:
+        start = time.perf_counter()
+        callback(identifier)
+        timings.append(time.perf_counter() - start)
+
+    # Subscriptions made from here on notify the wrapper
+    index.shape_key_name_callback = timed
+    return callback
+
+
+def run(results):
+    for size in SIZES:
+        scene_reset()
+        addon_enable()
+
+        from cone_based_shape_key_driver.api import index
+        timings = []
+        callback = callback_timed(timings)
+
+        # One small key that is renamed, plus many unrelated keys
+        _, objects = rig_create(1, meshes=1)
+        # Spread the unrelated cones over meshes of at most 100 shape keys each
+        meshes = max(1, size // 100)
+        rig_create(size // meshes, meshes=meshes)
+        index.index_rebuild()
+
+        key = objects[0].data.shape_keys
+        shape = key.key_blocks[1]
+        manager = key.cone_based_drivers[0]
+
+        for count in range(RENAMES):
+            shape.name = f'Renamed.{count:04d}'
+            yield # Let the event loop dispatch the notification
+            assert manager.name == shape.name, "Rename was not tracked"
+
+        index.shape_key_name_callback = callback
+        assert len(timings) == RENAMES, f'{len(timings)} notifications for {RENAMES} renames'
+        total = sum(timings)
+        results[f'rename_{size}'] = {"total": total,
+                                     "count": RENAMES,
+                                     "mean": total / RENAMES,
+                                     "median": statistics.median(timings)}
+
+    smallest = results[f'rename_{SIZES[0]}']["median"]
+    largest = results[f'rename_{SIZES[-1]}']["median"]
+    results["growth"] = largest / smallest
+    results_write(results)
+    assert largest <= smallest * GROWTH, (
+        f'Rename time grew {largest / smallest:.1f}x from {SIZES[0]} to {SIZES[-1]} cones')
+
+
+def main() -> None:
+    if bpy.app.background:
+        sys.exit("rename.py needs the event loop to dispatch renames, run it without --background")
+
+    steps = run({})
+
+    def step():
+        try:
+            next(steps)
+        except StopIteration:
+            bpy.ops.wm.quit_blender()
+            return None
+        except Exception:
+            import traceback
+            traceback.print_exc()
+            os._exit(1)
+        return 0.0
+
+    bpy.app.timers.register(step, first_interval=0.1, persistent=True)
+
+
+if __name__ == "__main__":
+    main()
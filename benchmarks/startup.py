@@ -0,0 +1,67 @@
+# Measures the cost of enabling the add-on: importing the package and its
+# bpy-dependent modules, register() and unregister(), and the load_post handler
+# for files with and without cone drivers.
+
+import os
+import sys
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from common import ROOT, results_write, rig_create, scene_reset, timer
+
+PACKAGE = "cone_based_shape_key_driver"
+REPEAT = 10
+CONES = 100
+
+
+def package_unload() -> None:
+    for name in [name for name in sys.modules if name == PACKAGE or name.startswith(PACKAGE + ".")]:
+        del sys.modules[name]
+
+
+def main() -> None:
+    import importlib
+
+    scene_reset()
+    if ROOT not in sys.path:
+        sys.path.insert(0, ROOT)
+
+    results = {"repeat": REPEAT, "numpy_preloaded": "numpy" in sys.modules}
+
+    package_unload()
+    with timer(results, "import"):
+        addon = importlib.import_module(PACKAGE)
+
+    # The package defers its bpy-dependent modules to register()
+    with timer(results, "import_addon"):
+        module = importlib.import_module(PACKAGE + ".addon")
+
+    with timer(results, "register"):
+        addon.register()
+    results["numpy_imported"] = "numpy" in sys.modules
+
+    with timer(results, "unregister"):
+        addon.unregister()
+
+    # Repeated enable/disable cycles with the modules already imported
+    with timer(results, "register_cycle", REPEAT):
+        for _ in range(REPEAT):
+            addon.register()
+            addon.unregister()
+
+    addon.register()
+
+    with timer(results, "load_post_empty", REPEAT):
+        for _ in range(REPEAT):
+            module.load_post_handler()
+
+    rig_create(CONES)
+    with timer(results, "load_post_cones", REPEAT):
+        for _ in range(REPEAT):
+            module.load_post_handler()
+
+    results["cones"] = CONES
+    results_write(results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+# Benchmark suite for the cone-based shape key driver add-on.
+#
+#   blender --background --factory-startup --python benchmarks/suite.py -- results.json
+#
+# Builds synthetic scenes with 10/100/1000 cone-driven shape keys on one armature
+# and spread across several armatures, and measures adding managers through the
+# add operator, manager.update(), shape key rename latency, playback frame time,
+# file save/load time and memory. Results are written as JSON so runs of different
+# add-on versions can be compared.
+
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import bpy
+from common import (addon_enable, armature_animate, armature_create, mesh_create,
+                    playback, results_write, scene_reset, timer)
+
+SIZES = (10, 100, 1000)
+LAYOUTS = (("single", 1), ("multi", 10))
+FRAMES = 50
+
+
+def memory_rss() -> int:
+    try:
+        import resource
+    except ImportError:
+        return 0
+    usage = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return usage if sys.platform == "darwin" else usage * 1024
+
+
+def cones_add(mesh: 'bpy.types.Object', armatures, results, name: str) -> None:
+    view_layer = bpy.context.view_layer
+    view_layer.objects.active = mesh
+    key = mesh.data.shape_keys
+    count = len(key.key_blocks) - 1
+
+    with timer(results, f'{name}/add', count):
+        for index in range(1, count + 1):
+            mesh.active_shape_key_index = index
+            bpy.ops.cone_based_shape_key_driver.add()
+
+    for index, manager in enumerate(key.cone_based_drivers):
+        armature = armatures[index % len(armatures)]
+        manager.object = armature
+        manager.bone_target = armature.data.bones[index % len(armature.data.bones)].name
+
+
+def run(results, size: int, layout: str, armature_count: int) -> None:
+    name = f'{layout}/{size}'
+
+    scene_reset()
+    addon_enable()
+    from cone_based_shape_key_driver.api.index import shape_key_name_callback
+
+    tracemalloc.start()
+    rss = memory_rss()
+
+    armatures = [armature_create(f'Armature.{index:03d}', bones=4) for index in range(armature_count)]
+    for armature in armatures:
+        armature_animate(armature, FRAMES)
+
+    mesh = mesh_create("Mesh", size)
+    cones_add(mesh, armatures, results, name)
+    key = mesh.data.shape_keys
+    managers = list(key.cone_based_drivers)
+
+    with timer(results, f'{name}/update', len(managers)):
+        for manager in managers:
+            manager.update()
+
+    shape = key.key_blocks[1]
+    identifier = managers[0].identifier
+    with timer(results, f'{name}/rename', 100):
+        for index in range(100):
+            shape.name = f'Renamed.{index:03d}'
+            shape_key_name_callback(identifier)
+
+    playback(2)
+    with timer(results, f'{name}/frame', FRAMES):
+        playback(FRAMES)
+
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    results[f'{name}/memory'] = {"python_peak": peak, "rss_delta": max(0, memory_rss() - rss)}
+
+    with tempfile.TemporaryDirectory() as directory:
+        filepath = os.path.join(directory, "benchmark.blend")
+        with timer(results, f'{name}/save'):
+            bpy.ops.wm.save_as_mainfile(filepath=filepath, compress=False)
+        results[f'{name}/file_size'] = os.path.getsize(filepath)
+        with timer(results, f'{name}/load'):
+            bpy.ops.wm.open_mainfile(filepath=filepath, load_ui=False)
+
+
+def main() -> None:
+    results = {
+        "blender": bpy.app.version_string,
+        "timestamp": time.time(),
+        }
+
+    addon = addon_enable()
+    results["addon"] = ".".join(str(v) for v in addon.bl_info["version"])
+
+    for size in SIZES:
+        for layout, armature_count in LAYOUTS:
+            run(results, size, layout, armature_count)
+
+    results_write(results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,265 @@
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU General Public License
+#  as published by the Free Software Foundation; either version 2
+#  of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software Foundation,
+#  Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+#
+# ##### END GPL LICENSE BLOCK #####
+
+# Registration of the add-on's classes, properties and handlers. Imported by the
+# package's register() so that importing the package itself doesn't require bpy.
+
+import logging
+import bpy
+from .lib.curve_mapping import (BLCMAP_CurvePointProperties,
+                                BLCMAP_CurveProperties,
+                                BLCMAP_CurvePoint,
+                                BLCMAP_CurvePoints,
+                                BLCMAP_Curve,
+                                BLCMAP_OT_curve_copy,
+                                BLCMAP_OT_curve_paste,
+                                BLCMAP_OT_handle_type_set,
+                                BLCMAP_OT_node_ensure,
+                                BCLMAP_OT_curve_point_remove)
+from .api.activation import ConeBasedShapeKeyDriverActivation
+from .api.manager import (ConeBasedShapeKeyDriverManager,
+                          bezier_cache,
+                          keyframe_cache)
+from .api.repair import (collect_clear,
+                         collect_depsgraph_update_handler,
+                         collect_save_pre_handler,
+                         managers_repair)
+from .api.cached import (cached_frame_change_handler,
+                         cached_function_register,
+                         cached_function_unregister,
+                         result_cache)
+from .api.group import (group_clear,
+                        group_function_register,
+                        group_function_unregister,
+                        group_rebuild,
+                        group_update_pre_handler)
+from .api.lod import (ConeBasedShapeKeyDriverLOD,
+                      lod_clear,
+                      lod_handlers,
+                      lod_playback_post_handler,
+                      lod_resume)
+from .api.index import (bone_depsgraph_update_handler,
+                        cone_keys,
+                        index_clear,
+                        index_rebuild,
+                        lookup_depsgraph_update_handler,
+                        lookup_invalidate)
+from .ops.add import CONEBASEDSHAPEKEYDRIVER_OT_add
+from .ops.add_batch import CONEBASEDSHAPEKEYDRIVER_OT_add_batch
+from .ops.bake import CONEBASEDSHAPEKEYDRIVER_OT_bake
+from .ops.remove import CONEBASEDSHAPEKEYDRIVER_OT_remove
+from .ops.recenter import CONEBASEDSHAPEKEYDRIVER_OT_recenter
+from .ops.fit import CONEBASEDSHAPEKEYDRIVER_OT_fit
+from .ops.radius import CONEBASEDSHAPEKEYDRIVER_OT_radius_calculate
+from .ops.radius_solve import CONEBASEDSHAPEKEYDRIVER_OT_radius_solve
+from .ops.validate import CONEBASEDSHAPEKEYDRIVER_OT_validate
+from .ops.setup_export import CONEBASEDSHAPEKEYDRIVER_OT_setup_export
+from .ops.setup_import import CONEBASEDSHAPEKEYDRIVER_OT_setup_import
+from .ops.mirror import CONEBASEDSHAPEKEYDRIVER_OT_mirror
+from .ops.transfer import CONEBASEDSHAPEKEYDRIVER_OT_transfer
+from .ops.profile import CONEBASEDSHAPEKEYDRIVER_OT_profile
+from .ops.repair import CONEBASEDSHAPEKEYDRIVER_OT_repair
+from .ops.collect import CONEBASEDSHAPEKEYDRIVER_OT_collect
+from .ops.compact import CONEBASEDSHAPEKEYDRIVER_OT_compact
+from .ops.rebuild import CONEBASEDSHAPEKEYDRIVER_OT_rebuild
+from .ops.profile_export import CONEBASEDSHAPEKEYDRIVER_OT_profile_export
+from .gui.panel import CONEBASEDSHAPEKEYDRIVER_PT_settings
+from .gui.profile import CONEBASEDSHAPEKEYDRIVER_PT_profile
+from .gui.lod import CONEBASEDSHAPEKEYDRIVER_PT_lod
+from .gui.menu import CONEBASEDSHAPEKEYDRIVER_MT_tools, draw_menu_items
+
+
+def classes():
+    return [
+        BLCMAP_CurvePointProperties,
+        BLCMAP_CurveProperties,
+        BLCMAP_CurvePoint,
+        BLCMAP_CurvePoints,
+        BLCMAP_Curve,
+        BLCMAP_OT_curve_copy,
+        BLCMAP_OT_curve_paste,
+        BLCMAP_OT_handle_type_set,
+        BLCMAP_OT_node_ensure,
+        BCLMAP_OT_curve_point_remove,
+        ConeBasedShapeKeyDriverActivation,
+        ConeBasedShapeKeyDriverManager,
+        ConeBasedShapeKeyDriverLOD,
+        CONEBASEDSHAPEKEYDRIVER_OT_add,
+        CONEBASEDSHAPEKEYDRIVER_OT_add_batch,
+        CONEBASEDSHAPEKEYDRIVER_OT_bake,
+        CONEBASEDSHAPEKEYDRIVER_OT_remove,
+        CONEBASEDSHAPEKEYDRIVER_OT_recenter,
+        CONEBASEDSHAPEKEYDRIVER_OT_fit,
+        CONEBASEDSHAPEKEYDRIVER_OT_radius_calculate,
+        CONEBASEDSHAPEKEYDRIVER_OT_radius_solve,
+        CONEBASEDSHAPEKEYDRIVER_OT_validate,
+        CONEBASEDSHAPEKEYDRIVER_OT_setup_export,
+        CONEBASEDSHAPEKEYDRIVER_OT_setup_import,
+        CONEBASEDSHAPEKEYDRIVER_OT_mirror,
+        CONEBASEDSHAPEKEYDRIVER_OT_transfer,
+        CONEBASEDSHAPEKEYDRIVER_OT_profile,
+        CONEBASEDSHAPEKEYDRIVER_OT_profile_export,
+        CONEBASEDSHAPEKEYDRIVER_OT_repair,
+        CONEBASEDSHAPEKEYDRIVER_OT_collect,
+        CONEBASEDSHAPEKEYDRIVER_OT_compact,
+        CONEBASEDSHAPEKEYDRIVER_OT_rebuild,
+        CONEBASEDSHAPEKEYDRIVER_MT_tools,
+        CONEBASEDSHAPEKEYDRIVER_PT_settings,
+        CONEBASEDSHAPEKEYDRIVER_PT_profile,
+        CONEBASEDSHAPEKEYDRIVER_PT_lod
+    ]
+
+
+def caches_clear() -> None:
+    keyframe_cache.clear()
+    bezier_cache.clear()
+    group_clear()
+    result_cache.clear()
+    collect_clear()
+    lod_clear()
+    lookup_invalidate()
+
+
+@bpy.app.handlers.persistent
+def enable_message_broker(_=None) -> None:
+    caches_clear()
+    keys = cone_keys()
+    index_rebuild(keys)
+    group_rebuild(keys, tag=True)
+
+
+@bpy.app.handlers.persistent
+def load_post_handler(_=None) -> None:
+    caches_clear()
+    keys = cone_keys()
+    if not keys:
+        # Nothing to repair or subscribe to (the common case for most files)
+        index_clear()
+        return
+    report = managers_repair(keys)
+    if report.changed:
+        logging.getLogger(__name__).info("%s", report)
+        keys = cone_keys()
+    index_rebuild(keys)
+    group_rebuild(keys, tag=True)
+    lod_resume() # Drivers may have been saved while suspended
+
+
+_preferences = None
+
+
+def preferences_register() -> None:
+    """Registers the add-on preferences, and with them the update checker, once
+    Blender is idle so that importing them is kept off the startup path"""
+    global _preferences
+    if _preferences is None:
+        from bpy.utils import register_class
+        from .api.preferences import ConeBasedShapeKeyDriverPreferences
+        register_class(ConeBasedShapeKeyDriverPreferences)
+        _preferences = ConeBasedShapeKeyDriverPreferences
+
+
+def preferences_unregister() -> None:
+    global _preferences
+    if bpy.app.timers.is_registered(preferences_register):
+        bpy.app.timers.unregister(preferences_register)
+    if _preferences is not None:
+        bpy.utils.unregister_class(_preferences)
+        _preferences = None
+
+
+def register():
+    from bpy.utils import register_class
+    from bpy.types import Key, Scene
+    from bpy.props import CollectionProperty, PointerProperty
+
+    BLCMAP_OT_curve_copy.bl_idname = "cone_based_shape_key_driver.curve_copy"
+    BLCMAP_OT_curve_paste.bl_idname = "cone_based_shape_key_driver.curve_paste"
+    BLCMAP_OT_node_ensure.bl_idname = "cone_based_shape_key_driver.node_ensure"
+    BCLMAP_OT_curve_point_remove.bl_idname = "cone_based_shape_key_driver.curve_point_remove"
+    BLCMAP_OT_handle_type_set.bl_idname = "cone_based_shape_key_driver.handle_type_set"
+
+    for cls in classes():
+        register_class(cls)
+
+    Key.cone_based_drivers = CollectionProperty(
+        name="Cone Based Corrective Shape Keys",
+        type=ConeBasedShapeKeyDriverManager,
+        options=set()
+        )
+
+    Scene.cone_based_lod = PointerProperty(
+        name="Cone-Based Driver LOD",
+        type=ConeBasedShapeKeyDriverLOD,
+        options=set()
+        )
+
+    bpy.types.MESH_MT_shape_key_context_menu.append(draw_menu_items)
+    bpy.app.handlers.load_post.append(load_post_handler)
+    bpy.app.handlers.undo_post.append(enable_message_broker)
+    bpy.app.handlers.redo_post.append(enable_message_broker)
+    bpy.app.handlers.depsgraph_update_post.append(lookup_depsgraph_update_handler)
+    bpy.app.handlers.depsgraph_update_post.append(bone_depsgraph_update_handler)
+    bpy.app.handlers.depsgraph_update_post.append(collect_depsgraph_update_handler)
+    bpy.app.handlers.save_pre.append(collect_save_pre_handler)
+    bpy.app.handlers.frame_change_pre.append(cached_frame_change_handler)
+    bpy.app.handlers.frame_change_pre.append(group_update_pre_handler)
+    bpy.app.handlers.depsgraph_update_pre.append(group_update_pre_handler)
+    for handlers, handler in lod_handlers():
+        handlers.append(handler)
+    cached_function_register()
+    group_function_register()
+    bpy.app.timers.register(preferences_register, first_interval=0.5, persistent=True)
+    enable_message_broker() # Ensure messages are subscribed to on first install
+
+
+def unregister():
+    preferences_unregister()
+    index_clear()
+    lookup_invalidate()
+    group_function_unregister()
+    bpy.app.handlers.frame_change_pre.remove(group_update_pre_handler)
+    bpy.app.handlers.depsgraph_update_pre.remove(group_update_pre_handler)
+    group_clear()
+    cached_function_unregister()
+    result_cache.clear()
+    bpy.app.handlers.frame_change_pre.remove(cached_frame_change_handler)
+    for handlers, handler in lod_handlers():
+        handlers.remove(handler)
+    lod_playback_post_handler() # Resumes drivers if disabled during playback
+    lod_clear()
+    bpy.app.handlers.depsgraph_update_post.remove(lookup_depsgraph_update_handler)
+    bpy.app.handlers.depsgraph_update_post.remove(bone_depsgraph_update_handler)
+    bpy.app.handlers.depsgraph_update_post.remove(collect_depsgraph_update_handler)
+    bpy.app.handlers.save_pre.remove(collect_save_pre_handler)
+    collect_clear()
+    bpy.app.handlers.load_post.remove(load_post_handler)
+    bpy.app.handlers.undo_post.remove(enable_message_broker)
+    bpy.app.handlers.redo_post.remove(enable_message_broker)
+    bpy.types.MESH_MT_shape_key_context_menu.remove(draw_menu_items)
+
+    try:
+        del bpy.types.Key.cone_based_drivers
+    except: pass
+
+    try:
+        del bpy.types.Scene.cone_based_lod
+    except: pass
+
+    for cls in reversed(classes()):
+        bpy.utils.unregister_class(cls)
@@ -1,8 +1,9 @@
 
 from typing import TYPE_CHECKING
 from bpy.types import PropertyGroup
-from bpy.props import FloatProperty
+from bpy.props import BoolProperty, FloatProperty
 from ..lib.curve_mapping import BCLMAP_CurveManager
+from .compact import activation_compact_set, activation_is_compact
 if TYPE_CHECKING:
     from bpy.types import Context, ShapeKey
 
@@ -10,13 +11,13 @@ if TYPE_CHECKING:
 def activation_radius_update_handler(activation: 'ConeBasedShapeKeyDriverActivation',
                                      _: 'Context') -> None:
     path: str = activation.path_from_id()
-    activation.id_data.path_resolve(path.rpartition(".")[0]).update()
+    activation.id_data.path_resolve(path.rpartition(".")[0]).update_keyframes()
 
 
 def activation_target_update_handler(activation: 'ConeBasedShapeKeyDriverActivation',
                                      _: 'Context') -> None:
     path: str = activation.path_from_id()
-    activation.id_data.path_resolve(path.rpartition(".")[0]).update()
+    activation.id_data.path_resolve(path.rpartition(".")[0]).update_keyframes()
 
 
 class ConeBasedShapeKeyDriverActivation(BCLMAP_CurveManager, PropertyGroup):
@@ -41,9 +42,18 @@ class ConeBasedShapeKeyDriverActivation(BCLMAP_CurveManager, PropertyGroup):
         update=activation_target_update_handler
         )
 
+    compact: BoolProperty(
+        name="Compact",
+        description=("Store the activation curve packed into flat arrays, reducing file size and "
+                     "undo memory. The curve must be unpacked to be edited"),
+        get=activation_is_compact,
+        set=activation_compact_set,
+        options=set()
+        )
+
     def update(self) -> None:
         super().update()
-        self.id_data.path_resolve(self.path_from_id().rpartition(".")[0]).update()
+        self.id_data.path_resolve(self.path_from_id().rpartition(".")[0]).update_keyframes()
 
     def __init__(self, shape: 'ShapeKey') -> None:
         self["value"] = shape.value
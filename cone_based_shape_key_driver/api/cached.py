@@ -0,0 +1,64 @@
+
+# Memoized evaluation for cone drivers that go through Python.
+#
+# Drivers using the cached driver type call a function registered in
+# bpy.app.driver_namespace with the bone's rotation channels and the cone's center
+# direction. The bone's direction and each cone's result are memoized per (bone,
+# quaternion), so cones sharing a bone, still poses, re-evaluations of the same
+# frame and other view layers skip the math. The cache is bounded and advanced on
+# every frame change, discarding entries that were not used on the previous frame.
+
+from typing import Dict, Tuple, TYPE_CHECKING
+from math import asin, pi
+import bpy
+from ..lib.cache import GenerationCache
+from ..lib.expression import format_literal
+if TYPE_CHECKING:
+    from .manager import ConeBasedShapeKeyDriverManager
+
+CACHED_FUNCTION = "cone_based_cached"
+
+# (armature, bone, w, x, y, z) -> (bone direction, center direction -> result)
+result_cache: GenerationCache[Tuple[Tuple[float, float, float], Dict[Tuple[float, float, float], float]]]
+result_cache = GenerationCache(maxsize=4096)
+
+
+def cached_expression(manager: 'ConeBasedShapeKeyDriverManager',
+                      bone: str,
+                      direction: Tuple[float, float, float]) -> str:
+    armature = manager.object
+    name = armature.name if armature is not None else ""
+    x, y, z = (format_literal(v) for v in direction)
+    return f'{CACHED_FUNCTION}({name!r}, {bone!r}, {x}, {y}, {z}, w, x, y, z)'
+
+
+def cached_evaluate(armature: str, bone: str,
+                    cx: float, cy: float, cz: float,
+                    w: float, x: float, y: float, z: float) -> float:
+    key = (armature, bone, w, x, y, z)
+    entry = result_cache.get(key)
+    if entry is None:
+        entry = ((2.0*(x*y-w*z), 1.0-2.0*(x*x+z*z), 2.0*(y*z+w*x)), {})
+        result_cache.set(key, entry)
+
+    center = (cx, cy, cz)
+    results = entry[1]
+    result = results.get(center)
+    if result is None:
+        dx, dy, dz = entry[0]
+        dot = min(max(dx*cx + dy*cy + dz*cz, -1.0), 1.0)
+        result = results[center] = (asin(dot) + pi/2.0) / pi
+    return result
+
+
+@bpy.app.handlers.persistent
+def cached_frame_change_handler(*_) -> None:
+    result_cache.advance()
+
+
+def cached_function_register() -> None:
+    bpy.app.driver_namespace[CACHED_FUNCTION] = cached_evaluate
+
+
+def cached_function_unregister() -> None:
+    bpy.app.driver_namespace.pop(CACHED_FUNCTION, None)
@@ -0,0 +1,146 @@
+
+# Compact storage for activation curves.
+#
+# The curve-mapping points of an activation are stored as one ID property group
+# per point. A compact activation instead stores one flat array per field of the
+# point type (its numeric and enum properties, in RNA order), read and written in
+# bulk with foreach_get/foreach_set. Drivers are rebuilt by converting the packed
+# points to bezier keyframes as for an unpacked curve, so radius and target remain
+# editable and later changes to the conversion apply. The curve itself is unpacked
+# to be edited.
+
+from typing import List, Optional, Tuple, TYPE_CHECKING
+from types import SimpleNamespace
+from ..lib.curve_mapping import to_bezier
+from ..lib.utils import idprop_to_python
+if TYPE_CHECKING:
+    from bpy.types import Struct
+    from ..lib.evaluation import Keyframe
+    from .activation import ConeBasedShapeKeyDriverActivation
+
+COMPACT_PROPERTY = "_compact"
+
+
+def activation_is_compact(activation: 'ConeBasedShapeKeyDriverActivation') -> bool:
+    return COMPACT_PROPERTY in activation
+
+
+def points_rna(activation: 'ConeBasedShapeKeyDriverActivation') -> Tuple[List[str], 'Struct']:
+    """Returns the path from the activation to its curve points and their RNA type"""
+    path = activation.points.path_from_id()[len(activation.path_from_id())+1:]
+    parts = path.split(".")
+    struct = activation.bl_rna
+    for part in parts:
+        struct = struct.properties[part].fixed_type
+    return parts, struct
+
+
+def point_fields(struct: 'Struct') -> List[str]:
+    """Returns the names of the point type's properties that are packed"""
+    fields = []
+    for prop in struct.properties:
+        if prop.identifier == "rna_type" or prop.is_readonly:
+            continue
+        if prop.type in {'BOOLEAN', 'INT', 'FLOAT'} or (prop.type == 'ENUM' and not prop.is_enum_flag):
+            fields.append(prop.identifier)
+    return fields
+
+
+def points_owner(activation: 'ConeBasedShapeKeyDriverActivation', parts: List[str]) -> Optional[object]:
+    """Returns the ID property group holding the activation's points, if any"""
+    owner = activation
+    for part in parts[:-1]:
+        owner = owner.get(part)
+        if owner is None:
+            return None
+    return owner if parts[-1] in owner else None
+
+
+def activation_pack(activation: 'ConeBasedShapeKeyDriverActivation') -> bool:
+    """Packs the activation curve, returning False if it is already packed or can't
+    be packed (it has no points, or they store data other than the packed fields)"""
+    if COMPACT_PROPERTY in activation:
+        return False
+
+    parts, struct = points_rna(activation)
+    owner = points_owner(activation, parts)
+    points = activation.points
+    count = len(points)
+    if owner is None or not count:
+        return False
+
+    fields = point_fields(struct)
+    names = set(fields)
+    if not all(names.issuperset(point.keys()) for point in points):
+        return False
+
+    data = {}
+    for name in fields:
+        values = [0] * (count * (struct.properties[name].array_length or 1))
+        points.foreach_get(name, values)
+        data[name] = values
+
+    activation[COMPACT_PROPERTY] = {"count": count, "fields": data}
+    del owner[parts[-1]]
+    return True
+
+
+def activation_unpack(activation: 'ConeBasedShapeKeyDriverActivation') -> bool:
+    """Restores the activation curve's points from their packed form, returning
+    False if it is not packed"""
+    if COMPACT_PROPERTY not in activation:
+        return False
+
+    compact = idprop_to_python(activation[COMPACT_PROPERTY])
+    del activation[COMPACT_PROPERTY]
+
+    _, struct = points_rna(activation)
+    points = activation.points
+    points.clear()
+    for _ in range(compact["count"]):
+        points.add()
+    for name, values in compact["fields"].items():
+        if name in struct.properties:
+            points.foreach_set(name, values)
+
+    return True
+
+
+def compact_points(activation: 'ConeBasedShapeKeyDriverActivation') -> List[SimpleNamespace]:
+    """Returns the packed curve points, read as their RNA type would be"""
+    from mathutils import Vector
+    _, struct = points_rna(activation)
+    compact = idprop_to_python(activation[COMPACT_PROPERTY])
+    count = compact["count"]
+
+    columns = {}
+    for name, values in compact["fields"].items():
+        prop = struct.properties.get(name)
+        if prop is None:
+            continue
+        size = prop.array_length
+        if prop.type == 'ENUM':
+            names = {item.value: item.identifier for item in prop.enum_items}
+            columns[name] = [names.get(value, prop.default) for value in values]
+        elif size:
+            cast = Vector if prop.type == 'FLOAT' else tuple
+            columns[name] = [cast(values[i*size:(i+1)*size]) for i in range(count)]
+        else:
+            columns[name] = [bool(value) for value in values] if prop.type == 'BOOLEAN' else values
+
+    return [SimpleNamespace(**{name: column[index] for name, column in columns.items()})
+            for index in range(count)]
+
+
+def compact_bezier(activation: 'ConeBasedShapeKeyDriverActivation',
+                   x_range: Tuple[float, float],
+                   y_range: Tuple[float, float]) -> List['Keyframe']:
+    """Returns the packed curve converted to bezier keyframes over the given ranges"""
+    return to_bezier(compact_points(activation), x_range=x_range, y_range=y_range, extrapolate=False)
+
+
+def activation_compact_set(activation: 'ConeBasedShapeKeyDriverActivation', value: bool) -> None:
+    if value:
+        activation_pack(activation)
+    else:
+        activation_unpack(activation)
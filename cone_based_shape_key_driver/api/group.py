@@ -0,0 +1,151 @@
+
+# Grouped cone evaluation.
+#
+# Cones using the group driver type are evaluated together by a function
+# registered in bpy.app.driver_namespace. Every cone on the same armature bone
+# within a Key belongs to one group. The first driver in the group to be evaluated
+# computes the weights of all of its cones in one call (optionally normalized so
+# they sum to at most one) and the result is reused by the other drivers in the
+# group for as long as the bone's rotation is unchanged.
+#
+# Drivers pass only their manager's identifier, which survives renames of the Key,
+# the armature and the bone, and groups are looked up by their members. Groups are
+# never built during driver evaluation: changes mark the Key dirty and its groups
+# are rebuilt before the next depsgraph evaluation (see group_update_pre_handler),
+# or directly on file load and undo.
+#
+# NumPy is imported on first use to keep it off the add-on's startup path.
+
+from typing import Dict, Iterable, List, NamedTuple, Optional, Set, Tuple, TYPE_CHECKING
+from math import pi
+import bpy
+if TYPE_CHECKING:
+    import numpy as np
+    from bpy.types import Key, Object
+    from ..lib.evaluation import BezierCurves
+    from .manager import ConeBasedShapeKeyDriverManager
+
+GROUP_FUNCTION = "cone_based_group"
+
+
+class Group(NamedTuple):
+    key: 'Key'
+    index: Dict[str, int]
+    centers: 'np.ndarray'
+    curves: 'BezierCurves'
+    targets: 'np.ndarray'
+    normalize: bool
+
+
+# Manager identifier -> its group, the last result per group and Keys to rebuild
+_members: Dict[str, Group] = {}
+_results: Dict[int, Tuple[Tuple[float, float, float, float], 'np.ndarray']] = {}
+_dirty: Set['Key'] = set()
+
+
+def group_expression(manager: 'ConeBasedShapeKeyDriverManager') -> str:
+    return f'{GROUP_FUNCTION}({manager.identifier!r}, w, x, y, z)'
+
+
+def group_members(key: 'Key') -> Dict[Tuple[Optional['Object'], str], List['ConeBasedShapeKeyDriverManager']]:
+    """Returns the key's grouped managers by the armature and bone they target"""
+    from .index import key_drivers
+    from .manager import driver_bone_target
+    drivers = None
+    groups = {}
+    for manager in key.cone_based_drivers:
+        if manager.driver_type == 'GROUP':
+            if drivers is None:
+                drivers = key_drivers(key)
+            bone = driver_bone_target(drivers.get(manager.data_path))
+            groups.setdefault((manager.object, bone), []).append(manager)
+    return groups
+
+
+def group_build(key: 'Key', members: List['ConeBasedShapeKeyDriverManager']) -> Group:
+    import numpy as np
+    from ..lib.evaluation import bezier_curves, directions
+    from .manager import manager_bezier
+    return Group(key,
+                 {m.identifier: i for i, m in enumerate(members)},
+                 directions([tuple(m.center_quaternion) for m in members]),
+                 bezier_curves([manager_bezier(m) for m in members]),
+                 np.array([m.activation.target for m in members]),
+                 any(m.group_normalize for m in members))
+
+
+def group_rebuild(keys: Iterable['Key'], tag: bool=False) -> None:
+    """Rebuilds the groups of the given Keys (not to be called from a driver). With
+    tag set, Keys with groups are tagged so that their drivers are re-evaluated."""
+    keys = set(keys)
+    for identifier in [i for i, group in _members.items() if group.key in keys]:
+        _results.pop(id(_members.pop(identifier)), None)
+
+    for key in keys:
+        try:
+            if not key.is_property_set("cone_based_drivers"):
+                continue
+        except ReferenceError:
+            continue # Removed since it was marked
+        groups = group_members(key)
+        for members in groups.values():
+            group = group_build(key, members)
+            for identifier in group.index:
+                _members[identifier] = group
+        if groups and tag:
+            key.update_tag()
+
+
+def group_invalidate(key: 'Key') -> None:
+    """Marks the key's groups to be rebuilt before drivers are next evaluated"""
+    _dirty.add(key)
+
+
+def group_flush() -> None:
+    if _dirty:
+        keys = list(_dirty)
+        _dirty.clear()
+        group_rebuild(keys)
+
+
+@bpy.app.handlers.persistent
+def group_update_pre_handler(*_) -> None:
+    group_flush()
+
+
+def group_evaluate(identifier: str, w: float, x: float, y: float, z: float) -> float:
+    group = _members.get(identifier)
+    if group is None:
+        return 0.0
+
+    index = group.index[identifier]
+    q = (w, x, y, z)
+    cached = _results.get(id(group))
+    if cached is not None and cached[0] == q:
+        return float(cached[1][index])
+
+    import numpy as np
+    from ..lib.evaluation import curve_evaluate, directions, normalize
+
+    dot = np.clip(group.centers @ directions(q), -1.0, 1.0)
+    values = curve_evaluate(group.curves, ((np.arcsin(dot) + pi/2.0) / pi)[None, :])[0]
+
+    if group.normalize:
+        values = normalize(values, group.targets)
+
+    _results[id(group)] = (q, values)
+    return float(values[index])
+
+
+def group_clear() -> None:
+    _members.clear()
+    _results.clear()
+    _dirty.clear()
+
+
+def group_function_register() -> None:
+    bpy.app.driver_namespace[GROUP_FUNCTION] = group_evaluate
+
+
+def group_function_unregister() -> None:
+    bpy.app.driver_namespace.pop(GROUP_FUNCTION, None)
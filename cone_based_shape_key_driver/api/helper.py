@@ -0,0 +1,108 @@
+
+# Helper objects used by native (non-scripted) cone drivers.
+#
+# A native driver reads a single ROTATION_DIFF variable between the target bone
+# and a hidden empty whose world rotation matches the bone's rotation when it is
+# posed at the cone's center. The empty is parented to the bone's parent (or the
+# armature) so that it follows the same parent space as the bone.
+
+from typing import Optional, TYPE_CHECKING
+from math import pi
+from mathutils import Matrix
+if TYPE_CHECKING:
+    from bpy.types import FCurveKeyframePoints, Object
+    from .manager import ConeBasedShapeKeyDriverManager
+
+
+def helper_name(manager: 'ConeBasedShapeKeyDriverManager') -> str:
+    return f'{manager.identifier}_center'
+
+
+def helper_remove(manager: 'ConeBasedShapeKeyDriverManager') -> None:
+    import bpy
+    helper = bpy.data.objects.get(helper_name(manager))
+    if helper is not None:
+        bpy.data.objects.remove(helper)
+
+
+def helper_ensure(manager: 'ConeBasedShapeKeyDriverManager', bone_target: str) -> Optional['Object']:
+    import bpy
+
+    armature: Optional['Object'] = manager.object
+    if armature is None or armature.type != 'ARMATURE':
+        return None
+
+    bone = armature.data.bones.get(bone_target)
+    if bone is None:
+        return None
+
+    name = helper_name(manager)
+    helper = bpy.data.objects.get(name)
+    if helper is None:
+        helper = bpy.data.objects.new(name, None)
+        helper.empty_display_type = 'SINGLE_ARROW'
+        helper.hide_viewport = True
+        helper.hide_render = True
+        helper.hide_select = True
+        for collection in armature.users_collection:
+            collection.objects.link(helper)
+
+    # Bone rest rotation relative to its parent (or the armature), then the cone center
+    rest = bone.matrix_local.to_3x3()
+    parent = bone.parent
+    if parent is not None:
+        rest = parent.matrix_local.to_3x3().inverted() @ rest
+        if (helper.parent != armature
+                or helper.parent_type != 'BONE'
+                or helper.parent_bone != parent.name):
+            helper.parent = armature
+            helper.parent_type = 'BONE'
+            helper.parent_bone = parent.name
+    elif helper.parent != armature or helper.parent_type != 'OBJECT':
+        helper.parent = armature
+        helper.parent_type = 'OBJECT'
+
+    if helper.matrix_parent_inverse != Matrix.Identity(4):
+        helper.matrix_parent_inverse = Matrix.Identity(4)
+
+    if helper.rotation_mode != 'QUATERNION':
+        helper.rotation_mode = 'QUATERNION'
+
+    rotation = (rest @ manager.center_quaternion.to_matrix()).to_quaternion()
+    if helper.rotation_quaternion != rotation:
+        helper.rotation_quaternion = rotation
+
+    return helper
+
+
+def keyframe_points_to_angle(keyframes: 'FCurveKeyframePoints') -> None:
+    """Re-expresses keyframes authored against the scripted driver's 0-1 input, where
+    1.0 is the cone's center, against a rotational difference in radians, where 0.0 is
+    the center. The curve is mirrored so keyframes stay ordered and handles are swapped."""
+    count = len(keyframes)
+    if not count:
+        return
+
+    data = {}
+    for attr in ("co", "handle_left", "handle_right"):
+        values = [0.0] * (count * 2)
+        keyframes.foreach_get(attr, values)
+        for index in range(0, len(values), 2):
+            values[index] = pi * (1.0 - values[index])
+        data[attr] = [values[index:index+2] for index in range(0, len(values), 2)][::-1]
+
+    for attr in ("interpolation", "handle_left_type", "handle_right_type"):
+        values = [0] * count
+        keyframes.foreach_get(attr, values)
+        data[attr] = values[::-1]
+
+    # Interpolation is stored on a segment's left keyframe
+    data["interpolation"] = data["interpolation"][1:] + data["interpolation"][:1]
+
+    flat = lambda items: [value for item in items for value in item]
+    keyframes.foreach_set("co", flat(data["co"]))
+    keyframes.foreach_set("handle_left", flat(data["handle_right"]))
+    keyframes.foreach_set("handle_right", flat(data["handle_left"]))
+    keyframes.foreach_set("interpolation", data["interpolation"])
+    keyframes.foreach_set("handle_left_type", data["handle_right_type"])
+    keyframes.foreach_set("handle_right_type", data["handle_left_type"])
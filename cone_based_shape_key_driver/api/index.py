@@ -0,0 +1,340 @@
+
+# Index of cone-based driver managers by identifier.
+#
+# Renames are tracked with one message bus subscription per driven shape key so
+# that renaming a shape key only touches its own manager instead of scanning every
+# shape key datablock and driver in the file. The index holds references to RNA
+# data so it is rebuilt whenever those may be invalidated (file load, undo/redo).
+
+from typing import Any, Callable, Dict, Iterable, List, NamedTuple, Optional, Tuple, TYPE_CHECKING
+import bpy
+if TYPE_CHECKING:
+    from bpy.types import FCurve, Key, Object, ShapeKey
+    from .manager import ConeBasedShapeKeyDriverManager
+
+
+class IndexEntry(NamedTuple):
+    key: 'Key'
+    shape: 'ShapeKey'
+    name: str
+    owner: object
+
+
+_entries: Dict[str, IndexEntry] = {}
+
+
+def shape_key_name_callback(identifier: str) -> None:
+    entry = _entries.get(identifier)
+    if entry is not None:
+        manager = manager_find(entry.key, identifier)
+        if manager is not None:
+            name = entry.shape.name
+            manager["name"] = name
+            _entries[identifier] = entry._replace(name=name)
+            lookup_invalidate(entry.key)
+
+
+def manager_find(key: 'Key', identifier: str) -> Optional['ConeBasedShapeKeyDriverManager']:
+    """Returns the manager with the given identifier using the index, falling back
+    to a scan of the key's managers if the index is out of date"""
+    entry = _entries.get(identifier)
+    if entry is not None and entry.key == key:
+        manager = key.cone_based_drivers.get(entry.name)
+        if manager is not None and manager.identifier == identifier:
+            return manager
+    for manager in key.cone_based_drivers:
+        if manager.identifier == identifier:
+            return manager
+    return None
+
+
+def index_add(key: 'Key', manager: 'ConeBasedShapeKeyDriverManager') -> None:
+    from .lod import lod_invalidate
+    identifier = manager.identifier
+    index_remove(identifier)
+    lookup_invalidate(key)
+    lod_invalidate(key)
+    bone_index_add(key, manager)
+
+    shape = key.key_blocks.get(manager.name)
+    if shape is None:
+        return
+
+    owner = object()
+    bpy.msgbus.subscribe_rna(key=shape.path_resolve("name", False),
+                             owner=owner,
+                             args=(identifier,),
+                             notify=shape_key_name_callback)
+    _entries[identifier] = IndexEntry(key, shape, shape.name, owner)
+
+
+def index_remove(identifier: str) -> None:
+    bone_index_remove(identifier)
+    entry = _entries.pop(identifier, None)
+    if entry is not None:
+        bpy.msgbus.clear_by_owner(entry.owner)
+        lookup_invalidate(entry.key)
+
+
+def index_clear() -> None:
+    bone_index_clear()
+    for entry in _entries.values():
+        bpy.msgbus.clear_by_owner(entry.owner)
+    _entries.clear()
+
+
+def cone_keys() -> List['Key']:
+    """Returns the shape key datablocks in the file that have cone-based drivers"""
+    return [key for key in bpy.data.shape_keys
+            if key.is_property_set("cone_based_drivers") and len(key.cone_based_drivers)]
+
+
+def index_rebuild(keys: Optional[List['Key']]=None) -> None:
+    index_clear()
+    for key in cone_keys() if keys is None else keys:
+        for manager in key.cone_based_drivers:
+            index_add(key, manager)
+
+
+# Index of managers by the armature and bone they target.
+#
+# Blender fixes bone names in driver variable targets and data paths itself when a
+# bone is renamed, but not in expressions that embed the name (cached driver type)
+# nor in this index. Renames are detected per armature: only the indexed bones of
+# the renamed armature are checked, each with a single name lookup, and the driver
+# of the first manager of a missing bone gives its new name. So the cost depends on
+# the number of targeted bones on that armature, not on other rigs in the file.
+#
+# Bone and edit bone renames are subscribed to once. The message bus doesn't say
+# which bone was renamed, so the notification checks the armatures being edited
+# in the context, and armature data updates reported by the depsgraph (e.g. from
+# renames in the outliner) are checked by bone_depsgraph_update_handler. Bones are
+# indexed by name as bone data is reallocated when leaving edit mode.
+
+_bones: Dict['Object', Dict[str, Dict[str, 'Key']]] = {}
+_bone_targets: Dict[str, Tuple['Object', str]] = {}
+_bone_owner = object()
+_bone_subscribed = False
+
+
+def bones_renamed(armatures: Iterable['Object']) -> int:
+    """Retargets the managers of indexed bones of the armatures that were renamed,
+    returning the number of bones renamed"""
+    from .manager import driver_bone_target
+
+    renamed = []
+    for armature in armatures:
+        bones = _bones.get(armature)
+        if not bones:
+            continue
+        data = armature.data
+        names = data.edit_bones if data.is_editmode else data.bones
+        for name, managers in bones.items():
+            if names.get(name) is not None:
+                continue
+            for identifier, key in managers.items():
+                manager = manager_find(key, identifier)
+                if manager is not None:
+                    bone = driver_bone_target(key_driver_find(key, manager.data_path))
+                    if bone and bone != name:
+                        renamed.append((armature, name, bone))
+                    break
+
+    for armature, name, bone in renamed:
+        bones = _bones[armature]
+        managers = bones.pop(name)
+        bones.setdefault(bone, {}).update(managers)
+        for identifier in managers:
+            _bone_targets[identifier] = (armature, bone)
+        bone_retarget(managers, bone)
+
+    return len(renamed)
+
+
+def bone_name_callback() -> None:
+    context = bpy.context
+    armatures = set(getattr(context, "objects_in_mode", None) or ())
+    object = getattr(context, "object", None)
+    if object is not None:
+        armatures.add(object)
+    bones_renamed(armatures)
+
+
+@bpy.app.handlers.persistent
+def bone_depsgraph_update_handler(_, depsgraph) -> None:
+    if _bones:
+        updated = set()
+        for update in depsgraph.updates:
+            id = update.id
+            if isinstance(id, bpy.types.Armature):
+                updated.add(id.original)
+        if updated:
+            armatures = []
+            for armature in _bones:
+                try:
+                    if armature.data in updated:
+                        armatures.append(armature)
+                except ReferenceError:
+                    pass # Removed since it was indexed
+            bones_renamed(armatures)
+
+
+def bone_retarget(managers: Dict[str, 'Key'], bone: str) -> int:
+    """Retargets the managers with the given identifiers to the bone, returning the
+    number of managers that were found"""
+    count = 0
+    for identifier, key in managers.items():
+        manager = manager_find(key, identifier)
+        if manager is not None:
+            manager.update_variables(bone_target=bone)
+            manager.update_expression()
+            count += 1
+    return count
+
+
+def bone_subscribe() -> None:
+    global _bone_subscribed
+    if not _bone_subscribed:
+        for type in (bpy.types.Bone, bpy.types.EditBone):
+            bpy.msgbus.subscribe_rna(key=(type, "name"),
+                                     owner=_bone_owner,
+                                     args=(),
+                                     notify=bone_name_callback)
+        _bone_subscribed = True
+
+
+def bone_index_add(key: 'Key', manager: 'ConeBasedShapeKeyDriverManager', bone: Optional[str]=None) -> None:
+    identifier = manager.identifier
+    bone_index_remove(identifier)
+
+    armature = manager.object
+    if armature is None:
+        return
+
+    if bone is None:
+        from .manager import driver_bone_target
+        bone = driver_bone_target(key_driver_find(key, manager.data_path))
+
+    if bone:
+        bone_subscribe()
+        _bones.setdefault(armature, {}).setdefault(bone, {})[identifier] = key
+        _bone_targets[identifier] = (armature, bone)
+
+
+def bone_index_remove(identifier: str) -> None:
+    target = _bone_targets.pop(identifier, None)
+    if target is not None:
+        armature, bone = target
+        bones = _bones.get(armature)
+        managers = bones.get(bone) if bones is not None else None
+        if managers is not None:
+            managers.pop(identifier, None)
+            if not managers:
+                del bones[bone]
+                if not bones:
+                    del _bones[armature]
+
+
+def bone_index_clear() -> None:
+    global _bone_subscribed
+    bpy.msgbus.clear_by_owner(_bone_owner)
+    _bone_subscribed = False
+    _bones.clear()
+    _bone_targets.clear()
+
+
+def bone_managers(armature: 'Object', bone: str) -> Dict[str, 'Key']:
+    """Returns the identifiers (and Keys) of the managers targeting the bone"""
+    return dict(_bones.get(armature, {}).get(bone, {}))
+
+
+# Per-Key lookups of driver f-curves by data path and managers by name, used by UI
+# drawing and operator polls in place of linear scans. Lookups hold indices rather
+# than RNA references, which may be freed, and every hit is checked against the
+# data it resolves to, so that reordering or replacing drivers or managers without
+# changing their count can't return the wrong item. A lookup is rebuilt when the
+# Key's driver or manager count changes, and once per find when a hit fails that
+# check or an item is missing (it may have been renamed without the count
+# changing). It is invalidated wherever drivers or managers are added or removed,
+# on depsgraph updates to the Key, renames, undo and file load.
+
+class KeyLookup(NamedTuple):
+    driver_count: int
+    manager_count: int
+    drivers: Dict[str, int]
+    managers: Dict[str, int]
+
+
+_lookups: Dict['Key', KeyLookup] = {}
+
+
+def key_lookup(key: 'Key', rebuild: bool=False) -> KeyLookup:
+    animdata = key.animation_data
+    driver_count = len(animdata.drivers) if animdata else 0
+    manager_count = len(key.cone_based_drivers) if key.is_property_set("cone_based_drivers") else 0
+
+    lookup = None if rebuild else _lookups.get(key)
+    if (lookup is None
+            or lookup.driver_count != driver_count
+            or lookup.manager_count != manager_count):
+        drivers = {fc.data_path: i for i, fc in enumerate(animdata.drivers)} if driver_count else {}
+        managers = {m.name: i for i, m in enumerate(key.cone_based_drivers)} if manager_count else {}
+        lookup = KeyLookup(driver_count, manager_count, drivers, managers)
+        _lookups[key] = lookup
+
+    return lookup
+
+
+def key_drivers(key: 'Key') -> Dict[str, 'FCurve']:
+    """Returns the Key's driver f-curves by data path (for bulk use, not cached)"""
+    animdata = key.animation_data
+    return {fc.data_path: fc for fc in animdata.drivers} if animdata else {}
+
+
+def _lookup_find(key: 'Key', find: Callable[[KeyLookup], Any]) -> Any:
+    """Returns find(lookup) for the Key's lookup, rebuilding it and trying again
+    once on a miss unless it was just built"""
+    cached = _lookups.get(key)
+    lookup = key_lookup(key)
+    result = find(lookup)
+    if result is None and lookup is cached:
+        result = find(key_lookup(key, rebuild=True))
+    return result
+
+
+def key_driver_find(key: 'Key', data_path: str) -> Optional['FCurve']:
+    def find(lookup: KeyLookup) -> Optional['FCurve']:
+        index = lookup.drivers.get(data_path)
+        if index is not None:
+            fcurve = key.animation_data.drivers[index]
+            if fcurve.data_path == data_path:
+                return fcurve
+        return None
+    return _lookup_find(key, find)
+
+
+def key_manager_find(key: 'Key', name: str) -> Optional['ConeBasedShapeKeyDriverManager']:
+    def find(lookup: KeyLookup) -> Optional['ConeBasedShapeKeyDriverManager']:
+        index = lookup.managers.get(name)
+        if index is not None:
+            manager = key.cone_based_drivers[index]
+            if manager.name == name:
+                return manager
+        return None
+    return _lookup_find(key, find)
+
+
+def lookup_invalidate(key: Optional['Key']=None) -> None:
+    if key is None:
+        _lookups.clear()
+    else:
+        _lookups.pop(key, None)
+
+
+@bpy.app.handlers.persistent
+def lookup_depsgraph_update_handler(_, depsgraph) -> None:
+    if _lookups:
+        for update in depsgraph.updates:
+            id = update.id
+            if isinstance(id, bpy.types.Key):
+                _lookups.pop(id.original, None)
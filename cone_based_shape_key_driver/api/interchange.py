@@ -0,0 +1,116 @@
+
+# Serialization of cone-based driver setups for moving them between files and meshes.
+#
+# Activation curves are stored as the raw ID property data of the activation
+# settings so that they round-trip without depending on the curve mapping layout.
+# Identifiers are not exported: imported managers are matched by shape key name
+# and keep (or are given) identifiers unique to the file they are imported into.
+
+from typing import Any, Dict, List, NamedTuple, TYPE_CHECKING
+from ..lib.utils import idprop_to_python
+from .index import index_add, key_drivers
+from .manager import driver_bone_target, manager_update_suspend
+if TYPE_CHECKING:
+    from bpy.types import Key
+
+FORMAT_VERSION = 1
+
+
+class ImportReport(NamedTuple):
+    created: int
+    updated: int
+    missing_shapes: List[str]
+    missing_objects: List[str]
+    missing_bones: List[str]
+
+
+def managers_export(key: 'Key') -> Dict[str, Any]:
+    drivers = key_drivers(key)
+    entries = []
+    if key.is_property_set("cone_based_drivers"):
+        for manager in key.cone_based_drivers:
+            object = manager.object
+            activation = manager.get("activation")
+            entries.append({
+                "name": manager.name,
+                "object": object.name if object is not None else "",
+                "bone": driver_bone_target(drivers.get(manager.data_path)),
+                "driver_type": manager.driver_type,
+                "mute": manager.mute,
+                "group_normalize": manager.group_normalize,
+                "center": list(manager.center_quaternion),
+                "radius": manager.activation.radius,
+                "target": manager.activation.target,
+                "activation": idprop_to_python(activation) if activation is not None else {},
+                })
+    return {"version": FORMAT_VERSION, "drivers": entries}
+
+
+def managers_import(key: 'Key', data: Dict[str, Any], rename: Dict[str, str]=None) -> ImportReport:
+    """Creates or updates managers on the key from exported data with a single
+    deferred driver rebuild. Entries are matched to shape keys by name, optionally
+    through the rename mapping."""
+    import bpy
+
+    if data.get("version", 0) > FORMAT_VERSION:
+        raise ValueError(f'Unsupported cone-based driver data version {data.get("version")}')
+
+    rename = rename or {}
+    collection = key.cone_based_drivers
+    # Looked up once rather than searched by name for every entry. Managers are
+    # held by index as adding to the collection invalidates references to its items.
+    shapes = {shape.name: shape for shape in key.key_blocks}
+    managers = {manager.name: index for index, manager in enumerate(collection)}
+    created = updated = 0
+    missing_shapes = []
+    missing_objects = []
+    missing_bones = []
+    pending = []
+
+    with manager_update_suspend():
+        for entry in data.get("drivers", ()):
+            name = rename.get(entry["name"], entry["name"])
+            shape = shapes.get(name)
+            if shape is None or shape == key.reference_key:
+                missing_shapes.append(name)
+                continue
+
+            index = managers.get(name)
+            if index is None:
+                manager = collection.add()
+                manager.__init__(shape)
+                index = managers[name] = len(collection) - 1
+                created += 1
+            else:
+                manager = collection[index]
+                updated += 1
+
+            object = None
+            if entry.get("object"):
+                object = bpy.data.objects.get(entry["object"])
+                if object is None or object.type != 'ARMATURE':
+                    missing_objects.append(entry["object"])
+                    object = None
+
+            bone = entry.get("bone", "")
+            if object is not None and bone and bone not in object.data.bones:
+                missing_bones.append(f'{object.name}:{bone}')
+
+            if entry.get("activation"):
+                manager["activation"] = entry["activation"]
+
+            manager.object = object
+            manager.driver_type = entry.get("driver_type", 'SCRIPTED')
+            manager.mute = entry.get("mute", False)
+            manager.group_normalize = entry.get("group_normalize", False)
+            manager.center_quaternion = entry.get("center", (1.0, 0.0, 0.0, 0.0))
+            manager.activation.radius = entry.get("radius", manager.activation.radius)
+            manager.activation.target = entry.get("target", manager.activation.target)
+            pending.append((index, bone))
+
+    for index, bone in pending:
+        manager = collection[index]
+        manager.update(bone)
+        index_add(key, manager)
+
+    return ImportReport(created, updated, missing_shapes, missing_objects, missing_bones)
@@ -0,0 +1,285 @@
+
+# Viewport level of detail for cone drivers.
+#
+# While the animation is playing, the drivers of Keys whose objects are all hidden,
+# further from the viewpoint than a distance, or smaller on screen than a size
+# are suspended by muting their f-curves, and resumed as the objects come back
+# into view. Suspension is runtime state: which Keys are suspended is only kept
+# in this module (see key_suspended, which the managers combine with the user's
+# mute), and the f-curves are unmuted around saves so that files never store the
+# view-dependent state. Everything is resumed when playback stops, before
+# rendering and on file load. The viewpoint is the largest 3D viewport of the
+# screen that is playing, or the scene camera's when it looks through the camera
+# or no viewport is found (e.g. in background mode). Orthographic views only use
+# the screen size test, as the distance to the view is meaningless.
+
+from typing import Dict, List, NamedTuple, Optional, Tuple, TYPE_CHECKING
+from math import tan
+import bpy
+from bpy.types import PropertyGroup
+from bpy.props import BoolProperty, FloatProperty
+from mathutils import Vector
+from .index import cone_keys, key_driver_find
+if TYPE_CHECKING:
+    from bpy.types import Key, Object, Scene, SpaceView3D, ViewLayer
+
+# Sensor width used by the 3D viewport's perspective projection (in mm)
+VIEWPORT_SENSOR = 72.0
+
+_playing = False
+_rendering = False
+
+# Whether each Key's drivers were last suspended and its manager count at the time,
+# cleared on load and undo and for a Key when managers are added to it. The only
+# record of suspension, nothing is stored on the managers.
+_suspended: Dict['Key', Tuple[bool, int]] = {}
+
+
+class View(NamedTuple):
+    location: Vector
+    fov: float   # Tangent of half the horizontal field of view (perspective)
+    ortho: float # Half the width of the view for orthographic views, otherwise 0.0
+
+
+class ConeBasedShapeKeyDriverLOD(PropertyGroup):
+
+    enabled: BoolProperty(
+        name="Viewport LOD",
+        description=("Suspend cone-based drivers on hidden, distant or small objects during "
+                     "playback. Drivers are always evaluated for rendering"),
+        default=False,
+        options=set()
+        )
+
+    use_visibility: BoolProperty(
+        name="Hidden",
+        description="Suspend drivers on objects that are hidden or excluded from the view layer",
+        default=True,
+        options=set()
+        )
+
+    use_distance: BoolProperty(
+        name="Distance",
+        description="Suspend drivers on objects further from the viewpoint than the distance",
+        default=False,
+        options=set()
+        )
+
+    distance: FloatProperty(
+        name="Distance",
+        description="Distance from the viewpoint beyond which drivers are suspended",
+        min=0.0,
+        default=50.0,
+        subtype='DISTANCE',
+        options=set()
+        )
+
+    use_screen_size: BoolProperty(
+        name="Screen Size",
+        description="Suspend drivers on objects smaller on screen than the size",
+        default=True,
+        options=set()
+        )
+
+    screen_size: FloatProperty(
+        name="Screen Size",
+        description="Fraction of the view's width below which drivers are suspended",
+        min=0.0,
+        max=1.0,
+        default=0.02,
+        subtype='FACTOR',
+        options=set()
+        )
+
+
+def viewport_space() -> Optional['SpaceView3D']:
+    """Returns the largest 3D viewport of the screen playing the animation, falling
+    back to the largest 3D viewport of any window"""
+    wm = bpy.context.window_manager
+    if wm is None:
+        return None
+
+    screens = [window.screen for window in wm.windows]
+    playing = [screen for screen in screens if screen.is_animation_playing]
+    for candidates in (playing, screens):
+        areas = [area for screen in candidates for area in screen.areas if area.type == 'VIEW_3D']
+        if areas:
+            return max(areas, key=lambda area: area.width * area.height).spaces.active
+    return None
+
+
+def viewpoint(scene: 'Scene') -> Optional[View]:
+    """Returns the view of the playing 3D viewport, or of the scene camera when there
+    is none or the viewport looks through it"""
+    space = viewport_space()
+    camera = scene.camera
+    if space is not None and (camera is None or space.region_3d.view_perspective != 'CAMERA'):
+        region = space.region_3d
+        fov = VIEWPORT_SENSOR / (2.0 * space.lens)
+        ortho = region.view_distance * fov if region.view_perspective == 'ORTHO' else 0.0
+        return View(region.view_matrix.inverted().translation, fov, ortho)
+    if camera is not None:
+        data = camera.data
+        ortho = data.ortho_scale / 2.0 if data.type == 'ORTHO' else 0.0
+        return View(camera.matrix_world.translation, tan(data.angle / 2.0), ortho)
+    return None
+
+
+def object_visible(object: 'Object',
+                   view_layer: 'ViewLayer',
+                   settings: ConeBasedShapeKeyDriverLOD,
+                   view: Optional[View]) -> bool:
+    if settings.use_visibility and not object.visible_get(view_layer=view_layer):
+        return False
+
+    if view is not None and (settings.use_distance or settings.use_screen_size):
+        radius = max(object.dimensions) / 2.0
+        if view.ortho > 0.0:
+            # The size on screen doesn't depend on the distance
+            if settings.use_screen_size and radius / view.ortho < settings.screen_size:
+                return False
+        else:
+            distance = (object.matrix_world.translation - view.location).length
+            if settings.use_distance and distance > settings.distance:
+                return False
+            if settings.use_screen_size and distance > 0.0:
+                if radius / (distance * view.fov) < settings.screen_size:
+                    return False
+
+    return True
+
+
+def key_objects(scene: 'Scene', keys: List['Key']) -> Dict['Key', List['Object']]:
+    objects = {key: [] for key in keys}
+    for object in scene.objects:
+        key = getattr(object.data, "shape_keys", None)
+        if key in objects:
+            objects[key].append(object)
+    return objects
+
+
+def key_suspended(key: 'Key') -> bool:
+    """Returns whether the Key's drivers are currently suspended by the LOD"""
+    state = _suspended.get(key)
+    return state is not None and state[0]
+
+
+def key_mute(key: 'Key', suspended: bool) -> int:
+    """Mutes the drivers of the Key's managers that are suspended or muted by the
+    user, returning the number of f-curves that changed"""
+    count = 0
+    for manager in key.cone_based_drivers:
+        fcurve = key_driver_find(key, manager.data_path)
+        value = manager.mute or suspended
+        if fcurve is not None and fcurve.mute != value:
+            fcurve.mute = value
+            count += 1
+    return count
+
+
+def keys_suspend(keys: Dict['Key', bool]) -> int:
+    """Sets whether the drivers of each Key are suspended, returning the number of
+    drivers that changed. Keys whose state and manager count are unchanged since
+    the last call are skipped without touching their drivers."""
+    count = 0
+    for key, value in keys.items():
+        state = (value, len(key.cone_based_drivers))
+        if _suspended.get(key) == state:
+            continue
+        _suspended[key] = state
+        count += key_mute(key, value)
+    return count
+
+
+def lod_update(scene: 'Scene') -> int:
+    settings = scene.cone_based_lod
+    keys = cone_keys()
+    if not settings.enabled:
+        return keys_suspend({key: False for key in keys})
+
+    view_layer = bpy.context.view_layer
+    view = viewpoint(scene)
+    state = {}
+    for key, objects in key_objects(scene, keys).items():
+        # Keys without objects in the scene are left alone
+        state[key] = bool(objects) and not any(object_visible(object, view_layer, settings, view)
+                                               for object in objects)
+    return keys_suspend(state)
+
+
+def lod_resume() -> int:
+    return keys_suspend({key: False for key in cone_keys()})
+
+
+def lod_invalidate(key: 'Key') -> None:
+    """Forgets the Key's state so that its managers are all checked on the next
+    update (e.g. when a manager is added)"""
+    _suspended.pop(key, None)
+
+
+def lod_clear() -> None:
+    _suspended.clear()
+
+
+@bpy.app.handlers.persistent
+def lod_playback_pre_handler(scene: 'Scene', *_) -> None:
+    global _playing
+    _playing = True
+    if scene.cone_based_lod.enabled and not _rendering:
+        lod_update(scene)
+
+
+@bpy.app.handlers.persistent
+def lod_playback_post_handler(*_) -> None:
+    global _playing
+    if _playing:
+        _playing = False
+        lod_resume()
+
+
+@bpy.app.handlers.persistent
+def lod_frame_change_handler(scene: 'Scene', *_) -> None:
+    if _playing and not _rendering and scene.cone_based_lod.enabled:
+        lod_update(scene)
+
+
+@bpy.app.handlers.persistent
+def lod_render_pre_handler(*_) -> None:
+    global _rendering
+    _rendering = True
+    lod_resume()
+
+
+@bpy.app.handlers.persistent
+def lod_render_post_handler(*_) -> None:
+    global _rendering
+    _rendering = False
+
+
+@bpy.app.handlers.persistent
+def lod_save_pre_handler(*_) -> None:
+    # Saves the drivers as the user left them
+    for key, (suspended, _) in _suspended.items():
+        if suspended:
+            key_mute(key, False)
+
+
+@bpy.app.handlers.persistent
+def lod_save_post_handler(*_) -> None:
+    for key, (suspended, _) in _suspended.items():
+        if suspended:
+            key_mute(key, True)
+
+
+def lod_handlers() -> List[Tuple[list, object]]:
+    handlers = bpy.app.handlers
+    return [
+        (handlers.animation_playback_pre, lod_playback_pre_handler),
+        (handlers.animation_playback_post, lod_playback_post_handler),
+        (handlers.frame_change_pre, lod_frame_change_handler),
+        (handlers.render_pre, lod_render_pre_handler),
+        (handlers.render_post, lod_render_post_handler),
+        (handlers.render_cancel, lod_render_post_handler),
+        (handlers.save_pre, lod_save_pre_handler),
+        (handlers.save_post, lod_save_post_handler),
+        ]
@@ -1,5 +1,6 @@
 
-from typing import Optional, Tuple, TYPE_CHECKING
+from typing import Iterator, List, Optional, Tuple, TYPE_CHECKING
+from contextlib import contextmanager
 from uuid import uuid4
 from bpy.types import Object, PropertyGroup
 from bpy.props import (BoolProperty,
@@ -9,26 +10,183 @@ from bpy.props import (BoolProperty,
                        PointerProperty,
                        StringProperty)
 from mathutils import Euler, Quaternion
-from ..lib.driver_utils import driver_find, driver_ensure, driver_variables_empty
+from ..lib.driver_utils import driver_ensure, driver_variables_empty
 from ..lib.curve_mapping import to_bezier, keyframe_points_assign
-from ..lib.utils import direction_of
+from ..lib.expression import cone_dot_expression, cone_expression, is_simple_expression
+from ..lib.cache import LRUCache
+from ..lib.utils import direction_of, idprop_to_python
 from .activation import ConeBasedShapeKeyDriverActivation
+from .compact import COMPACT_PROPERTY, compact_bezier
+from .index import bone_index_add, key_driver_find, lookup_invalidate
+from .helper import helper_ensure, helper_remove, keyframe_points_to_angle
+from .shared import (shared_direction_bone,
+                     shared_direction_ensure,
+                     shared_direction_release,
+                     shared_direction_target)
+from .cached import cached_expression
+from .group import group_expression, group_invalidate
+from .lod import key_suspended
 if TYPE_CHECKING:
-    from bpy.types import Context, ShapeKey
+    from bpy.types import Context, FCurve, ShapeKey
     from mathutils import Vector
 
 
-def manager_bone_target(settings: 'ConeBasedShapeKeyDriverManager') -> str:
-    fcurve = driver_find(settings.id_data, settings.data_path)
+_update_suspended = 0
+
+# Identifier -> (activation curve, ranges and driver type, state of the f-curve)
+# last assigned to the manager's driver. The f-curve state (see keyframes_state)
+# detects drivers that were replaced or edited by hand. Cleared on load and undo.
+keyframe_cache: LRUCache[Tuple[tuple, tuple]] = LRUCache(maxsize=4096)
+
+# Activation curve, x range and y range (see manager_curve) -> converted bezier points
+bezier_cache: LRUCache = LRUCache(maxsize=256)
+
+
+@contextmanager
+def manager_update_suspend() -> Iterator[None]:
+    """Suspends driver rebuilds while populating or editing managers in bulk.
+    Callers are responsible for calling update() on each manager afterwards."""
+    global _update_suspended
+    _update_suspended += 1
+    try:
+        yield
+    finally:
+        _update_suspended -= 1
+
+
+def property_assign(data, name: str, value) -> bool:
+    """Sets the property only if its value differs, avoiding redundant RNA updates"""
+    if getattr(data, name) != value:
+        setattr(data, name, value)
+        return True
+    return False
+
+
+def driver_bone_target(fcurve: Optional['FCurve']) -> str:
     if fcurve is not None:
         variables = fcurve.driver.variables
         if len(variables) > 1:
-            return variables[1].targets[0].bone_target
+            target = variables[1].targets[0]
+            if variables[1].type == 'SINGLE_PROP':
+                return shared_direction_bone(target.data_path)
+            return target.bone_target
+        if len(variables) == 1 and variables[0].type == 'ROTATION_DIFF':
+            return variables[0].targets[0].bone_target
     return ""
 
 
+def manager_curve(manager: 'ConeBasedShapeKeyDriverManager') -> tuple:
+    """Returns the manager's activation curve data and ranges, as a hashable key"""
+    activation: ConeBasedShapeKeyDriverActivation = manager.activation
+    rangex = (1.0-activation.radius, 1.0)
+    rangey = (0.0, activation.target)
+    return (repr(idprop_to_python(manager.get("activation"))), rangex, rangey)
+
+
+def manager_bezier(manager: 'ConeBasedShapeKeyDriverManager', curve: Optional[tuple]=None) -> list:
+    """Returns the manager's activation curve converted to bezier keyframes"""
+    activation: ConeBasedShapeKeyDriverActivation = manager.activation
+
+    # Managers commonly share curves, so the conversion is cached by the curve itself
+    if curve is None:
+        curve = manager_curve(manager)
+    _, rangex, rangey = curve
+
+    points = bezier_cache.get(curve)
+    if points is None:
+        if COMPACT_PROPERTY in activation:
+            points = compact_bezier(activation, rangex, rangey)
+        else:
+            points = to_bezier(activation.points, x_range=rangex, y_range=rangey, extrapolate=False)
+        bezier_cache.set(curve, points)
+    return points
+
+
+def keyframes_state(fcurve: 'FCurve') -> tuple:
+    """Returns the f-curve's address and keyframe coordinates, which change when the
+    driver is recreated or its keyframes are edited"""
+    keyframes = fcurve.keyframe_points
+    co = [0.0] * (len(keyframes) * 2)
+    keyframes.foreach_get("co", co)
+    return (fcurve.as_pointer(), tuple(co))
+
+
+def manager_bone_target(settings: 'ConeBasedShapeKeyDriverManager') -> str:
+    return driver_bone_target(key_driver_find(settings.id_data, settings.data_path))
+
+
+def manager_bone_target_set(manager: 'ConeBasedShapeKeyDriverManager', value: str) -> None:
+    manager.update_variables(bone_target=value)
+    bone_index_add(manager.id_data, manager, value)
+
+
+def manager_center_update(manager: 'ConeBasedShapeKeyDriverManager', _: 'Context') -> None:
+    manager.update_expression()
+
+
+def manager_variable_layout(manager: 'ConeBasedShapeKeyDriverManager') -> List[Tuple[str, str]]:
+    """Returns the (type, name) of each of the manager's driver variables"""
+    identifier = manager.identifier
+    if manager.driver_type == 'ROTATION_DIFF':
+        return [('ROTATION_DIFF', identifier)]
+    if manager.driver_type == 'SHARED':
+        return [('SINGLE_PROP', identifier)] + [('SINGLE_PROP', axis) for axis in 'xyz']
+    # Cached and grouped drivers read the same channels and pass them to a function
+    return [('SINGLE_PROP', identifier)] + [('TRANSFORMS', axis) for axis in 'wxyz']
+
+
+def manager_expression(manager: 'ConeBasedShapeKeyDriverManager', bone: Optional[str]=None) -> str:
+    """Returns the driver expression for the manager (empty for rotational difference
+    drivers, which have none). Does not modify any data."""
+    driver_type = manager.driver_type
+    if driver_type == 'ROTATION_DIFF':
+        return ""
+    if driver_type == 'GROUP':
+        return group_expression(manager)
+    if driver_type == 'CACHED' and bone is None:
+        bone = manager.bone_target
+    direction = direction_of(manager.center_quaternion)
+    if driver_type == 'CACHED':
+        return cached_expression(manager, bone, direction)
+    if driver_type == 'SHARED':
+        return cone_dot_expression(direction)
+    return cone_expression(direction)
+
+
+def manager_driver_ensure(manager: 'ConeBasedShapeKeyDriverManager') -> 'FCurve':
+    key = manager.id_data
+    fcurve = key_driver_find(key, manager.data_path)
+    if fcurve is None:
+        fcurve = driver_ensure(key, manager.data_path)
+        lookup_invalidate(key)
+    return fcurve
+
+
+def manager_mute_update(manager: 'ConeBasedShapeKeyDriverManager', _: 'Context') -> None:
+    fcurve = key_driver_find(manager.id_data, manager.data_path)
+    if fcurve is not None:
+        property_assign(fcurve, "mute", manager.mute or key_suspended(manager.id_data))
+
+
+def manager_object_update(manager: 'ConeBasedShapeKeyDriverManager', _: 'Context') -> None:
+    manager.update_variables()
+    bone_index_add(manager.id_data, manager)
+
+
+def manager_driver_is_simple(settings: 'ConeBasedShapeKeyDriverManager') -> bool:
+    fcurve = key_driver_find(settings.id_data, settings.data_path)
+    if fcurve is None:
+        return False
+    driver = fcurve.driver
+    return driver.type != 'SCRIPTED' or driver.is_simple_expression
+
+
+def manager_group_normalize_update(manager: 'ConeBasedShapeKeyDriverManager', _: 'Context') -> None:
+    group_invalidate(manager.id_data)
+
+
 def manager_identifier(settings: 'ConeBasedShapeKeyDriverManager') -> str:
-    return settings.get("identifier", ""),
+    return settings.get("identifier", "")
 
 
 def manager_object_validate(_: 'ConeBasedShapeKeyDriverManager', object: Object) -> bool:
@@ -64,62 +222,173 @@ def manager_center_euler_set(manager: 'ConeBasedShapeKeyDriverManager',
 class ConeBasedShapeKeyDriverManager(PropertyGroup):
     """Manages and stores settings for a cone based corrective shape key"""
 
-    def update(self, context: Optional[Context]=None) -> None:
+    def update(self, context: Optional['Context']=None) -> None:
+        """Rebuilds the driver, only writing the parts that differ from the current state"""
+
+        if _update_suspended:
+            return
 
         if isinstance(context, str):
             bone_target = context
         else:
-            bone_target = self.get_bone_target()
+            bone_target = self.bone_target
+
+        fcurve = manager_driver_ensure(self)
+        property_assign(fcurve, "mute", self.mute or key_suspended(self.id_data))
+        self.update_keyframes(fcurve)
+        self.update_variables(fcurve, bone_target)
+        self.update_expression(fcurve)
+
+    def update_keyframes(self,
+                         fcurve: Optional['FCurve']=None,
+                         curve: Optional[tuple]=None,
+                         bezier: Optional[list]=None) -> None:
+        """Reassigns the activation curve keyframes (radius, target or curve changes).
+        The curve (see manager_curve) and its bezier keyframes may be passed in"""
+
+        if _update_suspended:
+            return
+
+        if fcurve is None:
+            fcurve = manager_driver_ensure(self)
+
+        if curve is None:
+            curve = manager_curve(self)
+        signature = (curve, self.driver_type)
+
+        keyframes = fcurve.keyframe_points
+        cached = keyframe_cache.get(self.identifier)
+        if cached is not None and cached[0] == signature and cached[1] == keyframes_state(fcurve):
+            return
+
+        if self.driver_type == 'GROUP':
+            # The group function applies the activation curve itself, so the f-curve
+            # is left without keyframes and passes the driver's value through
+            while len(keyframes):
+                keyframes.remove(keyframes[-1], fast=True)
+            group_invalidate(self.id_data)
+        else:
+            if bezier is None:
+                bezier = manager_bezier(self, curve)
+            keyframe_points_assign(keyframes, bezier)
+            if self.driver_type == 'ROTATION_DIFF':
+                keyframe_points_to_angle(keyframes)
+
+        keyframe_cache.set(self.identifier, (signature, keyframes_state(fcurve)))
 
-        activation: ConeBasedShapeKeyDriverActivation = self.activation
+    def update_variables(self, fcurve: Optional['FCurve']=None, bone_target: Optional[str]=None) -> None:
+        """Updates the driver's variables (object or bone changes). Variables are only
+        recreated when their layout differs, and targets are only written when changed,
+        so that depsgraph relations are rebuilt only when the targets actually change."""
 
-        points = activation.points
-        rangex = (1.0-activation.radius, 1.0)
-        rangey = (0.0, activation.value)
+        if _update_suspended:
+            return
 
-        fcurve = driver_ensure(self.id_data, self.data_path)
-        points = to_bezier(points, x_range=rangex, y_range=rangey, extrapolate=False)
+        if fcurve is None:
+            fcurve = manager_driver_ensure(self)
 
-        keyframe_points_assign(fcurve.keyframe_points, points)
+        if bone_target is None:
+            bone_target = self.bone_target
+
+        # Membership of this and other groups may change with the object, bone or type
+        group_invalidate(self.id_data)
+
+        # The shared direction read so far, released below if no cone reads it anymore
+        shared = shared_direction_target(fcurve)
 
         driver = fcurve.driver
-        variables = driver_variables_empty(driver)
-
-        variable = variables.new()
-        variable.type = 'SINGLE_PROP'
-        variable.name = self.identifier
-
-        target = variable.targets[0]
-        target.id_type = 'KEY'
-        target.id = self.id_data
-        target.data_path = "reference_key.value"
-
-        for axis in 'WXYZ':
-
-            variable = variables.new()
-            variable.type = 'TRANSFORMS'
-            variable.name = axis.lower()
-
-            target = variable.targets[0]
-            target.id = self.object
-            target.bone_target = bone_target
-            target.transform_type = f'ROT_{axis}'
-            target.transform_space = 'LOCAL_SPACE'
-            target.rotation_mode = 'QUATERNION'
-
-        x, y, z = direction_of(self.center_quaternion)
-        driver.type = 'SCRIPTED'
-        # The function runs through the following steps:
-        # - Convert the target bone's (local space) rotation quaternion to a direction vector
-        # - Calculate the dot product between the pose's direction vector and the target bone's rotation vector
-        # - Range the result and apply a inverse sine function to negate the effect of the dot product calculation so that the fcurve operates in the 0-1 range
-        driver.expression = f'(asin(2.0*(x*y-w*z)*{x}+(1.0-2.0*(x*x+z*z))*{y}+2.0*(y*z+w*x)*{z})--(pi/2.0))/pi'
+        variables = driver.variables
+
+        layout = manager_variable_layout(self)
+        if [(v.type, v.name) for v in variables] != layout:
+            variables = driver_variables_empty(driver)
+            for type, name in layout:
+                variable = variables.new()
+                variable.type = type
+                variable.name = name
+
+        if self.driver_type == 'ROTATION_DIFF':
+            property_assign(driver, "type", 'AVERAGE')
+
+            targets = variables[0].targets
+            property_assign(targets[0], "id", self.object)
+            property_assign(targets[0], "bone_target", bone_target)
+            property_assign(targets[1], "id", helper_ensure(self, bone_target))
+        else:
+            helper_remove(self)
+            property_assign(driver, "type", 'SCRIPTED')
+            property_assign(driver, "use_self", False)
+
+            target = variables[0].targets[0]
+            property_assign(target, "id_type", 'KEY')
+            property_assign(target, "id", self.id_data)
+            property_assign(target, "data_path", "reference_key.value")
+
+            if self.driver_type == 'SHARED':
+                path = shared_direction_ensure(self.object, bone_target)
+                for index, variable in enumerate(variables[1:]):
+                    target = variable.targets[0]
+                    property_assign(target, "id_type", 'OBJECT')
+                    property_assign(target, "id", self.object)
+                    property_assign(target, "data_path", f'{path}[{index}]' if path else "")
+            else:
+                for variable in variables[1:]:
+                    target = variable.targets[0]
+                    property_assign(target, "id", self.object)
+                    property_assign(target, "bone_target", bone_target)
+                    property_assign(target, "transform_type", f'ROT_{variable.name.upper()}')
+                    property_assign(target, "transform_space", 'LOCAL_SPACE')
+                    property_assign(target, "rotation_mode", 'QUATERNION')
+
+                if self.driver_type == 'CACHED':
+                    # The armature and bone names are part of the expression
+                    expression = manager_expression(self, bone_target)
+                    property_assign(driver, "expression", expression)
+
+        if shared is not None and shared != shared_direction_target(fcurve):
+            shared_direction_release([shared])
+
+    def update_expression(self, fcurve: Optional['FCurve']=None, expression: Optional[str]=None) -> None:
+        """Updates the baked center direction (center rotation changes). A precomputed
+        expression (see manager_expression) may be passed in"""
+
+        if _update_suspended:
+            return
+
+        if fcurve is None:
+            fcurve = manager_driver_ensure(self)
+
+        if self.driver_type == 'ROTATION_DIFF':
+            helper_ensure(self, self.bone_target)
+            return
+
+        if expression is None:
+            expression = manager_expression(self)
+
+        # Cached and grouped drivers call registered functions and require Python
+        if (self.driver_type in {'SCRIPTED', 'SHARED'}
+                and fcurve.driver.expression != expression
+                and not is_simple_expression(expression, (name for _, name in manager_variable_layout(self)))):
+            raise ValueError(f'Cone driver expression "{expression}" is not a simple expression')
+
+        property_assign(fcurve.driver, "expression", expression)
+
+        if self.driver_type == 'GROUP':
+            group_invalidate(self.id_data)
 
     bone_target: StringProperty(
         name="Bone",
         description="The bone to read rotations from",
         get=manager_bone_target,
-        set=update,
+        set=manager_bone_target_set,
+        options=set()
+        )
+
+    is_simple_expression: BoolProperty(
+        name="Simple Expression",
+        description=("Whether the driver is evaluated by Blender's native simple expression "
+                     "evaluator rather than the Python interpreter"),
+        get=manager_driver_is_simple,
         options=set()
         )
 
@@ -141,13 +410,47 @@ class ConeBasedShapeKeyDriverManager(PropertyGroup):
         options={'HIDDEN'}
         )
 
+    driver_type: EnumProperty(
+        name="Driver",
+        description="How the cone's angle is computed by the driver",
+        items=[
+            ('SCRIPTED', "Expression",
+             "Read the bone's rotation channels and compute the angle with a simple expression"),
+            ('SHARED', "Shared Direction",
+             ("Read the bone's direction vector, computed once per evaluation and shared by "
+              "every cone on the bone, and compute the angle with a dot product")),
+            ('ROTATION_DIFF', "Rotational Difference",
+             ("Read the rotational difference to a hidden helper object placed at the cone's "
+              "center with a single built-in variable. Faster, but includes twist around the "
+              "bone's Y axis in the angle")),
+            ('CACHED', "Cached",
+             ("Compute the angle with a registered Python function that memoizes results per "
+              "bone rotation. Requires Python evaluation")),
+            ('GROUP', "Group",
+             ("Evaluate every grouped cone on the bone together with a registered Python "
+              "function, optionally normalizing their weights. Requires Python evaluation")),
+            ],
+        default='SCRIPTED',
+        update=update,
+        options=set()
+        )
+
+    group_normalize: BoolProperty(
+        name="Normalize",
+        description=("Scale the weights of the grouped cones on the bone so that they sum to "
+                     "at most one. Applies to the whole group when set on any of its cones"),
+        default=False,
+        options=set(),
+        update=manager_group_normalize_update
+        )
+
     mute: BoolProperty(
         name="Mute",
         description=("Whether or not the driven shape key's driver is enabled. Disabling "
                      "the driver allows (temporary) editing of the shape key's value in the UI"),
         default=False,
         options=set(),
-        update=update
+        update=manager_mute_update
         )
 
     object: PointerProperty(
@@ -155,7 +458,7 @@ class ConeBasedShapeKeyDriverManager(PropertyGroup):
         description="The armature object",
         type=Object,
         poll=manager_object_validate,
-        update=update,
+        update=manager_object_update,
         options=set()
         )
 
@@ -187,7 +490,7 @@ class ConeBasedShapeKeyDriverManager(PropertyGroup):
         default=(1.0, 0.0, 0.0, 0.0),
         precision=3,
         subtype='QUATERNION',
-        update=update,
+        update=manager_center_update,
         options=set()
         )
 
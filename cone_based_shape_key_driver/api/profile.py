@@ -0,0 +1,161 @@
+
+# Driver cost profiling.
+#
+# Cone driver cost is measured by playing a frame range with the drivers enabled
+# and again with some of them muted: the difference is the time attributable to
+# the muted drivers. The baseline mutes every profiled driver, and each Key and
+# each targeted bone is measured the same way by muting only its drivers. The
+# armature drivers computing a shared direction (see shared.py) are muted along
+# with the cones once every cone reading them is muted, so their cost is counted.
+# Blender doesn't expose per-driver timings and playing the range once per driver
+# would be too slow, so drivers are listed (with whether they require Python) but
+# not timed individually.
+
+from typing import Dict, Iterator, List, NamedTuple, Optional, Sequence, Set, Tuple, TYPE_CHECKING
+from contextlib import contextmanager
+import csv
+import time
+from .index import cone_keys, key_drivers
+from .manager import driver_bone_target
+from .shared import shared_direction_drivers, shared_direction_target
+if TYPE_CHECKING:
+    from bpy.types import FCurve, Key, Object, Scene
+
+
+class ProfileEntry(NamedTuple):
+    key: str
+    manager: str
+    object: str
+    bone: str
+    driver_type: str
+    simple: bool
+
+
+class ProfileReport(NamedTuple):
+    frames: int
+    total: float
+    baseline: float
+    keys: Dict[str, float]
+    bones: Dict[Tuple[str, str], float] # (armature, bone)
+    entries: List[ProfileEntry]
+
+    @property
+    def flagged(self) -> List[ProfileEntry]:
+        return [entry for entry in self.entries if not entry.simple]
+
+
+profile_report: Optional[ProfileReport] = None
+
+
+def playback_time(scene: 'Scene', frames: Sequence[int]) -> float:
+    current = scene.frame_current
+    start = time.perf_counter()
+    for frame in frames:
+        scene.frame_set(frame)
+    elapsed = time.perf_counter() - start
+    scene.frame_set(current)
+    return elapsed
+
+
+@contextmanager
+def drivers_muted(fcurves: Sequence['FCurve']) -> Iterator[None]:
+    state = [fcurve.mute for fcurve in fcurves]
+    for fcurve in fcurves:
+        fcurve.mute = True
+    try:
+        yield
+    finally:
+        for fcurve, mute in zip(fcurves, state):
+            fcurve.mute = mute
+
+
+def shared_readers() -> Dict[Tuple['Object', str], Tuple[List['FCurve'], Set['FCurve']]]:
+    """Returns the drivers of each shared direction in the file and the (unmuted)
+    cone drivers reading it"""
+    readers = {}
+    for key in cone_keys():
+        fcurves = key_drivers(key)
+        for manager in key.cone_based_drivers:
+            if manager.driver_type == 'SHARED':
+                fcurve = fcurves.get(manager.data_path)
+                target = shared_direction_target(fcurve)
+                if target is not None and not fcurve.mute:
+                    readers.setdefault(target, set()).add(fcurve)
+    return {target: (shared_direction_drivers(*target), fcurves) for target, fcurves in readers.items()}
+
+
+def drivers_with_shared(fcurves: Sequence['FCurve'],
+                        shared: Dict[Tuple['Object', str], Tuple[List['FCurve'], Set['FCurve']]]) -> List['FCurve']:
+    """Returns the cone drivers and the shared direction drivers read only by them"""
+    result = list(fcurves)
+    muted = set(fcurves)
+    for drivers, readers in shared.values():
+        if readers <= muted:
+            result.extend(drivers)
+    return result
+
+
+def profile_run(scene: 'Scene', keys: Sequence['Key'], frames: Sequence[int]) -> ProfileReport:
+    global profile_report
+
+    drivers: Dict['Key', List[tuple]] = {}
+    for key in keys:
+        if key.is_property_set("cone_based_drivers"):
+            fcurves = key_drivers(key)
+            drivers[key] = [(m, fcurves[m.data_path]) for m in key.cone_based_drivers
+                            if m.data_path in fcurves and not fcurves[m.data_path].mute]
+
+    shared = shared_readers()
+    every = [fcurve for items in drivers.values() for _, fcurve in items]
+
+    playback_time(scene, frames) # Warm up
+    total = playback_time(scene, frames)
+    with drivers_muted(drivers_with_shared(every, shared)):
+        baseline = playback_time(scene, frames)
+
+    def measure(fcurves: List['FCurve']) -> float:
+        with drivers_muted(drivers_with_shared(fcurves, shared)):
+            return max(0.0, total - playback_time(scene, frames))
+
+    key_times = {}
+    bones: Dict[Tuple[str, str], List['FCurve']] = {}
+    entries = []
+    for key, items in drivers.items():
+        key_times[key.name] = measure([fcurve for _, fcurve in items])
+        for manager, fcurve in items:
+            driver = fcurve.driver
+            object = manager.object
+            name = object.name if object is not None else ""
+            bone = driver_bone_target(fcurve)
+            bones.setdefault((name, bone), []).append(fcurve)
+            entries.append(ProfileEntry(key.name,
+                                        manager.name,
+                                        name,
+                                        bone,
+                                        manager.driver_type,
+                                        driver.type != 'SCRIPTED' or driver.is_simple_expression))
+
+    bone_times = {bone: measure(fcurves) for bone, fcurves in bones.items()}
+
+    profile_report = ProfileReport(len(frames), total, baseline, key_times, bone_times, entries)
+    return profile_report
+
+
+def profile_report_csv(report: ProfileReport, filepath: str) -> None:
+    """Writes the measured frame, baseline, Key and bone times and the profiled
+    drivers (which aren't timed individually) as rows of one table"""
+    frames = max(report.frames, 1)
+    seconds = lambda value: (f'{value:.9f}', f'{value / frames:.9f}')
+    with open(filepath, "w", newline="", encoding="utf-8") as file:
+        writer = csv.writer(file)
+        writer.writerow(("row", "key", "shape_key", "armature", "bone", "driver_type",
+                         "simple_expression", "seconds", "seconds_per_frame"))
+        writer.writerow(("total", "", "", "", "", "", "", *seconds(report.total)))
+        writer.writerow(("baseline", "", "", "", "", "", "", *seconds(report.baseline)))
+        for name, value in report.keys.items():
+            writer.writerow(("key", name, "", "", "", "", "", *seconds(value)))
+        for (armature, bone), value in report.bones.items():
+            writer.writerow(("bone", "", "", armature, bone, "", "", *seconds(value)))
+        for entry in report.entries:
+            writer.writerow(("driver", entry.key, entry.manager, entry.object, entry.bone,
+                             entry.driver_type, int(entry.simple), "", ""))
@@ -0,0 +1,256 @@
+
+# Resynchronization of managers with their drivers.
+#
+# Files edited with the add-on disabled, or appended from libraries, can end up
+# with managers named after a shape key's old name, managers whose shape key has
+# been deleted and drivers missing their identifier variable. A single linear pass
+# over each Key matches managers to drivers by identifier and repairs them.
+#
+# Deleting a shape key through Blender's UI leaves its manager behind. These
+# orphans are collected (without the full repair pass) when a Key's shape key
+# count drops on a depsgraph update, and before the file is saved.
+
+from typing import Dict, Iterable, List, NamedTuple, Optional, TYPE_CHECKING
+import logging
+import time
+import bpy
+from bpy.utils import unescape_identifier
+from .group import group_invalidate
+from .helper import helper_remove
+from .index import cone_keys, index_remove, lookup_invalidate
+from .manager import keyframe_cache, manager_variable_layout
+from .shared import shared_direction_release, shared_direction_target
+if TYPE_CHECKING:
+    from bpy.types import FCurve, ID, Key
+
+log = logging.getLogger(__name__)
+
+
+class RepairReport(NamedTuple):
+    keys: int
+    managers: int
+    renamed: List[str]
+    removed: List[str]
+    rebuilt: List[str]
+    seconds: float
+
+    @property
+    def changed(self) -> bool:
+        return bool(self.renamed or self.removed or self.rebuilt)
+
+    def __str__(self) -> str:
+        return (f'Checked {self.managers} cone-based drivers on {self.keys} shape key datablocks '
+                f'in {1000.0 * self.seconds:.1f} ms: {len(self.renamed)} renamed, '
+                f'{len(self.removed)} removed, {len(self.rebuilt)} rebuilt')
+
+
+def shape_name(data_path: str) -> Optional[str]:
+    if data_path.startswith('key_blocks["') and data_path.endswith('"].value'):
+        return unescape_identifier(data_path[12:-8])
+    return None
+
+
+def managers_repair(keys: Optional[Iterable['Key']]=None) -> RepairReport:
+    import bpy
+
+    start = time.perf_counter()
+    count = 0
+    managers_count = 0
+    renamed = []
+    removed = []
+    rebuilt = []
+    shared = []
+
+    for key in (bpy.data.shape_keys if keys is None else keys):
+        # Linked data can't be edited, and is repaired in its own file
+        if key.library or not key.is_property_set("cone_based_drivers"):
+            continue
+
+        count += 1
+        collection = key.cone_based_drivers
+        blocks = key.key_blocks
+        animdata = key.animation_data
+
+        # Drivers by identifier and by data path
+        identified = {}
+        by_path = {}
+        if animdata is not None:
+            for fcurve in animdata.drivers:
+                by_path[fcurve.data_path] = fcurve
+                variables = fcurve.driver.variables
+                if len(variables) and variables[0].name.startswith("conedriver_"):
+                    identified[variables[0].name] = fcurve
+
+        orphans = []
+        broken = []
+
+        for index, manager in enumerate(collection):
+            managers_count += 1
+            identifier = manager.identifier
+            fcurve: Optional['FCurve'] = identified.get(identifier)
+
+            if fcurve is not None:
+                name = shape_name(fcurve.data_path)
+                if name is None or name not in blocks:
+                    orphans.append((index, fcurve))
+                    continue
+                if name != manager.name:
+                    renamed.append(f'{key.name}: {manager.name} -> {name}')
+                    manager["name"] = name
+                layout = [(v.type, v.name) for v in fcurve.driver.variables]
+                if layout != manager_variable_layout(manager):
+                    broken.append(name)
+            elif manager.name in blocks:
+                # Driver missing, or replaced by one without the identifier variable
+                broken.append(manager.name)
+            else:
+                orphans.append((index, by_path.get(manager.data_path)))
+
+        for index, fcurve in reversed(orphans):
+            manager = collection[index]
+            removed.append(f'{key.name}: {manager.name}')
+            helper_remove(manager)
+            if fcurve is not None:
+                shared.append(shared_direction_target(fcurve))
+                animdata.drivers.remove(fcurve)
+            collection.remove(index)
+
+        lookup_invalidate(key)
+
+        for name in broken:
+            manager = collection.get(name)
+            if manager is not None:
+                rebuilt.append(f'{key.name}: {name}')
+                # Otherwise the keyframes of a replaced or edited driver may be skipped
+                keyframe_cache.pop(manager.identifier)
+                manager.update()
+
+    shared_direction_release(shared)
+    return RepairReport(count, managers_count, renamed, removed, rebuilt, time.perf_counter() - start)
+
+
+class CollectReport(NamedTuple):
+    keys: int
+    managers: int
+    entries: int
+    fcurves: int
+    seconds: float
+
+    @property
+    def changed(self) -> bool:
+        return bool(self.entries)
+
+    def __str__(self) -> str:
+        return (f'Checked {self.managers} cone-based drivers on {self.keys} shape key datablocks '
+                f'in {1000.0 * self.seconds:.1f} ms: reclaimed {self.entries} orphaned entries '
+                f'and {self.fcurves} driver f-curves')
+
+
+def managers_collect(keys: Optional[Iterable['Key']]=None) -> CollectReport:
+    """Removes managers whose shape key no longer exists, along with their drivers
+    and helpers. Managers whose driver still targets an existing shape key (renamed
+    while the add-on was disabled) are left for managers_repair()."""
+    start = time.perf_counter()
+    count = 0
+    managers_count = 0
+    entries = 0
+    fcurves = 0
+    shared = []
+
+    for key in (cone_keys() if keys is None else keys):
+        if key.library or not key.is_property_set("cone_based_drivers"):
+            continue
+
+        count += 1
+        collection = key.cone_based_drivers
+        blocks = key.key_blocks
+        managers_count += len(collection)
+
+        candidates = [index for index, manager in enumerate(collection) if manager.name not in blocks]
+        if not candidates:
+            continue
+
+        animdata = key.animation_data
+        identified = {}
+        by_path = {}
+        if animdata is not None:
+            for fcurve in animdata.drivers:
+                by_path[fcurve.data_path] = fcurve
+                variables = fcurve.driver.variables
+                if len(variables) and variables[0].name.startswith("conedriver_"):
+                    identified[variables[0].name] = fcurve
+
+        orphans = []
+        for index in candidates:
+            manager = collection[index]
+            fcurve = identified.get(manager.identifier)
+            if fcurve is not None:
+                name = shape_name(fcurve.data_path)
+                if name is not None and name in blocks:
+                    continue
+            else:
+                fcurve = by_path.get(manager.data_path)
+            orphans.append((index, fcurve))
+
+        # Remove from the end so that the remaining indices stay valid
+        for index, fcurve in reversed(orphans):
+            manager = collection[index]
+            identifier = manager.identifier
+            index_remove(identifier)
+            keyframe_cache.pop(identifier)
+            helper_remove(manager)
+            if fcurve is not None:
+                shared.append(shared_direction_target(fcurve))
+                animdata.drivers.remove(fcurve)
+                fcurves += 1
+            collection.remove(index)
+            entries += 1
+
+        if orphans:
+            group_invalidate(key)
+            lookup_invalidate(key)
+
+    shared_direction_release(shared)
+    return CollectReport(count, managers_count, entries, fcurves, time.perf_counter() - start)
+
+
+# Shape key counts per Key as of the last depsgraph update, cleared on load and undo
+_block_counts: Dict['Key', int] = {}
+
+
+def update_key(id: 'ID') -> Optional['Key']:
+    id = id.original
+    if isinstance(id, bpy.types.Key):
+        return id
+    if isinstance(id, bpy.types.Object):
+        id = id.data
+    return getattr(id, "shape_keys", None)
+
+
+@bpy.app.handlers.persistent
+def collect_depsgraph_update_handler(_, depsgraph) -> None:
+    keys = set()
+    for update in depsgraph.updates:
+        key = update_key(update.id)
+        if key is not None and key.is_property_set("cone_based_drivers"):
+            count = len(key.key_blocks)
+            previous = _block_counts.get(key)
+            _block_counts[key] = count
+            if (previous is None or count < previous) and len(key.cone_based_drivers):
+                keys.add(key)
+
+    if keys:
+        report = managers_collect(keys)
+        if report.changed:
+            log.info("%s", report)
+
+
+@bpy.app.handlers.persistent
+def collect_save_pre_handler(*_) -> None:
+    report = managers_collect()
+    if report.changed:
+        log.info("%s", report)
+
+
+def collect_clear() -> None:
+    _block_counts.clear()
@@ -0,0 +1,168 @@
+
+# Gathers cone driver data from Blender for the reference evaluator
+# (lib.evaluation) without stepping the scene through frames.
+
+from typing import Dict, List, NamedTuple, Optional, Sequence, TYPE_CHECKING
+from math import pi
+import numpy as np
+from bpy.utils import escape_identifier
+from mathutils import Euler, Quaternion
+from ..lib.evaluation import Keyframe
+from .index import key_drivers
+from .manager import driver_bone_target, manager_bezier
+if TYPE_CHECKING:
+    from bpy.types import Action, FCurve, Key, Object
+    from .manager import ConeBasedShapeKeyDriverManager
+
+
+def fcurve_keyframes(fcurve: 'FCurve', driver_type: str='SCRIPTED') -> List[Keyframe]:
+    """Returns the (co, handle_left, handle_right) keyframes of a cone driver's f-curve
+    in the scripted driver's 0-1 input space"""
+    keyframes = fcurve.keyframe_points
+    count = len(keyframes)
+    data = {}
+    for attr in ("co", "handle_left", "handle_right"):
+        values = np.zeros(count * 2)
+        keyframes.foreach_get(attr, values)
+        data[attr] = values.reshape(count, 2)
+
+    if driver_type == 'ROTATION_DIFF':
+        # Undo helper.keyframe_points_to_angle (mirror back to 0-1 and swap handles)
+        for values in data.values():
+            values[:, 0] = 1.0 - values[:, 0] / pi
+        data = {
+            "co": data["co"][::-1],
+            "handle_left": data["handle_right"][::-1],
+            "handle_right": data["handle_left"][::-1],
+            }
+
+    return [(tuple(co), tuple(hl), tuple(hr))
+            for co, hl, hr in zip(data["co"], data["handle_left"], data["handle_right"])]
+
+
+def channel_samples(object: 'Object', path: str, size: int, default: Sequence[float],
+                    frames: Sequence[float], action: Optional['Action']=None) -> 'np.ndarray':
+    """Samples an animated array property over frames from the action (the object's
+    action by default), falling back to the current value for channels that aren't animated"""
+    result = np.empty((len(frames), size))
+    result[:] = default
+    if action is None:
+        animdata = object.animation_data
+        action = animdata.action if animdata else None
+    if action is not None:
+        for index in range(size):
+            fcurve = action.fcurves.find(path, index=index)
+            if fcurve is not None:
+                evaluate = fcurve.evaluate
+                result[:, index] = [evaluate(frame) for frame in frames]
+    return result
+
+
+def bone_rotations(armature: 'Object', bone: str, frames: Sequence[float],
+                   action: Optional['Action']=None) -> 'np.ndarray':
+    """Returns the bone's local rotation channels as (F, 4) quaternions sampled from
+    the armature's action, matching a LOCAL_SPACE quaternion transform channel"""
+    pose_bone = armature.pose.bones[bone]
+    base = f'pose.bones["{escape_identifier(bone)}"]'
+    mode = pose_bone.rotation_mode
+
+    if mode == 'QUATERNION':
+        q = channel_samples(armature, f'{base}.rotation_quaternion', 4,
+                            pose_bone.rotation_quaternion, frames, action)
+    elif mode == 'AXIS_ANGLE':
+        values = channel_samples(armature, f'{base}.rotation_axis_angle', 4,
+                                 pose_bone.rotation_axis_angle, frames, action)
+        q = np.array([tuple(Quaternion(v[1:], v[0])) for v in values])
+    else:
+        values = channel_samples(armature, f'{base}.rotation_euler', 3,
+                                 pose_bone.rotation_euler, frames, action)
+        q = np.array([tuple(Euler(v, mode).to_quaternion()) for v in values])
+
+    return q / np.linalg.norm(q, axis=-1, keepdims=True).clip(1e-12)
+
+
+class Samples(NamedTuple):
+    managers: List['ConeBasedShapeKeyDriverManager']
+    poses: 'np.ndarray'          # (F, M, 4) pose rotations
+    centers: 'np.ndarray'        # (M, 4) center rotations
+    keyframes: List[List[Keyframe]]
+    twist: 'np.ndarray'          # (M,) rotational difference drivers (see evaluation.rotation_input)
+    targets: 'np.ndarray'        # (M,) activation targets
+    groups: List[List[int]]      # indices of the members of each normalized group
+    skipped: List['ConeBasedShapeKeyDriverManager']
+
+
+def managers_sample(managers: Sequence['ConeBasedShapeKeyDriverManager'],
+                    frames: Sequence[float]) -> Samples:
+    """Samples the given managers for evaluation over frames. Managers without a
+    valid armature, bone or driver are omitted. Members of normalized groups are
+    skipped unless every member of the group can be sampled, as the group's result
+    depends on all of them."""
+    from .group import group_members
+
+    drivers: Dict['Key', Dict[str, 'FCurve']] = {}
+    rotations: Dict[tuple, 'np.ndarray'] = {}
+
+    valid = []
+    for manager in managers:
+        key = manager.id_data
+        if key not in drivers:
+            drivers[key] = key_drivers(key)
+
+        fcurve: Optional['FCurve'] = drivers[key].get(manager.data_path)
+        armature = manager.object
+        bone = driver_bone_target(fcurve)
+        if (fcurve is None
+                or armature is None
+                or armature.type != 'ARMATURE'
+                or bone not in armature.pose.bones
+                or not (manager.driver_type == 'GROUP' or len(fcurve.keyframe_points))):
+            continue
+        valid.append((manager, fcurve, armature, bone))
+
+    included = {manager.identifier for manager, *_ in valid}
+    normalized = []
+    excluded = set()
+    for key in {manager.id_data for manager, *_ in valid if manager.driver_type == 'GROUP'}:
+        for members in group_members(key).values():
+            if any(member.group_normalize for member in members):
+                identifiers = [member.identifier for member in members]
+                if included.issuperset(identifiers):
+                    normalized.append(identifiers)
+                else:
+                    excluded.update(identifiers)
+
+    sampled = []
+    skipped = []
+    poses = []
+    centers = []
+    keyframes = []
+
+    for manager, fcurve, armature, bone in valid:
+        if manager.identifier in excluded:
+            skipped.append(manager)
+            continue
+
+        cache = (armature.name, bone)
+        if cache not in rotations:
+            rotations[cache] = bone_rotations(armature, bone, frames)
+
+        sampled.append(manager)
+        poses.append(rotations[cache])
+        centers.append(tuple(manager.center_quaternion))
+        if manager.driver_type == 'GROUP':
+            # Grouped drivers apply the activation curve in the group function
+            keyframes.append(manager_bezier(manager))
+        else:
+            keyframes.append(fcurve_keyframes(fcurve, manager.driver_type))
+
+    position = {manager.identifier: index for index, manager in enumerate(sampled)}
+
+    return Samples(sampled,
+                   np.stack(poses, axis=1) if poses else np.zeros((len(frames), 0, 4)),
+                   np.array(centers).reshape(-1, 4),
+                   keyframes,
+                   np.array([m.driver_type == 'ROTATION_DIFF' for m in sampled], dtype=bool),
+                   np.array([m.activation.target for m in sampled], dtype=np.float64),
+                   [[position[i] for i in identifiers] for identifiers in normalized],
+                   skipped)
@@ -0,0 +1,163 @@
+
+# Shared per-bone direction vectors.
+#
+# Cones using the shared driver type don't read the bone's rotation channels
+# themselves. Instead the bone's local direction (see lib.utils.direction_of) is
+# computed once per evaluation by three drivers on the armature, writing into a
+# custom property on the pose bone, and every cone on that bone reads the result
+# with a dot-product expression.
+#
+# The property and its drivers are owned by the cones that read them. They are
+# released (see shared_direction_release) once the last shared cone on the bone is
+# removed, retargeted or switched to another driver type. Users are counted from
+# the cones' drivers on demand rather than stored, so the count survives undo.
+
+from typing import Iterable, List, Optional, Set, Tuple, TYPE_CHECKING
+from ..lib.expression import DIRECTION_EXPRESSIONS
+if TYPE_CHECKING:
+    from bpy.types import FCurve, Key, Object
+
+SHARED_PROPERTY = "cone_direction"
+
+
+def shared_direction_path(bone: str) -> str:
+    from bpy.utils import escape_identifier
+    return f'pose.bones["{escape_identifier(bone)}"]["{SHARED_PROPERTY}"]'
+
+
+def shared_path_bone(path: str) -> str:
+    """Returns the bone name from the data path of a shared direction property, or
+    an empty string if it isn't one"""
+    from bpy.utils import unescape_identifier
+    prefix = 'pose.bones["'
+    suffix = f'"]["{SHARED_PROPERTY}"]'
+    if path.startswith(prefix) and path.endswith(suffix):
+        return unescape_identifier(path[len(prefix):-len(suffix)])
+    return ""
+
+
+def shared_direction_bone(data_path: str) -> str:
+    """Returns the bone name from a driver variable's data path to a component of
+    the shared direction property, or an empty string if it isn't one"""
+    return shared_path_bone(data_path.rpartition("[")[0])
+
+
+def shared_direction_target(fcurve: Optional['FCurve']) -> Optional[Tuple['Object', str]]:
+    """Returns the (armature, bone) of the shared direction read by a cone's driver,
+    or None if the driver doesn't read one"""
+    if fcurve is not None:
+        variables = fcurve.driver.variables
+        if len(variables) > 1 and variables[1].type == 'SINGLE_PROP':
+            target = variables[1].targets[0]
+            bone = shared_direction_bone(target.data_path)
+            if bone and target.id is not None:
+                return target.id, bone
+    return None
+
+
+def shared_direction_users(keys: Optional[Iterable['Key']]=None) -> Set[Tuple['Object', str]]:
+    """Returns the (armature, bone) of every shared direction read by a shared cone"""
+    from .index import cone_keys, key_driver_find
+    users = set()
+    for key in (cone_keys() if keys is None else keys):
+        for manager in key.cone_based_drivers:
+            if manager.driver_type == 'SHARED':
+                target = shared_direction_target(key_driver_find(key, manager.data_path))
+                if target is not None:
+                    users.add(target)
+    return users
+
+
+def shared_direction_drivers(armature: 'Object', bone: str) -> List['FCurve']:
+    """Returns the armature's drivers computing the bone's shared direction"""
+    animdata = armature.animation_data
+    if animdata is None:
+        return []
+    path = shared_direction_path(bone)
+    drivers = [animdata.drivers.find(path, index=index) for index in range(len(DIRECTION_EXPRESSIONS))]
+    return [fcurve for fcurve in drivers if fcurve is not None]
+
+
+def shared_direction_remove(armature: 'Object', bone: str) -> None:
+    for fcurve in shared_direction_drivers(armature, bone):
+        armature.animation_data.drivers.remove(fcurve)
+
+    pose_bone = armature.pose.bones.get(bone) if armature.pose else None
+    if pose_bone is not None and SHARED_PROPERTY in pose_bone:
+        del pose_bone[SHARED_PROPERTY]
+
+
+def shared_direction_release(targets: Iterable[Optional[Tuple['Object', str]]]) -> int:
+    """Removes the shared directions (and their drivers) among targets that are no
+    longer read by any shared cone, returning the number removed"""
+    targets = {target for target in targets if target is not None}
+    if not targets:
+        return 0
+    targets -= shared_direction_users()
+    for armature, bone in targets:
+        shared_direction_remove(armature, bone)
+    return len(targets)
+
+
+def shared_directions_prune() -> int:
+    """Removes every shared direction in the file that no shared cone reads"""
+    import bpy
+    targets = []
+    for object in bpy.data.objects:
+        if object.type == 'ARMATURE' and object.animation_data and not object.library:
+            for fcurve in object.animation_data.drivers:
+                bone = shared_path_bone(fcurve.data_path)
+                if bone:
+                    targets.append((object, bone))
+    return shared_direction_release(targets)
+
+
+def shared_direction_driver(armature: 'Object', path: str, index: int) -> 'FCurve':
+    animdata = armature.animation_data_create()
+    fcurve = animdata.drivers.find(path, index=index)
+    if fcurve is None:
+        fcurve = animdata.drivers.new(path, index=index)
+    return fcurve
+
+
+def shared_direction_ensure(armature: Optional['Object'], bone: str) -> str:
+    """Ensures the pose bone's shared direction property and its drivers exist and
+    returns the property's data path (or an empty string if the bone doesn't exist)"""
+    if armature is None or armature.type != 'ARMATURE':
+        return ""
+
+    pose_bone = armature.pose.bones.get(bone)
+    if pose_bone is None:
+        return ""
+
+    if SHARED_PROPERTY not in pose_bone:
+        pose_bone[SHARED_PROPERTY] = (0.0, 1.0, 0.0)
+
+    path = shared_direction_path(bone)
+
+    for index, expression in enumerate(DIRECTION_EXPRESSIONS):
+        driver = shared_direction_driver(armature, path, index).driver
+        variables = driver.variables
+
+        if [(v.type, v.name) for v in variables] != [('TRANSFORMS', axis) for axis in 'wxyz']:
+            while len(variables):
+                variables.remove(variables[-1])
+            for axis in 'WXYZ':
+                variable = variables.new()
+                variable.type = 'TRANSFORMS'
+                variable.name = axis.lower()
+
+                target = variable.targets[0]
+                target.id = armature
+                target.bone_target = bone
+                target.transform_type = f'ROT_{axis}'
+                target.transform_space = 'LOCAL_SPACE'
+                target.rotation_mode = 'QUATERNION'
+
+        if driver.type != 'SCRIPTED':
+            driver.type = 'SCRIPTED'
+        if driver.expression != expression:
+            driver.expression = expression
+
+    return path
+
@@ -0,0 +1,38 @@
+
+from typing import TYPE_CHECKING
+from bpy.types import Panel
+if TYPE_CHECKING:
+    from bpy.types import Context
+
+
+class CONEBASEDSHAPEKEYDRIVER_PT_lod(Panel):
+
+    bl_label = "Cone-Based Driver LOD"
+    bl_description = "Suspend cone-based drivers on hidden, distant or small objects during playback"
+    bl_space_type = 'PROPERTIES'
+    bl_region_type = 'WINDOW'
+    bl_context = 'scene'
+    bl_options = {'DEFAULT_CLOSED'}
+
+    def draw_header(self, context: 'Context') -> None:
+        self.layout.prop(context.scene.cone_based_lod, "enabled", text="")
+
+    def draw(self, context: 'Context') -> None:
+        settings = context.scene.cone_based_lod
+        layout = self.layout
+        layout.use_property_split = True
+        layout.active = settings.enabled
+
+        layout.prop(settings, "use_visibility")
+
+        row = layout.row(heading="Distance")
+        row.prop(settings, "use_distance", text="")
+        sub = row.row()
+        sub.active = settings.use_distance
+        sub.prop(settings, "distance", text="")
+
+        row = layout.row(heading="Screen Size")
+        row.prop(settings, "use_screen_size", text="")
+        sub = row.row()
+        sub.active = settings.use_screen_size
+        sub.prop(settings, "screen_size", text="")
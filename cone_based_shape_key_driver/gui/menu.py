@@ -1,10 +1,21 @@
 
 from typing import TYPE_CHECKING
-from ..lib.driver_utils import driver_find
+from bpy.types import Menu
+from ..api.index import key_driver_find
 from ..ops.add import CONEBASEDSHAPEKEYDRIVER_OT_add
+from ..ops.add_batch import CONEBASEDSHAPEKEYDRIVER_OT_add_batch
+from ..ops.bake import CONEBASEDSHAPEKEYDRIVER_OT_bake
+from ..ops.collect import CONEBASEDSHAPEKEYDRIVER_OT_collect
+from ..ops.compact import CONEBASEDSHAPEKEYDRIVER_OT_compact
+from ..ops.mirror import CONEBASEDSHAPEKEYDRIVER_OT_mirror
+from ..ops.radius_solve import CONEBASEDSHAPEKEYDRIVER_OT_radius_solve
+from ..ops.rebuild import CONEBASEDSHAPEKEYDRIVER_OT_rebuild
+from ..ops.setup_export import CONEBASEDSHAPEKEYDRIVER_OT_setup_export
+from ..ops.setup_import import CONEBASEDSHAPEKEYDRIVER_OT_setup_import
 from ..ops.remove import CONEBASEDSHAPEKEYDRIVER_OT_remove
+from ..ops.transfer import CONEBASEDSHAPEKEYDRIVER_OT_transfer
 if TYPE_CHECKING:
-    from bpy.types import Context, Menu
+    from bpy.types import Context
 
 
 def draw_menu_items(menu: 'Menu', context: 'Context') -> None:
@@ -14,7 +25,7 @@ def draw_menu_items(menu: 'Menu', context: 'Context') -> None:
         if shape is not None:
             key = shape.id_data
             if shape != key.reference_key:
-                fcurve = driver_find(key, f'key_blocks["{shape.name}"].value')
+                fcurve = key_driver_find(key, f'key_blocks["{shape.name}"].value')
                 if fcurve is None:
                     layout = menu.layout
                     layout.separator()
@@ -23,9 +34,61 @@ def draw_menu_items(menu: 'Menu', context: 'Context') -> None:
                                     text="Add Cone-Based Driver")
                 else:
                     variables = fcurve.driver.variables
-                    if len(variables) == 5 and variables[0].name.startswith("conedriver_"):
+                    if len(variables) and variables[0].name.startswith("conedriver_"):
                         layout = menu.layout
                         layout.separator()
                         layout.operator(CONEBASEDSHAPEKEYDRIVER_OT_remove.bl_idname,
                                         icon='REMOVE',
                                         text="Remove Cone-Based Driver")
+            menu.layout.menu(CONEBASEDSHAPEKEYDRIVER_MT_tools.bl_idname, icon='DECORATE_DRIVER')
+
+
+class CONEBASEDSHAPEKEYDRIVER_MT_tools(Menu):
+    bl_idname = "CONEBASEDSHAPEKEYDRIVER_MT_tools"
+    bl_label = "Cone-Based Drivers"
+
+    def draw(self, context: 'Context') -> None:
+        layout = self.layout
+        layout.operator(CONEBASEDSHAPEKEYDRIVER_OT_add_batch.bl_idname,
+                        icon='DECORATE_DRIVER',
+                        text="Add Cone-Based Drivers...")
+        layout.operator(CONEBASEDSHAPEKEYDRIVER_OT_radius_solve.bl_idname,
+                        icon='PIVOT_INDIVIDUAL',
+                        text="Calculate All Radii")
+        layout.separator()
+        props = layout.operator(CONEBASEDSHAPEKEYDRIVER_OT_mirror.bl_idname,
+                                icon='MOD_MIRROR',
+                                text="Mirror Left to Right")
+        props.direction = 'LEFT_TO_RIGHT'
+        props = layout.operator(CONEBASEDSHAPEKEYDRIVER_OT_mirror.bl_idname,
+                                icon='MOD_MIRROR',
+                                text="Mirror Right to Left")
+        props.direction = 'RIGHT_TO_LEFT'
+        layout.operator(CONEBASEDSHAPEKEYDRIVER_OT_transfer.bl_idname,
+                        icon='PASTEDOWN',
+                        text="Transfer to Selected")
+        layout.separator()
+        layout.operator(CONEBASEDSHAPEKEYDRIVER_OT_bake.bl_idname,
+                        icon='KEYINGSET',
+                        text="Bake...")
+        layout.operator(CONEBASEDSHAPEKEYDRIVER_OT_setup_export.bl_idname,
+                        icon='EXPORT',
+                        text="Export...")
+        layout.operator(CONEBASEDSHAPEKEYDRIVER_OT_setup_import.bl_idname,
+                        icon='IMPORT',
+                        text="Import...")
+        layout.separator()
+        props = layout.operator(CONEBASEDSHAPEKEYDRIVER_OT_compact.bl_idname,
+                                icon='PACKAGE',
+                                text="Pack Activation Curves")
+        props.action = 'PACK'
+        props = layout.operator(CONEBASEDSHAPEKEYDRIVER_OT_compact.bl_idname,
+                                icon='UGLYPACKAGE',
+                                text="Unpack Activation Curves")
+        props.action = 'UNPACK'
+        layout.operator(CONEBASEDSHAPEKEYDRIVER_OT_collect.bl_idname,
+                        icon='TRASH',
+                        text="Remove Orphaned Drivers")
+        layout.operator(CONEBASEDSHAPEKEYDRIVER_OT_rebuild.bl_idname,
+                        icon='FILE_REFRESH',
+                        text="Rebuild All Drivers")
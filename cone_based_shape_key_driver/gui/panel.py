@@ -1,9 +1,12 @@
 
 from typing import TYPE_CHECKING
 from bpy.types import Panel
+from ..api.index import key_manager_find
 from ..lib.curve_mapping import draw_curve_manager_ui
 from ..ops.radius import CONEBASEDSHAPEKEYDRIVER_OT_radius_calculate
+from ..ops.fit import CONEBASEDSHAPEKEYDRIVER_OT_fit
 from ..ops.recenter import CONEBASEDSHAPEKEYDRIVER_OT_recenter
+from ..ops.validate import CONEBASEDSHAPEKEYDRIVER_OT_validate
 if TYPE_CHECKING:
     from bpy.types import Context
 
@@ -22,17 +25,21 @@ class CONEBASEDSHAPEKEYDRIVER_PT_settings(Panel):
         if object is not None:
             shape = object.active_shape_key
             if shape is not None:
-                key = shape.id_data
-                return (key.is_property_set("cone_based_drivers")
-                        and shape.name in key.cone_based_drivers)
+                return key_manager_find(shape.id_data, shape.name) is not None
         return False
 
     def draw(self, context: 'Context') -> None:
         shape = context.object.active_shape_key
         key = shape.id_data
-        manager = key.cone_based_drivers[shape.name]
+        manager = key_manager_find(key, shape.name)
         layout = self.layout
 
+        if not manager.is_simple_expression and manager.driver_type not in {'CACHED', 'GROUP'}:
+            row = layout.row()
+            row.alert = True
+            row.label(icon='ERROR', text="Driver requires Python evaluation")
+            row.operator(CONEBASEDSHAPEKEYDRIVER_OT_validate.bl_idname, text="", icon='VIEWZOOM')
+
         # Target Object / PoseBone
         split = layout.split(factor=0.385)
         
@@ -60,6 +67,23 @@ class CONEBASEDSHAPEKEYDRIVER_PT_settings(Panel):
 
         split = layout.split(factor=0.385)
 
+        row = split.row()
+        row.alignment = 'RIGHT'
+        row.label(text="Driver")
+
+        row = split.row()
+        row.prop(manager, "driver_type", text="")
+        row.separator(factor=2.0)
+
+        if manager.driver_type == 'GROUP':
+            split = layout.split(factor=0.385)
+            split.separator()
+            row = split.row()
+            row.prop(manager, "group_normalize")
+            row.separator(factor=2.0)
+
+        split = layout.split(factor=0.385)
+
         row = split.row()
         row.alignment = 'RIGHT'
         row.label(text="Center")
@@ -70,9 +94,13 @@ class CONEBASEDSHAPEKEYDRIVER_PT_settings(Panel):
 
         subrow = col.row()
         subcol = subrow.column(align=True)
-        subrow.operator(CONEBASEDSHAPEKEYDRIVER_OT_recenter.bl_idname,
-                        text="",
-                        icon='ORIENTATION_CURSOR')
+        subcol2 = subrow.column(align=True)
+        subcol2.operator(CONEBASEDSHAPEKEYDRIVER_OT_recenter.bl_idname,
+                         text="",
+                         icon='ORIENTATION_CURSOR')
+        subcol2.operator(CONEBASEDSHAPEKEYDRIVER_OT_fit.bl_idname,
+                         text="",
+                         icon='ACTION')
 
         if manager.rotation_mode == 'QUATERNION':
             for index, axis in enumerate('WXYZ'):
@@ -99,7 +127,11 @@ class CONEBASEDSHAPEKEYDRIVER_PT_settings(Panel):
         col = split.column()
 
         row = col.row()
-        draw_curve_manager_ui(row, activation)
+        if activation.compact:
+            row.label(icon='PACKAGE', text="Compact curve")
+            row.prop(activation, "compact", text="", icon='UNLOCKED', invert_checkbox=True)
+        else:
+            draw_curve_manager_ui(row, activation)
         row.separator(factor=2.0)
 
         row = col.row(align=True)
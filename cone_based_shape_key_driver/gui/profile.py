@@ -0,0 +1,76 @@
+
+from typing import TYPE_CHECKING
+from bpy.types import Panel
+from ..api import profile
+from ..ops.profile import CONEBASEDSHAPEKEYDRIVER_OT_profile
+from ..ops.profile_export import CONEBASEDSHAPEKEYDRIVER_OT_profile_export
+if TYPE_CHECKING:
+    from bpy.types import Context
+
+
+class CONEBASEDSHAPEKEYDRIVER_PT_profile(Panel):
+
+    bl_parent_id = "DATA_PT_shape_keys"
+    bl_label = "Cone-Based Driver Profile"
+    bl_description = "Cone-Based driver evaluation cost"
+    bl_space_type = 'PROPERTIES'
+    bl_region_type = 'WINDOW'
+    bl_context = 'data'
+    bl_options = {'DEFAULT_CLOSED'}
+
+    @classmethod
+    def poll(cls, context: 'Context') -> bool:
+        object = context.object
+        if object is not None:
+            key = getattr(object.data, "shape_keys", None)
+            return key is not None and key.is_property_set("cone_based_drivers")
+        return False
+
+    def draw(self, context: 'Context') -> None:
+        layout = self.layout
+
+        row = layout.row(align=True)
+        row.operator(CONEBASEDSHAPEKEYDRIVER_OT_profile.bl_idname, icon='TIME', text="Profile")
+        row.operator(CONEBASEDSHAPEKEYDRIVER_OT_profile_export.bl_idname, icon='EXPORT', text="CSV")
+
+        report = profile.profile_report
+        if report is None or not report.frames:
+            return
+
+        frames = report.frames
+        ms = lambda seconds: f'{1000.0 * seconds / frames:.3f} ms'
+
+        col = layout.column(align=True)
+        col.label(text=f'Frame: {ms(report.total)}')
+        col.label(text=f'Cone drivers: {ms(report.total - report.baseline)}')
+
+        flagged = report.flagged
+        if flagged:
+            row = layout.row()
+            row.alert = True
+            row.label(icon='ERROR', text=f'{len(flagged)} drivers require Python')
+
+        box = layout.box()
+        box.label(text="Shape Keys")
+        for name, seconds in sorted(report.keys.items(), key=lambda item: -item[1])[:10]:
+            row = box.row()
+            row.label(text=name)
+            row.label(text=ms(seconds))
+
+        box = layout.box()
+        box.label(text="Bones")
+        for (armature, bone), seconds in sorted(report.bones.items(), key=lambda item: -item[1])[:10]:
+            row = box.row()
+            row.label(text=f'{armature}:{bone}', icon='BONE_DATA')
+            row.label(text=ms(seconds))
+
+        key = context.object.data.shape_keys
+        entries = [e for e in flagged if e.key == key.name]
+        if entries:
+            box = layout.box()
+            box.label(text="Drivers requiring Python")
+            for entry in entries[:10]:
+                row = box.row()
+                row.alert = True
+                row.label(text=entry.manager, icon='DECORATE_DRIVER')
+                row.label(text=entry.driver_type.replace("_", " ").title())
@@ -0,0 +1,88 @@
+
+from typing import Any, Dict, Generic, Hashable, Optional, TypeVar
+from collections import OrderedDict
+
+T = TypeVar("T")
+
+
+class LRUCache(Generic[T]):
+    """A small bounded mapping that evicts the least recently used entries"""
+
+    def __init__(self, maxsize: int=256) -> None:
+        self.maxsize = maxsize
+        self.data: 'OrderedDict[Hashable, T]' = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self.data)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self.data
+
+    def get(self, key: Hashable, default: Optional[T]=None) -> Optional[T]:
+        try:
+            value = self.data[key]
+        except KeyError:
+            self.misses += 1
+            return default
+        self.data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: Hashable, value: T) -> None:
+        data = self.data
+        data[key] = value
+        data.move_to_end(key)
+        while len(data) > self.maxsize:
+            data.popitem(last=False)
+
+    def pop(self, key: Hashable, default: Any=None) -> Any:
+        return self.data.pop(key, default)
+
+    def clear(self) -> None:
+        self.data.clear()
+
+
+class GenerationCache(Generic[T]):
+    """A bounded mapping holding two generations of entries. Advancing the generation
+    (e.g. once per frame) discards entries that were not used in the previous one,
+    while entries that are still in use carry over."""
+
+    def __init__(self, maxsize: int=4096) -> None:
+        self.maxsize = maxsize
+        self.current: Dict[Hashable, T] = {}
+        self.previous: Dict[Hashable, T] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self.current) + len(self.previous)
+
+    def get(self, key: Hashable, default: Optional[T]=None) -> Optional[T]:
+        try:
+            value = self.current[key]
+        except KeyError:
+            try:
+                value = self.previous.pop(key)
+            except KeyError:
+                self.misses += 1
+                return default
+            self.current[key] = value
+        self.hits += 1
+        return value
+
+    def set(self, key: Hashable, value: T) -> None:
+        current = self.current
+        if len(current) >= self.maxsize:
+            self.advance()
+            current = self.current
+        current[key] = value
+
+    def advance(self) -> None:
+        self.previous = self.current
+        self.current = {}
+
+    def clear(self) -> None:
+        self.current.clear()
+        self.previous.clear()
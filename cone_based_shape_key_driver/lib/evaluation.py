@@ -0,0 +1,208 @@
+
+# Reference evaluator for cone-based drivers.
+#
+# This module does not depend on bpy so that cone setups can be evaluated and
+# validated outside of Blender (batch tools, CI). It mirrors the driver built by
+# ConeBasedShapeKeyDriverManager.update(): the scripted expression maps the bone's
+# direction onto the 0-1 range, and the f-curve (activation curve converted to
+# bezier keyframes with constant extrapolation) maps that onto the shape key value.
+
+from typing import Iterable, NamedTuple, Optional, Sequence, Tuple
+from math import pi
+import numpy as np
+
+Point = Tuple[float, float]
+Keyframe = Tuple[Point, Point, Point]
+
+
+def directions(quaternions: 'np.ndarray') -> 'np.ndarray':
+    """Returns the rotated Y axis of (..., 4) WXYZ quaternions as (..., 3) vectors"""
+    q = np.asarray(quaternions, dtype=np.float64)
+    w, x, y, z = q[..., 0], q[..., 1], q[..., 2], q[..., 3]
+    return np.stack((2.0*(x*y-w*z), 1.0-2.0*(x*x+z*z), 2.0*(y*z+w*x)), axis=-1)
+
+
+def cone_input(pose_directions: 'np.ndarray', center_directions: 'np.ndarray') -> 'np.ndarray':
+    """Returns the (N, M) driver expression result for N pose and M center directions"""
+    dot = np.asarray(pose_directions, dtype=np.float64) @ np.asarray(center_directions, dtype=np.float64).T
+    # Guard against rounding pushing the dot product of unit vectors outside asin's domain
+    return (np.arcsin(np.clip(dot, -1.0, 1.0)) + pi/2.0) / pi
+
+
+class BezierCurves(NamedTuple):
+    """Bezier keyframe data for M curves padded to K keyframes"""
+
+    co: 'np.ndarray'           # (M, K, 2)
+    handle_left: 'np.ndarray'  # (M, K, 2)
+    handle_right: 'np.ndarray' # (M, K, 2)
+    count: 'np.ndarray'        # (M,)
+
+
+def bezier_curves(keyframes: Iterable[Sequence[Keyframe]]) -> BezierCurves:
+    """Packs per-curve (co, handle_left, handle_right) keyframes (as produced by
+    curve_mapping.to_bezier) into padded arrays. Padding repeats the last keyframe
+    so that padded segments are degenerate and never selected."""
+    data = [np.asarray(k, dtype=np.float64).reshape(-1, 3, 2) for k in keyframes]
+    if not data:
+        empty = np.zeros((0, 1, 2))
+        return BezierCurves(empty, empty, empty, np.zeros(0, dtype=np.int64))
+
+    count = np.array([len(k) for k in data], dtype=np.int64)
+    if count.min() < 1:
+        raise ValueError("Each curve requires at least one keyframe")
+
+    size = int(count.max())
+    packed = np.empty((len(data), size, 3, 2))
+    for index, k in enumerate(data):
+        packed[index, :len(k)] = k
+        packed[index, len(k):] = k[-1]
+
+    return BezierCurves(packed[:, :, 0], packed[:, :, 1], packed[:, :, 2], count)
+
+
+def curve_evaluate(curves: BezierCurves, x: 'np.ndarray', iterations: int=32) -> 'np.ndarray':
+    """Evaluates M bezier curves at (N, M) input values with constant extrapolation"""
+    x = np.asarray(x, dtype=np.float64)
+    co = curves.co
+    size = co.shape[1]
+    m = np.arange(co.shape[0])
+
+    first = co[:, 0]
+    last = co[m, curves.count - 1]
+
+    if size == 1:
+        return np.broadcast_to(first[:, 1], x.shape).copy()
+
+    # Segment index per sample (knots are sorted by x within each curve)
+    index = np.sum(x[..., None] >= co[None, :, 1:, 0], axis=-1)
+    index = np.minimum(index, curves.count - 2).clip(0)
+
+    p0 = co[m, index]
+    p1 = curves.handle_right[m, index]
+    p2 = curves.handle_left[m, index + 1]
+    p3 = co[m, index + 1]
+
+    # Match Blender's handle correction so that x is monotonic within a segment
+    h1 = p0 - p1
+    h2 = p3 - p2
+    len1 = np.abs(h1[..., 0])
+    len2 = np.abs(h2[..., 0])
+    span = p3[..., 0] - p0[..., 0]
+    total = len1 + len2
+    scale = np.where(total > span, span / np.where(total > 0.0, total, 1.0), 1.0)[..., None]
+    p1 = p0 - h1 * scale
+    p2 = p3 - h2 * scale
+
+    def bezier(t, a, b, c, d):
+        s = 1.0 - t
+        return s*s*s*a + 3.0*s*s*t*b + 3.0*s*t*t*c + t*t*t*d
+
+    lo = np.zeros(x.shape)
+    hi = np.ones(x.shape)
+    for _ in range(iterations):
+        t = (lo + hi) * 0.5
+        below = bezier(t, p0[..., 0], p1[..., 0], p2[..., 0], p3[..., 0]) < x
+        lo = np.where(below, t, lo)
+        hi = np.where(below, hi, t)
+
+    y = bezier((lo + hi) * 0.5, p0[..., 1], p1[..., 1], p2[..., 1], p3[..., 1])
+    y = np.where(x <= first[:, 0], first[:, 1], y)
+    y = np.where(x >= last[:, 0], last[:, 1], y)
+    return y
+
+
+def rotation_input(pose_quaternions: 'np.ndarray', center_quaternions: 'np.ndarray') -> 'np.ndarray':
+    """Returns the (N, M) input of rotational difference drivers for N poses and M
+    cones (poses as in evaluate). Their angle is that of the whole rotation between
+    the pose and the center, including twist around the bone's Y axis, and is
+    mapped onto the scripted driver's 0-1 range (1.0 at the center)."""
+    pose = np.asarray(pose_quaternions, dtype=np.float64)
+    center = np.asarray(center_quaternions, dtype=np.float64)
+    pose = pose / np.linalg.norm(pose, axis=-1, keepdims=True).clip(1e-12)
+    center = center / np.linalg.norm(center, axis=-1, keepdims=True).clip(1e-12)
+    if pose.ndim == 3:
+        dot = np.einsum('nmi,mi->nm', pose, center)
+    else:
+        dot = pose @ center.T
+    angle = 2.0 * np.arccos(np.clip(np.abs(dot), 0.0, 1.0))
+    return 1.0 - angle / pi
+
+
+def evaluate(pose_quaternions: 'np.ndarray',
+             center_quaternions: 'np.ndarray',
+             curves: BezierCurves,
+             twist: Optional['np.ndarray']=None) -> 'np.ndarray':
+    """Evaluates M cones for N poses returning the (N, M) shape key values.
+
+    pose_quaternions may be (N, 4) when every cone reads the same bone, or
+    (N, M, 4) when each cone reads its own bone's rotation. twist is an optional
+    (M,) mask of rotational difference cones (see rotation_input).
+    """
+    pose = directions(pose_quaternions)
+    center = directions(center_quaternions)
+    if pose.ndim == 3:
+        dot = np.einsum('nmi,mi->nm', pose, center)
+        x = (np.arcsin(np.clip(dot, -1.0, 1.0)) + pi/2.0) / pi
+    else:
+        x = cone_input(pose, center)
+    if twist is not None and np.any(twist):
+        x = np.where(twist, rotation_input(pose_quaternions, center_quaternions), x)
+    return curve_evaluate(curves, x)
+
+
+def normalize(values: 'np.ndarray', targets: 'np.ndarray') -> 'np.ndarray':
+    """Scales (..., M) values of a group of M cones so that their weights (values
+    relative to the cones' targets) sum to at most one"""
+    values = np.asarray(values, dtype=np.float64)
+    targets = np.asarray(targets, dtype=np.float64)
+    weights = np.divide(values, targets, out=np.zeros_like(values), where=targets != 0.0)
+    total = weights.sum(axis=-1, keepdims=True)
+    return np.where(total > 1.0, weights / np.maximum(total, 1.0) * targets, values)
+
+
+def neighbor_radii(center_directions: 'np.ndarray',
+                   radii: 'np.ndarray',
+                   edge: bool=False,
+                   chunk: int=1024) -> 'np.ndarray':
+    """Returns the radius for each of M cones sharing a bone from the angle to its
+    nearest neighbor in driver units (an angle of pi is a radius of 1.0). With edge
+    set, neighbor radii are subtracted so that cones do not intersect. Cones without
+    neighbors are given nan. Neighbors with identical centers are ignored.
+
+    Rows are processed in chunks so memory stays bounded for thousands of cones.
+    """
+    d = np.asarray(center_directions, dtype=np.float64)
+    d = d / np.linalg.norm(d, axis=-1, keepdims=True).clip(1e-12)
+    r = np.asarray(radii, dtype=np.float64)
+    count = len(d)
+    result = np.full(count, np.nan)
+
+    for start in range(0, count, chunk):
+        stop = min(start + chunk, count)
+        dot = np.clip(d[start:stop] @ d.T, -1.0, 1.0)
+        dist = np.arccos(dot) / pi
+        if edge:
+            dist = dist - r[None, :]
+        dist[dot > 1.0 - 1e-12] = np.inf
+        dist = dist.min(axis=1)
+        result[start:stop] = np.where(np.isinf(dist), np.nan, np.maximum(dist, 0.0))
+
+    return result
+
+
+def fit_cone(pose_quaternions: 'np.ndarray', weights: Optional['np.ndarray']=None) -> Tuple['np.ndarray', float]:
+    """Fits a cone to (F, 4) pose rotations, returning the center quaternion (the
+    sign-aligned weighted mean rotation) and the radius in driver units covering the
+    largest angle between the center's direction and a pose's direction"""
+    q = np.asarray(pose_quaternions, dtype=np.float64)
+    q = q / np.linalg.norm(q, axis=-1, keepdims=True).clip(1e-12)
+
+    # q and -q are the same rotation, so align signs before averaging
+    q = q * np.where(q @ q[0] < 0.0, -1.0, 1.0)[:, None]
+    w = np.ones(len(q)) if weights is None else np.asarray(weights, dtype=np.float64)
+    center = (q * w[:, None]).sum(axis=0)
+    center = center / max(np.linalg.norm(center), 1e-12)
+
+    dot = directions(q[w > 0.0]) @ directions(center)
+    radius = float(np.arccos(np.clip(dot, -1.0, 1.0)).max(initial=0.0)) / pi
+    return center, radius
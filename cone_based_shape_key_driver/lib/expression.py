@@ -0,0 +1,96 @@
+
+# Driver expression generation and simple-expression validation.
+#
+# Blender evaluates driver expressions that only use a small Python-like subset
+# natively (BLI_expr_pylike_eval) without touching the Python interpreter. This
+# module builds cone driver expressions restricted to that subset and provides a
+# bpy-free check so generated expressions can be validated outside of Blender.
+
+from typing import Iterable, Tuple
+import ast
+import re
+
+SIMPLE_EXPRESSION_CONSTANTS = frozenset({"pi", "True", "False"})
+
+SIMPLE_EXPRESSION_FUNCTIONS = frozenset({
+    "radians", "degrees", "abs", "fabs", "floor", "ceil", "trunc", "round", "int",
+    "sin", "cos", "tan", "asin", "acos", "atan", "atan2", "exp", "log", "sqrt",
+    "pow", "fmod", "min", "max",
+    })
+
+_SIMPLE_NODES = (ast.Expression, ast.BinOp, ast.UnaryOp, ast.BoolOp, ast.Compare,
+                 ast.IfExp, ast.Call, ast.Name, ast.Load, ast.Constant,
+                 ast.Add, ast.Sub, ast.Mult, ast.Div, ast.USub, ast.UAdd, ast.Not,
+                 ast.And, ast.Or, ast.Eq, ast.NotEq, ast.Lt, ast.LtE, ast.Gt, ast.GtE)
+
+# The native parser does not accept exponent notation in number literals
+_EXPONENT_LITERAL = re.compile(r'(?<![\w.])\d*\.?\d+[eE]')
+
+
+def format_literal(value: float, precision: int=10) -> str:
+    """Formats a float in fixed-point notation, parenthesized when negative"""
+    text = f'{value:.{precision}f}'.rstrip("0")
+    if text.endswith("."):
+        text += "0"
+    if text.lstrip("-") == "0.0":
+        return "0.0"
+    return f'({text})' if text.startswith("-") else text
+
+
+def cone_expression(direction: Tuple[float, float, float]) -> str:
+    """Returns the cone driver expression for the given (baked) center direction.
+
+    The expression runs through the following steps:
+    - Convert the target bone's (local space) rotation quaternion to a direction vector
+    - Calculate the dot product between the pose's direction vector and the center direction
+    - Apply an inverse sine and range the result so that the fcurve operates in the 0-1 range
+    """
+    x, y, z = (format_literal(v) for v in direction)
+    return (f'(asin(2.0*(x*y-w*z)*{x}+(1.0-2.0*(x*x+z*z))*{y}+2.0*(y*z+w*x)*{z})'
+            f'+pi/2.0)/pi')
+
+
+# Components of the rotated Y axis of a (w, x, y, z) quaternion
+DIRECTION_EXPRESSIONS = ('2.0*(x*y-w*z)', '1.0-2.0*(x*x+z*z)', '2.0*(y*z+w*x)')
+
+
+def cone_dot_expression(direction: Tuple[float, float, float]) -> str:
+    """Returns the cone driver expression for a driver reading the bone's direction
+    vector (x, y, z) from a shared source rather than its rotation quaternion"""
+    x, y, z = (format_literal(v) for v in direction)
+    return f'(asin(x*{x}+y*{y}+z*{z})+pi/2.0)/pi'
+
+
+def is_simple_expression(expression: str, variables: Iterable[str]) -> bool:
+    """Returns whether the expression can be evaluated by Blender's simple expression
+    evaluator given the names of the driver's variables"""
+    if _EXPONENT_LITERAL.search(expression):
+        return False
+
+    try:
+        tree = ast.parse(expression.strip(), mode='eval')
+    except SyntaxError:
+        return False
+
+    names = SIMPLE_EXPRESSION_CONSTANTS.union(variables)
+    # Function names are only valid in call position
+    callees = {id(node.func) for node in ast.walk(tree) if isinstance(node, ast.Call)}
+
+    for node in ast.walk(tree):
+        if not isinstance(node, _SIMPLE_NODES):
+            return False
+        if isinstance(node, ast.Call):
+            if (not isinstance(node.func, ast.Name)
+                    or node.func.id not in SIMPLE_EXPRESSION_FUNCTIONS
+                    or node.keywords):
+                return False
+        elif isinstance(node, ast.Name):
+            if id(node) in callees:
+                continue
+            if node.id not in names:
+                return False
+        elif isinstance(node, ast.Constant):
+            if not isinstance(node.value, (int, float)):
+                return False
+
+    return True
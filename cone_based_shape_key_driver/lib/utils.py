@@ -1,5 +1,5 @@
 
-from typing import TYPE_CHECKING
+from typing import Any, TYPE_CHECKING
 from mathutils import Vector
 if TYPE_CHECKING:
     from mathutils import Quaternion
@@ -7,3 +7,13 @@ if TYPE_CHECKING:
 def direction_of(q: 'Quaternion') -> Vector:
     w, x, y, z = q
     return Vector((2.0*(x*y-w*z), 1.0-2.0*(x*x+z*z), 2.0*(y*z+w*x)))
+
+
+def idprop_to_python(value: Any) -> Any:
+    if hasattr(value, "to_dict"):
+        return {k: idprop_to_python(v) for k, v in value.to_dict().items()}
+    if hasattr(value, "to_list"):
+        return value.to_list()
+    if isinstance(value, dict):
+        return {k: idprop_to_python(v) for k, v in value.items()}
+    return value
@@ -2,6 +2,7 @@
 from typing import Set, TYPE_CHECKING
 from bpy.types import Operator
 from .base import COMPAT_ENGINES, COMPAT_OBJECTS
+from ..api.index import index_add, key_manager_find
 if TYPE_CHECKING:
     from bpy.types import Context
 
@@ -23,11 +24,13 @@ class CONEBASEDSHAPEKEYDRIVER_OT_add(Operator):
                     key = shape.id_data
                     return (key.use_relative
                             and shape != key.reference_key
-                            and (not key.is_property_set("cone_based_drivers")
-                                 or shape.name not in key.cone_based_drivers))
+                            and key_manager_find(key, shape.name) is None)
         return False
 
     def execute(self, context: 'Context') -> Set[str]:
         shape = context.object.active_shape_key
-        shape.id_data.cone_based_drivers.add().__init__(shape)
+        key = shape.id_data
+        manager = key.cone_based_drivers.add()
+        manager.__init__(shape)
+        index_add(key, manager)
         return {'FINISHED'}
@@ -0,0 +1,139 @@
+
+from typing import List, Set, TYPE_CHECKING
+from fnmatch import fnmatchcase
+from bpy.types import Operator
+from bpy.props import BoolProperty, EnumProperty, StringProperty
+from .base import COMPAT_ENGINES, COMPAT_OBJECTS
+from ..api.index import index_add
+from ..api.manager import manager_update_suspend
+if TYPE_CHECKING:
+    from bpy.types import Context, Event, Key, Object, ShapeKey
+
+
+def bone_for_shape(armature: 'Object', name: str, mapping: str, bone: str) -> str:
+    if mapping == 'BONE':
+        return bone
+    if mapping == 'NAME':
+        # Longest bone name the shape key name starts with (e.g. "upper_arm.L_raised")
+        match = ""
+        for item in armature.data.bones:
+            if name.startswith(item.name) and len(item.name) > len(match):
+                match = item.name
+        return match
+    return ""
+
+
+class CONEBASEDSHAPEKEYDRIVER_OT_add_batch(Operator):
+
+    bl_idname = 'cone_based_shape_key_driver.add_batch'
+    bl_label = "Add Cone-Based Shape Key Drivers"
+    bl_description = "Add cone-based drivers to all shape keys matching the filter"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    filter: StringProperty(
+        name="Filter",
+        description="Only add drivers to shape keys with names matching this (wildcard) pattern",
+        default="*",
+        options=set()
+        )
+
+    skip_driven: BoolProperty(
+        name="Skip Driven",
+        description="Skip shape keys that already have a driver",
+        default=True,
+        options=set()
+        )
+
+    armature: StringProperty(
+        name="Armature",
+        description="The armature object to bind the drivers to",
+        default="",
+        options=set()
+        )
+
+    bone_mapping: EnumProperty(
+        name="Bone",
+        description="How the target bone is chosen for each shape key",
+        items=[
+            ('NONE', "None", "Do not assign a bone target"),
+            ('BONE', "Bone", "Use the same bone for every shape key"),
+            ('NAME', "By Name", "Use the bone with the longest name the shape key's name starts with"),
+            ],
+        default='NONE',
+        options=set()
+        )
+
+    bone: StringProperty(
+        name="Bone",
+        description="The bone to use when the bone mapping is set to Bone",
+        default="",
+        options=set()
+        )
+
+    @classmethod
+    def poll(cls, context: 'Context') -> bool:
+        if context.engine in COMPAT_ENGINES:
+            object = context.object
+            if object is not None and object.type in COMPAT_OBJECTS:
+                key = object.data.shape_keys
+                return key is not None and key.use_relative and len(key.key_blocks) > 1
+        return False
+
+    def invoke(self, context: 'Context', _: 'Event') -> Set[str]:
+        return context.window_manager.invoke_props_dialog(self)
+
+    def draw(self, context: 'Context') -> None:
+        import bpy
+        layout = self.layout
+        layout.use_property_split = True
+        layout.prop(self, "filter")
+        layout.prop(self, "skip_driven")
+        layout.prop_search(self, "armature", bpy.data, "objects", icon='ARMATURE_DATA')
+        armature = bpy.data.objects.get(self.armature)
+        row = layout.row()
+        row.enabled = armature is not None and armature.type == 'ARMATURE'
+        row.prop(self, "bone_mapping")
+        if self.bone_mapping == 'BONE' and row.enabled:
+            layout.prop_search(self, "bone", armature.data, "bones", icon='BONE_DATA')
+
+    def execute(self, context: 'Context') -> Set[str]:
+        import bpy
+
+        key: 'Key' = context.object.data.shape_keys
+        armature = bpy.data.objects.get(self.armature)
+        if armature is not None and armature.type != 'ARMATURE':
+            self.report({'ERROR'}, f'"{armature.name}" is not an armature')
+            return {'CANCELLED'}
+
+        data = key.cone_based_drivers
+        animdata = key.animation_data
+        driven = {fc.data_path for fc in animdata.drivers} if animdata else set()
+
+        shapes: List['ShapeKey'] = []
+        for shape in key.key_blocks:
+            if (shape != key.reference_key
+                    and shape.name not in data
+                    and fnmatchcase(shape.name, self.filter)
+                    and not (self.skip_driven and f'key_blocks["{shape.name}"].value' in driven)):
+                shapes.append(shape)
+
+        with manager_update_suspend():
+            managers = []
+            for shape in shapes:
+                manager = data.add()
+                manager.__init__(shape)
+                managers.append(shape.name)
+                if armature is not None:
+                    manager.object = armature
+
+        # Resolve by name after populating as the collection may reallocate while growing
+        for name in managers:
+            manager = data[name]
+            bone = ""
+            if armature is not None:
+                bone = bone_for_shape(armature, name, self.bone_mapping, self.bone)
+            manager.update(bone)
+            index_add(key, manager)
+
+        self.report({'INFO'}, f'Added {len(managers)} cone-based drivers')
+        return {'FINISHED'}
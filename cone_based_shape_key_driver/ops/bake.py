@@ -0,0 +1,133 @@
+
+from typing import List, Set, TYPE_CHECKING
+from bpy.types import Operator
+from bpy.props import BoolProperty, EnumProperty, IntProperty
+from .base import COMPAT_OBJECTS
+if TYPE_CHECKING:
+    from bpy.types import Context, Event, Key
+
+
+class CONEBASEDSHAPEKEYDRIVER_OT_bake(Operator):
+
+    bl_idname = 'cone_based_shape_key_driver.bake'
+    bl_label = "Bake Cone-Based Drivers"
+    bl_description = "Bake the output of cone-based drivers to shape key keyframes over a frame range"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    scope: EnumProperty(
+        name="Scope",
+        items=[
+            ('KEY', "Active Object", "Bake the active object's cone-based drivers"),
+            ('SCENE', "Scene", "Bake the cone-based drivers of every object in the scene"),
+            ],
+        default='KEY',
+        options=set()
+        )
+
+    frame_start: IntProperty(
+        name="Start",
+        default=1,
+        options=set()
+        )
+
+    frame_end: IntProperty(
+        name="End",
+        default=250,
+        options=set()
+        )
+
+    frame_step: IntProperty(
+        name="Step",
+        default=1,
+        min=1,
+        options=set()
+        )
+
+    mute: BoolProperty(
+        name="Mute Drivers",
+        description="Mute the cone-based drivers after baking so the baked keyframes take effect",
+        default=True,
+        options=set()
+        )
+
+    @classmethod
+    def poll(cls, context: 'Context') -> bool:
+        object = context.object
+        return (object is not None
+                and object.type in COMPAT_OBJECTS
+                and object.data.shape_keys is not None)
+
+    def invoke(self, context: 'Context', _: 'Event') -> Set[str]:
+        scene = context.scene
+        self.frame_start = scene.frame_start
+        self.frame_end = scene.frame_end
+        return context.window_manager.invoke_props_dialog(self)
+
+    def execute(self, context: 'Context') -> Set[str]:
+        import numpy as np
+        from ..api.sample import managers_sample
+        from ..lib.evaluation import bezier_curves, evaluate, normalize
+
+        if self.frame_end < self.frame_start:
+            self.report({'ERROR'}, "End frame must not be before start frame")
+            return {'CANCELLED'}
+
+        keys: List['Key'] = []
+        if self.scope == 'SCENE':
+            for object in context.scene.objects:
+                if object.type in COMPAT_OBJECTS:
+                    key = object.data.shape_keys
+                    if key is not None and key not in keys:
+                        keys.append(key)
+        else:
+            keys.append(context.object.data.shape_keys)
+
+        managers = [m for k in keys if k.is_property_set("cone_based_drivers") for m in k.cone_based_drivers]
+        frames = list(range(self.frame_start, self.frame_end + 1, self.frame_step))
+
+        samples = managers_sample(managers, frames)
+        managers = samples.managers
+        if not managers:
+            self.report({'WARNING'}, "No cone-based drivers to bake")
+            return {'CANCELLED'}
+
+        values = evaluate(samples.poses, samples.centers, bezier_curves(samples.keyframes), samples.twist)
+        for group in samples.groups:
+            values[:, group] = normalize(values[:, group], samples.targets[group])
+
+        co = np.empty((len(frames), 2), dtype=np.float32)
+        co[:, 0] = frames
+        interpolation = [1] * len(frames) # LINEAR
+
+        for index, manager in enumerate(managers):
+            key = manager.id_data
+            animdata = key.animation_data_create()
+            if animdata.action is None:
+                import bpy
+                animdata.action = bpy.data.actions.new(f'{key.name}Action')
+
+            fcurves = animdata.action.fcurves
+            path = manager.data_path
+            fcurve = fcurves.find(path)
+            if fcurve is not None:
+                fcurves.remove(fcurve)
+            fcurve = fcurves.new(path, action_group="Cone-Based Drivers")
+
+            co[:, 1] = values[:, index]
+            fcurve.keyframe_points.add(len(frames))
+            fcurve.keyframe_points.foreach_set("co", co.ravel())
+            fcurve.keyframe_points.foreach_set("interpolation", interpolation)
+            fcurve.update()
+
+            if self.mute:
+                manager.mute = True
+
+        message = f'Baked {len(managers)} cone-based drivers over {len(frames)} frames'
+        skipped = [m.name for m in samples.skipped]
+        if skipped:
+            self.report({'WARNING'}, (f'{message}. {len(skipped)} in normalized groups that could not be '
+                                      f'fully sampled were skipped: {", ".join(skipped[:5])}'
+                                      f'{"..." if len(skipped) > 5 else ""}'))
+        else:
+            self.report({'INFO'}, message)
+        return {'FINISHED'}
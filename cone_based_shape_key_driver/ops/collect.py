@@ -0,0 +1,26 @@
+
+from typing import Set, TYPE_CHECKING
+from bpy.types import Operator
+from ..api.repair import managers_collect
+from ..api.shared import shared_directions_prune
+if TYPE_CHECKING:
+    from bpy.types import Context
+
+
+class CONEBASEDSHAPEKEYDRIVER_OT_collect(Operator):
+
+    bl_idname = 'cone_based_shape_key_driver.collect'
+    bl_label = "Remove Orphaned Cone-Based Drivers"
+    bl_description = ("Remove cone-based driver settings and drivers left behind by shape keys "
+                      "that have been deleted")
+    bl_options = {'REGISTER', 'UNDO'}
+
+    def execute(self, context: 'Context') -> Set[str]:
+        report = managers_collect()
+        # Also reclaims shared directions left behind by earlier versions of the add-on
+        pruned = shared_directions_prune()
+        text = str(report)
+        if pruned:
+            text = f'{text}, and {pruned} unused shared bone directions'
+        self.report({'INFO'}, text)
+        return {'FINISHED'}
@@ -0,0 +1,71 @@
+
+from typing import Set, TYPE_CHECKING
+from bpy.types import Operator
+from bpy.props import EnumProperty
+from .base import COMPAT_OBJECTS
+from ..api.compact import activation_is_compact, activation_pack, activation_unpack
+from ..api.index import cone_keys
+if TYPE_CHECKING:
+    from bpy.types import Context
+
+
+class CONEBASEDSHAPEKEYDRIVER_OT_compact(Operator):
+
+    bl_idname = 'cone_based_shape_key_driver.compact'
+    bl_label = "Compact Activation Curves"
+    bl_description = ("Pack activation curve points into flat arrays to reduce file size and undo "
+                      "memory, or unpack them for editing")
+    bl_options = {'REGISTER', 'UNDO'}
+
+    action: EnumProperty(
+        name="Action",
+        items=[
+            ('PACK', "Pack", "Store activation curves in compact form"),
+            ('UNPACK', "Unpack", "Restore activation curves for editing"),
+            ],
+        default='PACK',
+        options=set()
+        )
+
+    scope: EnumProperty(
+        name="Scope",
+        items=[
+            ('KEY', "Active Object", "Cones on the active object's shape keys"),
+            ('FILE', "All", "Cones on all shape keys in the file"),
+            ],
+        default='KEY',
+        options=set()
+        )
+
+    @classmethod
+    def poll(cls, context: 'Context') -> bool:
+        object = context.object
+        if object is not None and object.type in COMPAT_OBJECTS:
+            key = object.data.shape_keys
+            return key is not None and key.is_property_set("cone_based_drivers")
+        return False
+
+    def execute(self, context: 'Context') -> Set[str]:
+        if self.scope == 'FILE':
+            keys = cone_keys()
+        else:
+            keys = [context.object.data.shape_keys]
+
+        function = activation_pack if self.action == 'PACK' else activation_unpack
+        count = 0
+        skipped = []
+        for key in keys:
+            for manager in key.cone_based_drivers:
+                activation = manager.activation
+                if function(activation):
+                    count += 1
+                elif self.action == 'PACK' and not activation_is_compact(activation):
+                    skipped.append(f'{key.name}: {manager.name}')
+
+        verb = "Packed" if self.action == 'PACK' else "Unpacked"
+        if skipped:
+            self.report({'WARNING'}, (f'{verb} {count} activation curves. {len(skipped)} could not be '
+                                      f'packed: {", ".join(skipped[:5])}{"..." if len(skipped) > 5 else ""}'))
+        else:
+            self.report({'INFO'}, f'{verb} {count} activation curves')
+        return {'FINISHED'}
@@ -0,0 +1,164 @@
+
+from typing import Set, TYPE_CHECKING
+from bpy.types import Operator
+from bpy.props import EnumProperty, FloatProperty, IntProperty, StringProperty
+from .base import COMPAT_OBJECTS
+from ..api.index import key_driver_find, key_manager_find
+from ..api.manager import driver_bone_target, manager_update_suspend
+if TYPE_CHECKING:
+    from bpy.types import Context, Event
+
+
+class CONEBASEDSHAPEKEYDRIVER_OT_fit(Operator):
+
+    bl_idname = 'cone_based_shape_key_driver.fit'
+    bl_label = "Fit Cone to Animation"
+    bl_description = ("Set the center and radius of cone-based drivers from the target bone's "
+                      "animation over a range of frames")
+    bl_options = {'REGISTER', 'UNDO'}
+
+    scope: EnumProperty(
+        name="Scope",
+        items=[
+            ('ACTIVE', "Active Shape Key", "Fit the active shape key's cone"),
+            ('KEY', "All Shape Keys", "Fit every cone on the active object's shape keys"),
+            ],
+        default='ACTIVE',
+        options=set()
+        )
+
+    source: EnumProperty(
+        name="Frames",
+        items=[
+            ('RANGE', "Frame Range", "Use every frame in the range"),
+            ('SHAPE_KEY', "Shape Key Animation",
+             "Use the frames in the range where the shape key's own animated value is above the threshold"),
+            ],
+        default='RANGE',
+        options=set()
+        )
+
+    action: StringProperty(
+        name="Action",
+        description="The action to read bone rotations from (defaults to the armature's action)",
+        default="",
+        options=set()
+        )
+
+    frame_start: IntProperty(
+        name="Start",
+        default=1,
+        options=set()
+        )
+
+    frame_end: IntProperty(
+        name="End",
+        default=250,
+        options=set()
+        )
+
+    threshold: FloatProperty(
+        name="Threshold",
+        default=0.5,
+        min=0.0,
+        max=1.0,
+        options=set()
+        )
+
+    margin: FloatProperty(
+        name="Margin",
+        description="Extra radius added beyond the largest angle in the animation",
+        default=0.0,
+        min=0.0,
+        max=1.0,
+        precision=3,
+        options=set()
+        )
+
+    @classmethod
+    def poll(cls, context: 'Context') -> bool:
+        object = context.object
+        if object is not None and object.type in COMPAT_OBJECTS:
+            key = object.data.shape_keys
+            return key is not None and key.is_property_set("cone_based_drivers")
+        return False
+
+    def invoke(self, context: 'Context', _: 'Event') -> Set[str]:
+        scene = context.scene
+        self.frame_start = scene.frame_start
+        self.frame_end = scene.frame_end
+        return context.window_manager.invoke_props_dialog(self)
+
+    def draw(self, context: 'Context') -> None:
+        import bpy
+        layout = self.layout
+        layout.use_property_split = True
+        layout.prop(self, "scope")
+        layout.prop(self, "source")
+        layout.prop_search(self, "action", bpy.data, "actions")
+        col = layout.column(align=True)
+        col.prop(self, "frame_start")
+        col.prop(self, "frame_end")
+        if self.source == 'SHAPE_KEY':
+            layout.prop(self, "threshold")
+        layout.prop(self, "margin")
+
+    def execute(self, context: 'Context') -> Set[str]:
+        import bpy
+        import numpy as np
+        from ..api.sample import bone_rotations, channel_samples
+        from ..lib.evaluation import fit_cone
+
+        object = context.object
+        key = object.data.shape_keys
+        if self.scope == 'ACTIVE':
+            shape = object.active_shape_key
+            manager = key_manager_find(key, shape.name) if shape is not None else None
+            managers = [manager] if manager is not None else []
+        else:
+            managers = list(key.cone_based_drivers)
+
+        action = bpy.data.actions.get(self.action) if self.action else None
+        frames = np.arange(self.frame_start, self.frame_end + 1, dtype=np.float64)
+        if not len(frames):
+            self.report({'ERROR'}, "Empty frame range")
+            return {'CANCELLED'}
+
+        fits = []
+        skipped = 0
+        rotations = {}
+
+        for manager in managers:
+            armature = manager.object
+            bone = driver_bone_target(key_driver_find(key, manager.data_path))
+            if armature is None or armature.type != 'ARMATURE' or bone not in armature.pose.bones:
+                skipped += 1
+                continue
+
+            if (armature.name, bone) not in rotations:
+                rotations[(armature.name, bone)] = bone_rotations(armature, bone, frames, action)
+            pose = rotations[(armature.name, bone)]
+
+            weights = None
+            if self.source == 'SHAPE_KEY':
+                values = channel_samples(key, manager.data_path, 1, (0.0,), frames)[:, 0]
+                weights = (values >= self.threshold).astype(np.float64)
+                if not weights.any():
+                    skipped += 1
+                    continue
+
+            center, radius = fit_cone(pose, weights)
+            fits.append((manager, tuple(center), min(1.0, radius + self.margin)))
+
+        with manager_update_suspend():
+            for manager, center, radius in fits:
+                manager.center_quaternion = center
+                manager.activation.radius = radius
+
+        for manager, *_ in fits:
+            manager.update()
+
+        if skipped:
+            self.report({'WARNING'}, f'Skipped {skipped} cones without a valid bone or active frames')
+        self.report({'INFO'}, f'Fitted {len(fits)} cones')
+        return {'FINISHED'}
@@ -0,0 +1,99 @@
+
+from typing import Set, TYPE_CHECKING
+from bpy.types import Operator
+from bpy.props import EnumProperty
+from bpy.utils import flip_name
+from .base import COMPAT_OBJECTS
+from ..api.interchange import managers_export, managers_import
+if TYPE_CHECKING:
+    from bpy.types import Context
+
+# Quaternion component signs that mirror a local rotation across each axis
+MIRROR_SIGNS = {
+    'X': (1.0, 1.0, -1.0, -1.0),
+    'Y': (1.0, -1.0, 1.0, -1.0),
+    'Z': (1.0, -1.0, -1.0, 1.0),
+    }
+
+
+def name_side(name: str) -> str:
+    """Returns 'LEFT' or 'RIGHT' for names with a side that flip_name() recognizes,
+    or an empty string. flip_name() swaps l/L for r/R (and left for right), so the
+    first character it changes gives the side."""
+    for char, flipped in zip(name, flip_name(name)):
+        if char != flipped:
+            return 'LEFT' if char in "lL" else 'RIGHT'
+    return ""
+
+
+class CONEBASEDSHAPEKEYDRIVER_OT_mirror(Operator):
+
+    bl_idname = 'cone_based_shape_key_driver.mirror'
+    bl_label = "Mirror Cone-Based Drivers"
+    bl_description = ("Create or update one side's cone-based drivers from the other side's, matching "
+                      "shape keys and bones by naming convention (e.g. .L/.R)")
+    bl_options = {'REGISTER', 'UNDO'}
+
+    direction: EnumProperty(
+        name="Direction",
+        description="The side to mirror cone-based drivers from and the side to mirror them to",
+        items=[
+            ('LEFT_TO_RIGHT', "Left to Right", "Mirror the left side's cone-based drivers to the right side"),
+            ('RIGHT_TO_LEFT', "Right to Left", "Mirror the right side's cone-based drivers to the left side"),
+            ],
+        default='LEFT_TO_RIGHT',
+        options=set()
+        )
+
+    axis: EnumProperty(
+        name="Axis",
+        description="The axis to mirror cone centers across",
+        items=[
+            ('X', "X", ""),
+            ('Y', "Y", ""),
+            ('Z', "Z", ""),
+            ],
+        default='X',
+        options=set()
+        )
+
+    @classmethod
+    def poll(cls, context: 'Context') -> bool:
+        object = context.object
+        if object is not None and object.type in COMPAT_OBJECTS:
+            key = object.data.shape_keys
+            return key is not None and key.is_property_set("cone_based_drivers")
+        return False
+
+    def execute(self, context: 'Context') -> Set[str]:
+        key = context.object.data.shape_keys
+        data = managers_export(key)
+        signs = MIRROR_SIGNS[self.axis]
+
+        # Only the source side's drivers are mirrored so that existing drivers on
+        # both sides are not swapped with each other
+        source = 'LEFT' if self.direction == 'LEFT_TO_RIGHT' else 'RIGHT'
+
+        entries = []
+        for entry in data["drivers"]:
+            if name_side(entry["name"]) != source:
+                continue
+            entry["name"] = flip_name(entry["name"])
+            entry["bone"] = flip_name(entry["bone"])
+            entry["center"] = [v * s for v, s in zip(entry["center"], signs)]
+            entries.append(entry)
+
+        if not entries:
+            self.report({'WARNING'}, f'No {source.lower()} side shape keys with cone-based drivers found')
+            return {'CANCELLED'}
+
+        data["drivers"] = entries
+        report = managers_import(key, data)
+
+        if report.missing_shapes:
+            self.report({'WARNING'}, f'{len(report.missing_shapes)} mirrored shape keys not found')
+        if report.missing_bones:
+            self.report({'WARNING'}, f'{len(report.missing_bones)} mirrored bones not found')
+
+        self.report({'INFO'}, f'Created {report.created} and updated {report.updated} cone-based drivers')
+        return {'FINISHED'}
@@ -0,0 +1,69 @@
+
+from typing import List, Set, TYPE_CHECKING
+from bpy.types import Operator
+from bpy.props import EnumProperty, IntProperty
+from .base import COMPAT_OBJECTS
+from ..api.profile import profile_run
+if TYPE_CHECKING:
+    from bpy.types import Context, Event, Key
+
+
+class CONEBASEDSHAPEKEYDRIVER_OT_profile(Operator):
+
+    bl_idname = 'cone_based_shape_key_driver.profile'
+    bl_label = "Profile Cone-Based Drivers"
+    bl_description = "Measure the evaluation time of cone-based drivers over a frame range"
+    bl_options = {'REGISTER'}
+
+    scope: EnumProperty(
+        name="Scope",
+        items=[
+            ('KEY', "Active Object", "Profile the active object's cone-based drivers"),
+            ('SCENE', "Scene", "Profile the cone-based drivers of every object in the scene"),
+            ],
+        default='SCENE',
+        options=set()
+        )
+
+    frame_start: IntProperty(
+        name="Start",
+        default=1,
+        options=set()
+        )
+
+    frame_end: IntProperty(
+        name="End",
+        default=250,
+        options=set()
+        )
+
+    def invoke(self, context: 'Context', _: 'Event') -> Set[str]:
+        scene = context.scene
+        self.frame_start = scene.frame_start
+        self.frame_end = scene.frame_end
+        return context.window_manager.invoke_props_dialog(self)
+
+    def execute(self, context: 'Context') -> Set[str]:
+        keys: List['Key'] = []
+        if self.scope == 'SCENE':
+            for object in context.scene.objects:
+                if object.type in COMPAT_OBJECTS:
+                    key = object.data.shape_keys
+                    if key is not None and key not in keys:
+                        keys.append(key)
+        else:
+            object = context.object
+            if object is not None and object.type in COMPAT_OBJECTS and object.data.shape_keys:
+                keys.append(object.data.shape_keys)
+
+        frames = list(range(self.frame_start, self.frame_end + 1))
+        if not keys or not frames:
+            self.report({'WARNING'}, "Nothing to profile")
+            return {'CANCELLED'}
+
+        report = profile_run(context.scene, keys, frames)
+        cost = report.total - report.baseline
+        self.report({'INFO'}, (f'Cone-based drivers: {1000.0 * cost / len(frames):.3f} ms/frame '
+                               f'of {1000.0 * report.total / len(frames):.3f} ms/frame, '
+                               f'{len(report.flagged)} not on the simple expression path'))
+        return {'FINISHED'}
@@ -0,0 +1,31 @@
+
+from typing import Set, TYPE_CHECKING
+from bpy.types import Operator
+from bpy.props import StringProperty
+from bpy_extras.io_utils import ExportHelper
+from ..api import profile
+if TYPE_CHECKING:
+    from bpy.types import Context
+
+
+class CONEBASEDSHAPEKEYDRIVER_OT_profile_export(Operator, ExportHelper):
+
+    bl_idname = 'cone_based_shape_key_driver.profile_export'
+    bl_label = "Export Profile"
+    bl_description = "Export the measured frame, baseline, shape key and bone times of the last cone-based driver profile as CSV"
+    bl_options = {'REGISTER'}
+
+    filename_ext = ".csv"
+
+    filter_glob: StringProperty(
+        default="*.csv",
+        options={'HIDDEN'}
+        )
+
+    @classmethod
+    def poll(cls, context: 'Context') -> bool:
+        return profile.profile_report is not None
+
+    def execute(self, context: 'Context') -> Set[str]:
+        profile.profile_report_csv(profile.profile_report, self.filepath)
+        return {'FINISHED'}
@@ -1,10 +1,9 @@
 
 from typing import Set, TYPE_CHECKING
-from math import asin, pi
 from bpy.types import Operator
 from bpy.props import EnumProperty
-from base import COMPAT_ENGINES, COMPAT_OBJECTS
-from ..lib.utils import direction_of
+from .base import COMPAT_ENGINES, COMPAT_OBJECTS
+from ..api.index import key_manager_find
 if TYPE_CHECKING:
     from bpy.types import Context
 
@@ -34,10 +33,8 @@ class CONEBASEDSHAPEKEYDRIVER_OT_radius_calculate(Operator):
                 shape = object.active_shape_key
                 if shape is not None:
                     key = shape.id_data
-                    if (key.use_relative
-                        and shape != key.reference_key
-                        and key.is_property_set("cone_based_drivers")):
-                        settings = key.cone_based_drivers.get(shape.name)
+                    if key.use_relative and shape != key.reference_key:
+                        settings = key_manager_find(key, shape.name)
                         if settings:
                             object = settings.object
                             return (object is not None
@@ -46,6 +43,8 @@ class CONEBASEDSHAPEKEYDRIVER_OT_radius_calculate(Operator):
         return False
 
     def execute(self, context: 'Context') -> Set[str]:
+        from ..lib.evaluation import directions, neighbor_radii
+
         shape = context.object.active_shape_key
         key = shape.id_data
         data = key.cone_based_drivers
@@ -54,13 +53,10 @@ class CONEBASEDSHAPEKEYDRIVER_OT_radius_calculate(Operator):
         bone = item.bone_target
         neighbors = [x for x in data if x != item and x.object == object and x.bone_target == bone]
         if neighbors:
-            value = direction_of(item.rotation_quaternion)
-            radii = []
-            outer = self.method == 'EDGE'
-            for other in neighbors:
-                radius = (asin(value.dot(direction_of(other.rotation_quaternion))) - -(pi/2.0))/pi
-                radii.append(max(0.0, radius - other.radius if outer else radius))
-            radius = min(radii)
+            cones = [item] + neighbors
+            radius = neighbor_radii(directions([tuple(x.center_quaternion) for x in cones]),
+                                    [x.activation.radius for x in cones],
+                                    edge=self.method == 'EDGE')[0]
             if radius > 0.001:
-                item.radius = radius
+                item.activation.radius = radius
         return {'FINISHED'}
@@ -0,0 +1,89 @@
+
+from typing import Dict, List, Set, Tuple, TYPE_CHECKING
+from bpy.types import Operator
+from bpy.props import EnumProperty
+from .base import COMPAT_OBJECTS
+from ..api.index import key_drivers
+from ..api.manager import driver_bone_target, manager_update_suspend
+if TYPE_CHECKING:
+    from bpy.types import Context, Key
+    from ..api.manager import ConeBasedShapeKeyDriverManager
+
+
+def managers_by_bone(keys: List['Key']) -> Dict[Tuple[str, str], List['ConeBasedShapeKeyDriverManager']]:
+    groups = {}
+    for key in keys:
+        if key.is_property_set("cone_based_drivers"):
+            drivers = key_drivers(key)
+            for manager in key.cone_based_drivers:
+                object = manager.object
+                bone = driver_bone_target(drivers.get(manager.data_path))
+                if object is not None and bone:
+                    groups.setdefault((object.name, bone), []).append(manager)
+    return groups
+
+
+class CONEBASEDSHAPEKEYDRIVER_OT_radius_solve(Operator):
+
+    bl_idname = 'cone_based_shape_key_driver.radius_solve'
+    bl_label = "Calculate All Radii"
+    bl_description = ("Calculate the radius of every cone from the distance to its nearest "
+                      "neighbor on the same bone")
+    bl_options = {'REGISTER', 'UNDO'}
+
+    method: EnumProperty(
+        name="Method",
+        items=[
+            ('CENT', "Nearest Neighbor", ""),
+            ('EDGE', "Nearest Neighbor (No Intersection)", ""),
+            ],
+        default='CENT',
+        options=set()
+        )
+
+    scope: EnumProperty(
+        name="Scope",
+        items=[
+            ('KEY', "Active Object", "Cones on the active object's shape keys"),
+            ('FILE', "All", "Cones on all shape keys in the file"),
+            ],
+        default='KEY',
+        options=set()
+        )
+
+    @classmethod
+    def poll(cls, context: 'Context') -> bool:
+        object = context.object
+        return (object is not None
+                and object.type in COMPAT_OBJECTS
+                and object.data.shape_keys is not None)
+
+    def execute(self, context: 'Context') -> Set[str]:
+        import bpy
+        from ..lib.evaluation import directions, neighbor_radii
+
+        if self.scope == 'FILE':
+            keys = list(bpy.data.shape_keys)
+        else:
+            keys = [context.object.data.shape_keys]
+
+        # All radii are solved from the current values before any are assigned
+        updates = []
+        for managers in managers_by_bone(keys).values():
+            if len(managers) > 1:
+                radii = neighbor_radii(directions([tuple(m.center_quaternion) for m in managers]),
+                                       [m.activation.radius for m in managers],
+                                       edge=self.method == 'EDGE')
+                for manager, radius in zip(managers, radii.tolist()):
+                    if radius > 0.001:
+                        updates.append((manager, radius))
+
+        with manager_update_suspend():
+            for manager, radius in updates:
+                manager.activation.radius = radius
+
+        for manager, _ in updates:
+            manager.update_keyframes()
+
+        self.report({'INFO'}, f'Updated {len(updates)} cone radii')
+        return {'FINISHED'}
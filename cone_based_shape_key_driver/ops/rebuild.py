@@ -0,0 +1,163 @@
+
+from typing import List, NamedTuple, Optional, Set, TYPE_CHECKING
+import time
+from bpy.types import Operator
+from bpy.props import IntProperty
+from ..api.index import cone_keys, index_rebuild, key_driver_find, key_manager_find
+from ..api.lod import key_suspended
+from ..api.manager import (driver_bone_target,
+                           keyframe_cache,
+                           manager_bezier,
+                           manager_curve,
+                           manager_driver_ensure,
+                           manager_expression,
+                           property_assign)
+if TYPE_CHECKING:
+    from bpy.types import Context, Event, Key
+
+
+class RebuildItem(NamedTuple):
+    key: 'Key'
+    index: int # Of the manager in the Key's collection when prepared
+    name: str
+    bone: str
+    expression: str
+    curve: tuple
+    bezier: Optional[list]
+
+
+def rebuild_prepare(keys: List['Key']) -> List[RebuildItem]:
+    """Collects the managers and precomputes their bone targets, expressions and
+    bezier keyframes without modifying any data"""
+    items = []
+    for key in keys:
+        for index, manager in enumerate(key.cone_based_drivers):
+            bone = driver_bone_target(key_driver_find(key, manager.data_path))
+            curve = manager_curve(manager)
+            bezier = manager_bezier(manager, curve) if manager.driver_type != 'GROUP' else None
+            items.append(RebuildItem(key,
+                                     index,
+                                     manager.name,
+                                     bone,
+                                     manager_expression(manager, bone),
+                                     curve,
+                                     bezier))
+    return items
+
+
+def rebuild_apply(item: RebuildItem) -> bool:
+    managers = item.key.cone_based_drivers
+    manager = managers[item.index] if item.index < len(managers) else None
+    if manager is None or manager.name != item.name:
+        # Managers were added, removed or moved between batches
+        manager = key_manager_find(item.key, item.name)
+    if manager is None:
+        return False
+
+    # Forget the keyframes last assigned so that they are always rewritten
+    keyframe_cache.pop(manager.identifier)
+
+    fcurve = manager_driver_ensure(manager)
+    property_assign(fcurve, "mute", manager.mute or key_suspended(item.key))
+    manager.update_keyframes(fcurve, item.curve, item.bezier)
+    manager.update_variables(fcurve, item.bone)
+    manager.update_expression(fcurve, item.expression or None)
+    return True
+
+
+class CONEBASEDSHAPEKEYDRIVER_OT_rebuild(Operator):
+
+    bl_idname = 'cone_based_shape_key_driver.rebuild'
+    bl_label = "Rebuild All Cone-Based Drivers"
+    bl_description = "Regenerate the drivers of every cone-based shape key in the file"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    batch: IntProperty(
+        name="Batch Size",
+        description="Number of drivers rebuilt between interface updates",
+        min=1,
+        default=200,
+        options=set()
+        )
+
+    _items: List[RebuildItem] = []
+    _index = 0
+    _count = 0
+    _start = 0.0
+    _timer = None
+
+    def report_done(self, cancelled: bool=False) -> None:
+        elapsed = max(time.perf_counter() - self._start, 1e-9)
+        rate = self._count / elapsed
+        text = f'Rebuilt {self._count} cone-based drivers in {elapsed:.2f} s ({rate:.0f} per second)'
+        if cancelled:
+            text = f'Cancelled. {text}, {len(self._items) - self._index} remaining'
+        self.report({'WARNING'} if cancelled else {'INFO'}, text)
+
+    def prepare(self) -> None:
+        self._start = time.perf_counter()
+        self._items = rebuild_prepare(cone_keys())
+        self._index = 0
+        self._count = 0
+
+    def step(self) -> bool:
+        """Rebuilds the next batch, returning True when all drivers are rebuilt"""
+        items = self._items
+        stop = min(self._index + self.batch, len(items))
+        for item in items[self._index:stop]:
+            self._count += rebuild_apply(item)
+        self._index = stop
+        return stop >= len(items)
+
+    def finish(self, context: Optional['Context']) -> None:
+        index_rebuild()
+        if context is not None:
+            wm = context.window_manager
+            wm.progress_end()
+            if self._timer is not None:
+                wm.event_timer_remove(self._timer)
+                self._timer = None
+            context.workspace.status_text_set(None)
+        self._items = []
+
+    def execute(self, context: 'Context') -> Set[str]:
+        self.prepare()
+        while not self.step():
+            pass
+        self.finish(None)
+        self.report_done()
+        return {'FINISHED'}
+
+    def invoke(self, context: 'Context', _: 'Event') -> Set[str]:
+        self.prepare()
+        if not self._items:
+            self.report({'INFO'}, "No cone-based drivers to rebuild")
+            return {'CANCELLED'}
+
+        wm = context.window_manager
+        wm.progress_begin(0, len(self._items))
+        self._timer = wm.event_timer_add(0.001, window=context.window)
+        wm.modal_handler_add(self)
+        return {'RUNNING_MODAL'}
+
+    def modal(self, context: 'Context', event: 'Event') -> Set[str]:
+        if event.type in {'ESC', 'RIGHTMOUSE'}:
+            self.finish(context)
+            self.report_done(cancelled=True)
+            # Finished rather than cancelled so the batches already applied get an undo step
+            return {'FINISHED'}
+
+        if event.type != 'TIMER':
+            return {'RUNNING_MODAL'}
+
+        done = self.step()
+        context.window_manager.progress_update(self._index)
+        context.workspace.status_text_set(
+            f'Rebuilding cone-based drivers: {self._index} of {len(self._items)} (Esc to cancel)')
+
+        if done:
+            self.finish(context)
+            self.report_done()
+            return {'FINISHED'}
+
+        return {'RUNNING_MODAL'}
@@ -2,6 +2,7 @@
 from typing import Set, TYPE_CHECKING
 from bpy.types import Operator
 from .base import COMPAT_ENGINES, COMPAT_OBJECTS
+from ..api.index import key_manager_find
 from ..lib.transform_utils import transform_matrix
 if TYPE_CHECKING:
     from bpy.types import Context
@@ -22,10 +23,8 @@ class CONEBASEDSHAPEKEYDRIVER_OT_recenter(Operator):
                 shape = object.active_shape_key
                 if shape is not None:
                     key = shape.id_data
-                    if (key.use_relative
-                        and shape != key.reference_key
-                        and key.is_property_set("cone_based_drivers")):
-                        settings = key.cone_based_drivers.get(shape.name)
+                    if key.use_relative and shape != key.reference_key:
+                        settings = key_manager_find(key, shape.name)
                         if settings:
                             object = settings.object
                             return (object is not None
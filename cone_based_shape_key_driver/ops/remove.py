@@ -2,6 +2,11 @@
 from typing import Set, TYPE_CHECKING
 from bpy.types import Operator
 from .base import COMPAT_ENGINES, COMPAT_OBJECTS
+from ..api.group import group_invalidate
+from ..api.helper import helper_remove
+from ..api.index import index_remove, key_driver_find, key_manager_find, lookup_invalidate
+from ..api.manager import keyframe_cache
+from ..api.shared import shared_direction_release, shared_direction_target
 from ..lib.driver_utils import driver_remove
 if TYPE_CHECKING:
     from bpy.types import Context
@@ -24,13 +29,20 @@ class CONEBASEDSHAPEKEYDRIVER_OT_remove(Operator):
                     key = shape.id_data
                     return (key.use_relative
                             and shape != key.reference_key
-                            and key.is_property_set("cone_based_drivers")
-                            and shape.name in key.cone_based_drivers)
+                            and key_manager_find(key, shape.name) is not None)
         return False
 
     def execute(self, context: 'Context') -> Set[str]:
         shape = context.object.active_shape_key
         key = shape.id_data
+        manager = key.cone_based_drivers[shape.name]
+        shared = shared_direction_target(key_driver_find(key, manager.data_path))
+        index_remove(manager.identifier)
+        keyframe_cache.pop(manager.identifier)
+        helper_remove(manager)
         driver_remove(key, f'key_blocks["{shape.name}"].value')
         key.cone_based_drivers.remove(key.cone_based_drivers.find(shape.name))
+        group_invalidate(key)
+        lookup_invalidate(key)
+        shared_direction_release([shared])
         return {'FINISHED'}
@@ -0,0 +1,25 @@
+
+from typing import Set, TYPE_CHECKING
+from bpy.types import Operator
+from ..api.index import index_rebuild
+from ..api.repair import managers_repair
+if TYPE_CHECKING:
+    from bpy.types import Context
+
+
+class CONEBASEDSHAPEKEYDRIVER_OT_repair(Operator):
+
+    bl_idname = 'cone_based_shape_key_driver.repair'
+    bl_label = "Repair Cone-Based Drivers"
+    bl_description = ("Resynchronize cone-based drivers with their shape keys, removing orphaned "
+                      "managers and rebuilding broken drivers")
+    bl_options = {'REGISTER', 'UNDO'}
+
+    def execute(self, context: 'Context') -> Set[str]:
+        report = managers_repair()
+        index_rebuild()
+        for items in (report.renamed, report.removed, report.rebuilt):
+            for item in items[:20]:
+                self.report({'INFO'}, item)
+        self.report({'INFO'}, str(report))
+        return {'FINISHED'}
@@ -0,0 +1,40 @@
+
+from typing import Set, TYPE_CHECKING
+import json
+from bpy.types import Operator
+from bpy.props import StringProperty
+from bpy_extras.io_utils import ExportHelper
+from .base import COMPAT_OBJECTS
+from ..api.interchange import managers_export
+if TYPE_CHECKING:
+    from bpy.types import Context
+
+
+class CONEBASEDSHAPEKEYDRIVER_OT_setup_export(Operator, ExportHelper):
+
+    bl_idname = 'cone_based_shape_key_driver.setup_export'
+    bl_label = "Export Cone-Based Drivers"
+    bl_description = "Export the active object's cone-based driver setup to a file"
+    bl_options = {'REGISTER'}
+
+    filename_ext = ".json"
+
+    filter_glob: StringProperty(
+        default="*.json",
+        options={'HIDDEN'}
+        )
+
+    @classmethod
+    def poll(cls, context: 'Context') -> bool:
+        object = context.object
+        if object is not None and object.type in COMPAT_OBJECTS:
+            key = object.data.shape_keys
+            return key is not None and key.is_property_set("cone_based_drivers")
+        return False
+
+    def execute(self, context: 'Context') -> Set[str]:
+        data = managers_export(context.object.data.shape_keys)
+        with open(self.filepath, "w", encoding="utf-8") as file:
+            json.dump(data, file, separators=(",", ":"))
+        self.report({'INFO'}, f'Exported {len(data["drivers"])} cone-based drivers')
+        return {'FINISHED'}
@@ -0,0 +1,52 @@
+
+from typing import Set, TYPE_CHECKING
+import json
+from bpy.types import Operator
+from bpy.props import StringProperty
+from bpy_extras.io_utils import ImportHelper
+from .base import COMPAT_OBJECTS
+from ..api.interchange import managers_import
+if TYPE_CHECKING:
+    from bpy.types import Context
+
+
+class CONEBASEDSHAPEKEYDRIVER_OT_setup_import(Operator, ImportHelper):
+
+    bl_idname = 'cone_based_shape_key_driver.setup_import'
+    bl_label = "Import Cone-Based Drivers"
+    bl_description = "Apply a cone-based driver setup from a file to the active object's shape keys"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    filename_ext = ".json"
+
+    filter_glob: StringProperty(
+        default="*.json",
+        options={'HIDDEN'}
+        )
+
+    @classmethod
+    def poll(cls, context: 'Context') -> bool:
+        object = context.object
+        if object is not None and object.type in COMPAT_OBJECTS:
+            key = object.data.shape_keys
+            return key is not None and key.use_relative
+        return False
+
+    def execute(self, context: 'Context') -> Set[str]:
+        try:
+            with open(self.filepath, "r", encoding="utf-8") as file:
+                data = json.load(file)
+            report = managers_import(context.object.data.shape_keys, data)
+        except (OSError, ValueError, KeyError) as error:
+            self.report({'ERROR'}, f'Failed to import cone-based drivers: {error}')
+            return {'CANCELLED'}
+
+        for label, items in (("shape keys", report.missing_shapes),
+                             ("armatures", report.missing_objects),
+                             ("bones", report.missing_bones)):
+            if items:
+                self.report({'WARNING'}, f'{len(items)} unmatched {label}: {", ".join(items[:10])}'
+                                         + (" ..." if len(items) > 10 else ""))
+
+        self.report({'INFO'}, f'Created {report.created} and updated {report.updated} cone-based drivers')
+        return {'FINISHED'}
@@ -0,0 +1,55 @@
+
+from typing import Set, TYPE_CHECKING
+from bpy.types import Operator
+from .base import COMPAT_OBJECTS
+from ..api.interchange import managers_export, managers_import
+if TYPE_CHECKING:
+    from bpy.types import Context
+
+
+class CONEBASEDSHAPEKEYDRIVER_OT_transfer(Operator):
+
+    bl_idname = 'cone_based_shape_key_driver.transfer'
+    bl_label = "Transfer Cone-Based Drivers"
+    bl_description = ("Copy the active object's cone-based drivers to the selected objects' shape "
+                      "keys with the same names (e.g. LOD meshes)")
+    bl_options = {'REGISTER', 'UNDO'}
+
+    @classmethod
+    def poll(cls, context: 'Context') -> bool:
+        object = context.object
+        if object is not None and object.type in COMPAT_OBJECTS:
+            key = object.data.shape_keys
+            return (key is not None
+                    and key.is_property_set("cone_based_drivers")
+                    and len(context.selected_objects) > 1)
+        return False
+
+    def execute(self, context: 'Context') -> Set[str]:
+        source = context.object.data.shape_keys
+        data = managers_export(source)
+
+        targets = []
+        for object in context.selected_objects:
+            if object.type in COMPAT_OBJECTS:
+                key = object.data.shape_keys
+                if key is not None and key != source and key.use_relative and key not in targets:
+                    targets.append(key)
+
+        if not targets:
+            self.report({'WARNING'}, "No selected objects with shape keys")
+            return {'CANCELLED'}
+
+        created = updated = missing = 0
+        for key in targets:
+            report = managers_import(key, data)
+            created += report.created
+            updated += report.updated
+            missing += len(report.missing_shapes)
+
+        if missing:
+            self.report({'WARNING'}, f'{missing} shape keys not found on the selected objects')
+
+        self.report({'INFO'}, (f'Created {created} and updated {updated} cone-based drivers '
+                               f'on {len(targets)} objects'))
+        return {'FINISHED'}
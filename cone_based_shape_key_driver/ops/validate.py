@@ -0,0 +1,43 @@
+
+from typing import Set, TYPE_CHECKING
+from bpy.types import Operator
+from ..api.index import key_driver_find
+if TYPE_CHECKING:
+    from bpy.types import Context
+
+
+class CONEBASEDSHAPEKEYDRIVER_OT_validate(Operator):
+
+    bl_idname = 'cone_based_shape_key_driver.validate'
+    bl_label = "Validate Cone-Based Drivers"
+    bl_description = ("Check that every cone-based driver is evaluated by Blender's native "
+                      "simple expression evaluator rather than the Python interpreter")
+    bl_options = {'REGISTER'}
+
+    def execute(self, context: 'Context') -> Set[str]:
+        import bpy
+
+        count = 0
+        flagged = []
+
+        for key in bpy.data.shape_keys:
+            if key.is_property_set("cone_based_drivers"):
+                for manager in key.cone_based_drivers:
+                    count += 1
+                    fcurve = key_driver_find(key, manager.data_path)
+                    if fcurve is None:
+                        flagged.append(f'{key.name}: "{manager.name}" has no driver')
+                    elif (fcurve.driver.type == 'SCRIPTED'
+                          and not fcurve.driver.is_simple_expression
+                          and manager.driver_type not in {'CACHED', 'GROUP'}):
+                        flagged.append(f'{key.name}: "{manager.name}" driver requires Python')
+
+        for message in flagged:
+            self.report({'WARNING'}, message)
+
+        if flagged:
+            self.report({'WARNING'}, f'{len(flagged)} of {count} cone-based drivers are not simple expressions')
+        else:
+            self.report({'INFO'}, f'All {count} cone-based drivers are simple expressions')
+
+        return {'FINISHED'}
@@ -0,0 +1,10 @@
+
+# Tests for the bpy-free modules in lib/. Run with `python -m pytest tests` from the
+# repository root; Blender is not required.
+
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
@@ -0,0 +1,154 @@
+
+from math import cos, pi, sin
+
+import numpy as np
+import pytest
+
+from cone_based_shape_key_driver.lib.evaluation import (bezier_curves,
+                                                        curve_evaluate,
+                                                        directions,
+                                                        evaluate,
+                                                        fit_cone,
+                                                        neighbor_radii,
+                                                        normalize,
+                                                        rotation_input)
+
+# Straight line from (0, 0) to (1, 1) with handles on the line
+LINEAR = [((0.0, 0.0), (-1.0/3.0, -1.0/3.0), (1.0/3.0, 1.0/3.0)),
+          ((1.0, 1.0), (2.0/3.0, 2.0/3.0), (4.0/3.0, 4.0/3.0))]
+
+# Eased curve from (0.5, 0) to (1, 1) with flat handles
+EASED = [((0.5, 0.0), (0.4, 0.0), (0.7, 0.0)),
+         ((1.0, 1.0), (0.8, 1.0), (1.1, 1.0))]
+
+
+def rotation_x(angle: float) -> tuple:
+    """Returns the WXYZ quaternion rotating by angle about the X axis"""
+    return (cos(angle/2.0), sin(angle/2.0), 0.0, 0.0)
+
+
+def rotation_y(angle: float) -> tuple:
+    """Returns the WXYZ quaternion rotating by angle about the Y axis (twist)"""
+    return (cos(angle/2.0), 0.0, sin(angle/2.0), 0.0)
+
+
+def cone_input_of(poses, center) -> 'np.ndarray':
+    """Returns the scripted driver input of a single cone through a linear curve"""
+    return evaluate(poses, center, bezier_curves([LINEAR]))[:, 0]
+
+
+def test_directions_rotate_the_y_axis():
+    for angle in (0.0, pi/6.0, pi/2.0, pi):
+        assert directions(rotation_x(angle)) == pytest.approx((0.0, cos(angle), sin(angle)), abs=1e-12)
+    assert directions(np.zeros((2, 3, 4)) + (1.0, 0.0, 0.0, 0.0)).shape == (2, 3, 3)
+
+
+def test_evaluate_maps_angle_from_center_to_driver_range():
+    # The driver input is 1 at the center and falls linearly with the angle to 0 at pi
+    angles = np.array([0.0, pi/6.0, pi/4.0, pi/2.0, 3.0*pi/4.0, pi])
+    poses = np.array([rotation_x(a) for a in angles])
+    center = np.array([rotation_x(0.0)])
+    result = evaluate(poses, center, bezier_curves([LINEAR]))
+    assert result.shape == (len(angles), 1)
+    assert result[:, 0] == pytest.approx(1.0 - angles / pi, abs=1e-9)
+
+
+def test_evaluate_per_cone_rotations():
+    centers = np.array([rotation_x(0.0), rotation_x(pi/2.0)])
+    poses = np.array([[rotation_x(pi/2.0), rotation_x(pi/2.0)],
+                      [rotation_x(0.0), rotation_x(pi/4.0)]])
+    result = evaluate(poses, centers, bezier_curves([LINEAR, LINEAR]))
+    assert result == pytest.approx(np.array([[0.5, 1.0], [1.0, 0.75]]), abs=1e-9)
+
+
+def test_rotation_input_includes_twist():
+    center = np.array([rotation_x(0.0)])
+    poses = np.array([rotation_x(pi/2.0), rotation_y(pi/2.0), np.negative(rotation_y(pi/4.0)), rotation_y(pi)])
+    # Twist doesn't move the Y axis, so only the rotational difference sees it
+    assert rotation_input(poses, center)[:, 0] == pytest.approx([0.5, 0.5, 0.75, 0.0])
+    assert cone_input_of(poses, center) == pytest.approx([0.5, 1.0, 1.0, 1.0])
+
+
+def test_evaluate_twist_mask_selects_rotational_difference_cones():
+    centers = np.array([rotation_x(0.0), rotation_x(0.0)])
+    poses = np.array([rotation_y(pi/2.0)])
+    result = evaluate(poses, centers, bezier_curves([LINEAR, LINEAR]), twist=np.array([False, True]))
+    assert result[0] == pytest.approx([1.0, 0.5], abs=1e-9)
+
+
+def test_normalize_scales_weights_to_one():
+    targets = np.array([1.0, 0.5, 0.0])
+    values = np.array([[0.8, 0.3, 0.4],    # Weights 0.8 + 0.6 exceed one
+                       [0.4, 0.2, 0.4]])   # Weights 0.4 + 0.4 are left alone
+    result = normalize(values, targets)
+    assert result[0] == pytest.approx([0.8/1.4, 0.6/1.4*0.5, 0.0])
+    assert result[1] == pytest.approx(values[1])
+    assert normalize(values[0], targets) == pytest.approx(result[0])
+
+
+def test_curve_evaluate_extrapolates_constant():
+    curves = bezier_curves([EASED])
+    result = curve_evaluate(curves, np.array([[0.0], [0.25], [0.5], [1.0], [1.5]]))[:, 0]
+    assert result == pytest.approx([0.0, 0.0, 0.0, 1.0, 1.0], abs=1e-9)
+
+
+def test_curve_evaluate_matches_bezier_segment():
+    # Flat handles of equal length make the curve symmetric about its midpoint
+    curves = bezier_curves([[((0.0, 0.0), (-0.25, 0.0), (0.25, 0.0)),
+                             ((1.0, 1.0), (0.75, 1.0), (1.25, 1.0))]])
+    x = np.array([[0.1], [0.5], [0.9]])
+    result = curve_evaluate(curves, x)[:, 0]
+    assert result[1] == pytest.approx(0.5, abs=1e-9)
+    assert result[0] + result[2] == pytest.approx(1.0, abs=1e-9)
+    assert 0.0 < result[0] < 0.1
+
+
+def test_curve_evaluate_pads_curves_of_different_lengths():
+    single = [((0.0, 0.25), (-0.1, 0.25), (0.1, 0.25))]
+    curves = bezier_curves([LINEAR, single, EASED])
+    assert curves.co.shape == (3, 2, 2)
+    result = curve_evaluate(curves, np.full((1, 3), 0.75))[0]
+    assert result[0] == pytest.approx(0.75, abs=1e-9)
+    assert result[1] == pytest.approx(0.25)
+    assert 0.0 < result[2] < 1.0
+
+
+def test_bezier_curves_requires_keyframes():
+    assert bezier_curves([]).co.shape[0] == 0
+    with pytest.raises(ValueError):
+        bezier_curves([LINEAR, []])
+
+
+def test_neighbor_radii_from_angle_to_nearest_cone():
+    centers = directions([rotation_x(0.0), rotation_x(pi/2.0), rotation_x(pi/3.0)])
+    radii = np.array([0.1, 0.1, 0.1])
+    # 60 degrees to the nearest neighbor for the first cone, 30 for the other two
+    assert neighbor_radii(centers, radii) == pytest.approx([1.0/3.0, 1.0/6.0, 1.0/6.0])
+    assert neighbor_radii(centers, radii, edge=True) == pytest.approx([1.0/3.0 - 0.1, 1.0/6.0 - 0.1, 1.0/6.0 - 0.1])
+
+
+def test_neighbor_radii_chunks_and_ignores_identical_centers():
+    centers = directions([rotation_x(0.0), rotation_x(0.0), rotation_x(pi/2.0)])
+    result = neighbor_radii(centers, np.zeros(3), chunk=1)
+    assert result == pytest.approx([0.5, 0.5, 0.5])
+    assert np.isnan(neighbor_radii(centers[:1], np.zeros(1))).all()
+
+
+def test_neighbor_radii_clamps_overlapping_edges():
+    centers = directions([rotation_x(0.0), rotation_x(pi/10.0)])
+    assert neighbor_radii(centers, np.array([0.5, 0.5]), edge=True) == pytest.approx([0.0, 0.0])
+
+
+def test_fit_cone_centers_on_symmetric_poses():
+    angle = pi/3.0
+    poses = np.array([rotation_x(-angle), rotation_x(angle)])
+    center, radius = fit_cone(poses)
+    assert directions(center) == pytest.approx((0.0, 1.0, 0.0), abs=1e-9)
+    assert radius == pytest.approx(angle / pi)
+
+
+def test_fit_cone_aligns_quaternion_signs_and_weights():
+    poses = np.array([rotation_x(pi/4.0), np.negative(rotation_x(pi/4.0)), rotation_x(pi/2.0)])
+    center, radius = fit_cone(poses, weights=np.array([1.0, 1.0, 0.0]))
+    assert directions(center) == pytest.approx(directions(rotation_x(pi/4.0)), abs=1e-9)
+    assert radius == pytest.approx(0.0, abs=1e-6)
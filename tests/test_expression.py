@@ -0,0 +1,58 @@
+
+from itertools import product
+
+import pytest
+
+from cone_based_shape_key_driver.lib.expression import (cone_dot_expression,
+                                                        cone_expression,
+                                                        format_literal,
+                                                        is_simple_expression)
+
+QUATERNION = ("w", "x", "y", "z")
+DIRECTION = ("x", "y", "z")
+
+# Includes values that Python would print in exponent notation
+DIRECTIONS = list(product((0.0, 1.0, -1.0, 1e-12, -3.5e-7, 0.123456789012), repeat=3))
+
+
+def test_format_literal_is_fixed_point():
+    assert format_literal(1.0) == "1.0"
+    assert format_literal(-0.5) == "(-0.5)"
+    assert format_literal(1e-12) == "0.0"
+    assert format_literal(-1e-12) == "0.0"
+    assert format_literal(2.5e-7) == "0.00000025"
+
+
+@pytest.mark.parametrize("direction", DIRECTIONS)
+def test_cone_expressions_are_simple(direction):
+    assert is_simple_expression(cone_expression(direction), QUATERNION)
+    assert is_simple_expression(cone_dot_expression(direction), DIRECTION)
+
+
+def test_cone_expressions_evaluate_like_python():
+    from math import asin, pi
+    w, x, y, z = 1.0, 0.0, 0.0, 0.0
+    assert eval(cone_expression((0.0, 1.0, 0.0))) == pytest.approx(1.0)
+    x, y, z = 0.0, 0.0, 1.0
+    assert eval(cone_dot_expression((0.0, 1.0, 0.0))) == pytest.approx(0.5)
+
+
+@pytest.mark.parametrize("expression", [
+    "1e-5*x",                   # Exponent notation
+    "x.real",                   # Attribute access
+    "float(x)",                 # Function outside the subset
+    "max(x, y, key=abs)",       # Keyword arguments
+    "sin + x",                  # Function used as a value
+    "x if 'a' else y",          # String constant
+    "v*2.0",                    # Unknown variable
+    "[x, y][0]",                # Subscripts and lists
+    "x ** 2",                   # Power operator
+    "(x",                       # Syntax error
+    ])
+def test_is_simple_expression_rejects(expression):
+    assert not is_simple_expression(expression, DIRECTION)
+
+
+def test_is_simple_expression_accepts_subset():
+    assert is_simple_expression("min(max(x, 0.0), 1.0) if x > -y and not z else pi", DIRECTION)
+    assert is_simple_expression("atan2(y, x) + fmod(z, 2)", DIRECTION)